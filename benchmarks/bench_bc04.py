@@ -0,0 +1,54 @@
+"""BC04 job sheet benchmark: parse_single_job against another parser module.
+
+Usage:
+    python benchmarks/bench_bc04.py --module /tmp/old.py [--jobs 5000] [--repeat 5]
+
+Parses the same generated Motability export (one sheet at a time, so the
+splitting and JobRecord packing don't dilute the numbers) with
+src/job_parser_core.py and with the module given by --module, for example
+one extracted with `git show <rev>:src/job_parser_core.py > /tmp/old.py`.
+Fails if the two parsers disagree on any sheet.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parsers import load_module, make_bc04_text  # noqa: E402
+
+
+def time_parser(module, sheets, repeat):
+    parser = module.BC04Parser("01/01/2025", "02/01/2025")
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        jobs = [parser.parse_single_job(sheet) for sheet in sheets]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--module', required=True, help="parser module to compare against")
+    args = parser.parse_args()
+
+    sheets = [sheet.strip() for sheet in make_bc04_text(args.jobs).split("Job Sheet\n") if sheet.strip()]
+    results = {}
+    for label, module in (("before", load_module(args.module)), ("after", load_module(None))):
+        elapsed, jobs = time_parser(module, sheets, args.repeat)
+        results[label] = jobs
+        print(f"{label:<7} {len(sheets):>7} sheets  {elapsed:8.3f}s  {elapsed / len(sheets) * 1e6:7.1f} us/sheet")
+
+    mismatches = sum(dict(a) != dict(b) for a, b in zip(results["before"], results["after"]))
+    print(f"mismatching sheets: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
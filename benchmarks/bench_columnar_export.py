@@ -0,0 +1,81 @@
+"""Columnar job export benchmark.
+
+Usage:
+    python benchmarks/bench_columnar_export.py [--jobs 100000]
+
+Exports the same jobs as CSV only and as CSV plus a Parquet copy
+(exports.write_exports()), then answers a reporting question, total
+price per customer ref, from each: the CSV read back with pandas as the
+import does (every column as text, price and dates parsed afterwards) and
+the Parquet file reading just the two columns it needs. Fails if the totals
+differ.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from bench_csv_export import make_jobs  # noqa: E402
+from csv_export import job_rows  # noqa: E402
+from exports import write_exports  # noqa: E402
+
+REFS = ('GR11', 'GR15', 'AC01', 'CW09')
+
+
+def csv_totals(path):
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df['COLLECTION DATE'] = pd.to_datetime(df['COLLECTION DATE'], format='%d/%m/%Y')
+    prices = df['PRICE'].str.replace('£', '').str.replace(',', '').map(Decimal)
+    return prices.groupby(df['CUSTOMER REF']).sum().to_dict()
+
+
+def parquet_totals(path):
+    table = pq.read_table(path, columns=['CUSTOMER REF', 'PRICE'])
+    totals = table.group_by('CUSTOMER REF').aggregate([('PRICE', 'sum')])
+    return dict(zip(totals['CUSTOMER REF'].to_pylist(), totals['PRICE_sum'].to_pylist()))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    for i, job in enumerate(jobs):
+        job['CUSTOMER REF'] = REFS[i % len(REFS)]
+        job['PRICE'] = f"{100 + i % 250}.{i % 100:02d}"
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'jobs.csv')
+        _, csv_only = timed(lambda: write_exports(csv_path, job_rows(jobs), columnar_format=''))
+        result, both = timed(lambda: write_exports(csv_path, job_rows(jobs), columnar_format='parquet'))
+        parquet_path = result.columnar_path
+        csv_size = os.path.getsize(csv_path)
+        parquet_size = os.path.getsize(parquet_path)
+        print(f"export CSV only      {len(jobs):>7} jobs {csv_only:7.3f}s  {csv_size / 1e6:6.1f} MB")
+        print(f"export CSV + Parquet {len(jobs):>7} jobs {both:7.3f}s  {parquet_size / 1e6:6.1f} MB Parquet")
+
+        from_csv, csv_read = timed(lambda: csv_totals(csv_path))
+        from_parquet, parquet_read = timed(lambda: parquet_totals(parquet_path))
+        print(f"price by ref from CSV     {csv_read:7.3f}s")
+        print(f"price by ref from Parquet {parquet_read:7.3f}s  ({csv_read / parquet_read:.1f}x)")
+        same = from_csv == from_parquet
+        print("totals match" if same else f"totals DIFFER: {from_csv} {from_parquet}")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
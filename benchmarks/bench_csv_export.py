@@ -0,0 +1,84 @@
+"""Job CSV export benchmark.
+
+Usage:
+    python benchmarks/bench_csv_export.py [--jobs 100000] [--repeat 3]
+
+Writes the same JobRecords with the DictWriter loop save_to_csv used to run
+(a dict per row, no probes or logging counted) and with
+csv_export.write_jobs_csv(), and reports MB/s for each. Fails if the files
+differ.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from csv_export import write_jobs_csv  # noqa: E402
+from job_record import CSV_FIELDNAMES, JobRecord  # noqa: E402
+
+
+def make_jobs(count):
+    return [JobRecord({
+        'REG NUMBER': "AB%02dCDE" % (i % 100),
+        'VIN': "WF0XXXTTGX%07d" % i,
+        'MAKE': "FORD",
+        'MODEL': "TRANSIT CUSTOM",
+        'COLLECTION DATE': "06/01/2025",
+        'YOUR REF NO': str(100000 + i),
+        'COLLECTION ADDR1': "Greenhous High Ercall",
+        'COLLECTION POSTCODE': "TF6 6RA",
+        'DELIVERY ADDR1': "FLEX E REN 84-90 BRADES ROAD",
+        'DELIVERY ADDR4': "OLDBURY, WEST MIDLANDS",
+        'DELIVERY POSTCODE': "B69 2EX",
+        'SPECIAL INSTRUCTIONS': 'Call "ahead"',
+        'PRICE': "120.00",
+        'CUSTOMER REF': "GR11",
+    }) for i in range(count)]
+
+
+def dictwriter_export(path, jobs):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        for job in jobs:
+            writer.writerow({field: job.get(field, '') for field in CSV_FIELDNAMES})
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, 'dictwriter.csv')
+        new_path = os.path.join(tmp, 'export.csv')
+        runs = [("DictWriter", old_path, dictwriter_export), ("write_jobs_csv", new_path, write_jobs_csv)]
+        for label, path, export in runs:
+            elapsed = best_of(args.repeat, lambda: export(path, jobs))
+            size = os.path.getsize(path)
+            print(f"{label:<15} {len(jobs):>7} jobs {elapsed:7.3f}s  {size / elapsed / 1e6:6.1f} MB/s")
+        with open(old_path, 'rb') as f_old, open(new_path, 'rb') as f_new:
+            same = f_old.read() == f_new.read()
+        print("files match" if same else "files DIFFER")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
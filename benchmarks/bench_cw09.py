@@ -0,0 +1,114 @@
+"""CW09 workbook ingestion benchmark.
+
+Usage:
+    python benchmarks/bench_cw09.py [--rows 50000] [--repeat 3]
+
+Builds a CW09-sized sheet (blank cells, 'nan' strings, postcodes and phone
+numbers in assorted spellings, real dates, numeric prices and refs) and
+turns it into job rows with cw09.cw_job_frame() and with the row-by-row
+path the CW09 tab used to take: a preview row per sheet row, stringified
+into the Treeview, read back out and mapped onto the job fields. Fails if
+the jobs differ.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from cw09 import cw_job_frame  # noqa: E402
+from job_record import JOB_FIELDS, JobRecord  # noqa: E402
+from phones import normalize_phones  # noqa: E402
+from postcodes import normalize_postcodes  # noqa: E402
+
+POSTCODES = ["b692ex", "LS1 4BB", " sw1a1aa ", "nan", None, "EC1A 1BB"]
+PHONES = ["07700 900123", "+44 7700 900456", 7700900789.0, None, "n/a"]
+TOWNS = ["Oldbury", "Leeds", None, "nan", "Bristol"]
+
+
+def make_sheet(rows, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 6)
+    return pd.DataFrame({
+        'Reg': ["AB%02dCDE" % (i % 100) if rng.random() > 0.02 else None for i in range(rows)],
+        'VIN': ["WF0XXXTTGX%07d" % rng.randint(0, 9999999) for _ in range(rows)],
+        'Make': [rng.choice(["FORD", "VAUXHALL", None]) for _ in range(rows)],
+        'Model': [rng.choice(["TRANSIT", "Vivaro", "NaN", None]) for _ in range(rows)],
+        'Collection Date': [start + timedelta(days=rng.randint(0, 30)) for _ in range(rows)],
+        'Your Ref No': [rng.randint(100000, 999999) for _ in range(rows)],
+        'Collection Address1': [rng.choice(["Unit 4 Brades Road", None]) for _ in range(rows)],
+        'Collection Address3': [rng.choice(TOWNS) for _ in range(rows)],
+        'Collection Postcode': [rng.choice(POSTCODES) for _ in range(rows)],
+        'Delivery Contact Name': [rng.choice(["J Smith", "", None]) for _ in range(rows)],
+        'Delivery Address1': [rng.choice(["1 High Street", None]) for _ in range(rows)],
+        'Delivery Address2': [rng.choice(TOWNS) for _ in range(rows)],
+        'Delivery Postcode': [rng.choice(POSTCODES) for _ in range(rows)],
+        'SpecialInstructions': [rng.choice(["Call ahead", None, ""]) for _ in range(rows)],
+        'Price': [rng.choice([120.0, 95.5, None, "150.00"]) for _ in range(rows)],
+        'Delivery Contact Phone': [rng.choice(PHONES) for _ in range(rows)],
+    })
+
+
+def legacy_jobs(df):
+    """The per-row load_cw_excel_data/process_cw_jobs path before the job table."""
+    df = df.copy()
+    for postcode_col in ('Collection Postcode', 'Delivery Postcode'):
+        if postcode_col in df.columns:
+            df[postcode_col] = normalize_postcodes(df[postcode_col])
+    if 'Delivery Contact Phone' in df.columns:
+        df['Delivery Contact Phone'] = normalize_phones(df['Delivery Contact Phone'])
+    jobs = []
+    for _, row in df.iterrows():
+        row = row.fillna("")
+        values = [row.get(name, '') for name in (
+            'Reg', 'VIN', 'Make', 'Model', 'Collection Date', 'Your Ref No', 'Collection Address1',
+            'Collection Address2', 'Collection Address3', 'Collection Address4', 'Collection Postcode',
+            'Delivery Contact Name', 'Delivery Address1', 'Delivery Address2', 'Delivery Address3',
+            'Delivery Postcode', 'SpecialInstructions', 'Price', 'Delivery Contact Phone',
+            'Delivery Contact Name')]
+        values = [v if (v != 'nan' and str(v).lower() != 'nan') else '' for v in values]
+        # The Treeview hands every value back as a string
+        values = [str(v) for v in values]
+        names = ('REG NUMBER', 'VIN', 'MAKE', 'MODEL', 'COLLECTION DATE', 'YOUR REF NO', 'COLLECTION ADDR1',
+                 'COLLECTION ADDR2', 'COLLECTION ADDR3', 'COLLECTION ADDR4', 'COLLECTION POSTCODE',
+                 'DELIVERY ADDR1', 'DELIVERY ADDR2', 'DELIVERY ADDR3', 'DELIVERY ADDR4', 'DELIVERY POSTCODE',
+                 'SPECIAL INSTRUCTIONS', 'PRICE', 'DELIVERY CONTACT PHONE', 'DELIVERY CONTACT NAME')
+        fields = dict(zip(names, values))
+        fields['CUSTOMER REF'] = 'CW09'
+        jobs.append(JobRecord(fields).values_tuple())
+    return jobs
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_sheet(args.rows)
+    legacy_time, expected = best_of(1, lambda: legacy_jobs(df))
+    frame_time, frame = best_of(args.repeat, lambda: cw_job_frame(df))
+    jobs = list(frame[list(JOB_FIELDS)].itertuples(index=False, name=None))
+    status = "ok" if jobs == expected else "MISMATCH"
+    print(f"{len(jobs):>7} jobs  row loop {legacy_time:7.3f}s  columns {frame_time:7.3f}s  {status}")
+    if jobs != expected:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Debug log benchmark.
+
+Usage:
+    python benchmarks/bench_debug_log.py [--records 50000]
+
+Times the caller's side of logging one line per job: the old log_debug()
+(open, append, close for every line), a logger with debug_log's background
+file handler and the line enabled, and the same with the line below the log
+level. For the enabled run it also reports how long the writer thread took
+to drain the queue, and checks that no records were dropped or lost.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from debug_log import DEBUG, INFO, file_log_handler  # noqa: E402
+
+
+def log_debug(path, message):
+    try:
+        with open(path, 'a') as f:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"[{timestamp}] {message}\n")
+    except Exception:
+        pass
+
+
+def background_log(name, path, level, queue_size):
+    """A logger like app_log, writing to path."""
+    log = logging.getLogger(name)
+    log.setLevel(level)
+    log.propagate = False
+    handler = file_log_handler(path, queue_size=queue_size)
+    log.addHandler(handler)
+    return log, handler
+
+
+def count_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return sum(1 for _ in f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=50000)
+    args = parser.parse_args()
+    regs = ["AB%02dCDE" % (i % 100) for i in range(args.records)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, 'old.txt')
+        start = time.perf_counter()
+        for i, reg in enumerate(regs, 1):
+            log_debug(old_path, f"Job {i} REG NUMBER: '{reg}'")
+        old = time.perf_counter() - start
+        print(f"log_debug        {args.records:>7} lines {old:7.3f}s  {old / args.records * 1e6:7.2f} us/line")
+
+        new_path = os.path.join(tmp, 'new.txt')
+        log, handler = background_log('bench.enabled', new_path, DEBUG, args.records + 1)
+        start = time.perf_counter()
+        for i, reg in enumerate(regs, 1):
+            log.debug("Job %d REG NUMBER: %r", i, reg)
+        queued = time.perf_counter() - start
+        handler.flush()
+        drained = time.perf_counter() - start
+        handler.close()
+        print(f"app_log enabled  {args.records:>7} lines {queued:7.3f}s  {queued / args.records * 1e6:7.2f} us/line"
+              f"  (written by {drained:.3f}s)")
+
+        quiet_path = os.path.join(tmp, 'quiet.txt')
+        quiet, quiet_handler = background_log('bench.quiet', quiet_path, INFO, args.records + 1)
+        start = time.perf_counter()
+        for i, reg in enumerate(regs, 1):
+            quiet.debug("Job %d REG NUMBER: %r", i, reg)
+        skipped = time.perf_counter() - start
+        quiet_handler.close()
+        print(f"app_log disabled {args.records:>7} lines {skipped:7.3f}s  {skipped / args.records * 1e6:7.2f} us/line")
+
+        lines = count_lines(new_path)
+        ok = lines == args.records and handler.dropped == 0 and not os.path.exists(quiet_path)
+        print(f"{lines} lines written, {handler.dropped} dropped")
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Greenhous delivery-address splitter benchmark.
+
+Usage:
+    python benchmarks/bench_gr_addresses.py [--rows 50000] [--repeat 3] [--write-golden]
+
+Checks greenhous.DeliveryAddressSplitter against the golden set in
+gr_address_golden.json (address -> ADDR1-4 and postcode) and against the
+per-row splitting process_gr_jobs used to do, over a generated column of
+branch-heavy addresses. Then times the old per-row split, split() on a cold
+memo and split_column(). Fails on any difference. --write-golden rebuilds
+the golden file from the old per-row split.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'src'))
+
+from greenhous import DELIVERY_ADDRESS_FIELDS, DeliveryAddressSplitter  # noqa: E402
+from postcodes import split_postcode  # noqa: E402
+
+GOLDEN_PATH = os.path.join(HERE, 'gr_address_golden.json')
+
+# Addresses worth pinning down: every fix-up, the look-ahead merges, short
+# and long addresses, odd case and spacing
+GOLDEN_ADDRESSES = [
+    "FLEX E REN 84-90, BRADES ROAD, OLDBURY, B69 2EX",
+    "FLEX E REN, 84-90, BRADES ROAD, OLDBURY, B69 2EX",
+    "FLEX-E-RE, 84-90, BRADES ROAD, OLDBURY, WEST MIDLANDS, B69 2EX",
+    "FLEX-E-RE, WEST LON, 12 PARK ROYAL ROAD, LONDON, NW10 7LQ",
+    "FLEX E RE, ST HELENS, UNIT 4, SHERDLEY PARK, ST HELENS, WA9 5GZ",
+    "FLEX E RE, UNIT 9, MARCH WAY, DONCASTER, DN4 5JP",
+    "FLEX E RE, MARCH, 3 ELM ROAD, MARCH, PE15 8PS",
+    "FLEX E RE, IVATT WAY, PETERBOROUGH, PE3 7PG",
+    "FLEX E RE, LANDGATI, WIGAN, WN4 0DR",
+    "FLEX E RE, ASCOT DRIVE, DERBY, DE24 8GW",
+    "flex e re, 7, station road, york, yo24 1ab",
+    "FLEX RENT, 22, MILL LANE, HULL, HU1 2AB",
+    "FLEX E RE ST, 5, KING STREET, LEEDS, LS1 2HQ",
+    "FLEX E RE",
+    "FLEX E RE, ",
+    "ENTERPRI ROSS, 101-103, CHURCH STREET, ROSS ON WYE, HR9 5HN",
+    "ENTERPRI-ROSS, HEREFORD ROAD, ROSS, HR9 7BW",
+    "Enterprise Rent-A-Car, 14 Bath Road, Slough, SL1 3SA",
+    "84-90, BRADES ROAD, OLDBURY, B69 2EX",
+    "12, High Street, Leeds, LS1 4BB",
+    "12 , Mill Rd, Bristol, BS1 5AA",
+    "3, Oak Ave, Stoke, ST4 2AA",
+    "1 High Street, Leeds, LS1 4BB",
+    "Acme Ltd, Unit 3 Brook Lane, Trading Estate, Great Big Town, WV10 9AA",
+    "Acme Ltd, Brook Lane, Trading Estate, Wolverhampton, WV10 9AA",
+    "Acme Ltd, Unit 3, Trading Estate, Wolverhampton, West Midlands, WV10 9AA",
+    "Acme Ltd, Unit 3, Trading Estate, Wolverhampton, West Midlands, England, WV10 9AA",
+    "Depot, Leeds",
+    "Depot, Leeds, LS11",
+    "Depot",
+    "LS1 4BB",
+    "Somewhere, ox255ha",
+    "Somewhere ,  , Far Away Town Name Here, OX25 5HA",
+    "Unit 7, 44-46, Commerce Way, Croydon, CR0 4XA",
+    "Unit 7, 44-46, Commerce Way",
+    "Station Yard, The Close, Upper Slaughter, GL54 2JD",
+    "ARNOLD CLARK, 134 NITSHILL ROAD, GLASGOW, G53 7UP",
+    "84-90, BRADES ROAD, OLDBURYB69 2EX",
+    "Depot, Leeds LS1 4BBX",
+    "  ",
+    "",
+]
+
+BRANCHES = GOLDEN_ADDRESSES[:14] + GOLDEN_ADDRESSES[15:18]
+TOWNS = ["Leeds", "Bristol", "Milton Keynes", "Stoke on Trent", "Great Big Town Centre"]
+ROADS = ["High Street", "Mill Rd", "Park Avenue", "Brook Lane", "Trading Estate", "The Close"]
+
+
+def legacy_split(delivery_address):
+    """The delivery address split process_gr_jobs did for every row."""
+    result = {field: "" for field in DELIVERY_ADDRESS_FIELDS}
+    if not delivery_address:
+        return tuple(result.values())
+    patterns_to_fix = [
+        (r'(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)[\s,]+(\d+[\-\d]*)', r'\1 \2'),
+        (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(WEST)', r'\1 \2'),
+        (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ST)', r'\1 \2'),
+        (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(UNIT)', r'\1 \2'),
+        (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(MARCH)', r'\1 \2'),
+        (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(IVATT)', r'\1 \2'),
+        (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(LANDGATI)', r'\1 \2'),
+        (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ASCOT)', r'\1 \2'),
+        (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:Road|Street|Avenue|Lane|Drive|Close|Way|ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY))', r'\1 \2'),
+        (r'(\d+[\-\d]*)\s*,\s*(BRADES[\s]*ROAD)', r'\1 \2'),
+        (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:\s(?:Rd|St|Ave|Ln|Dr|Cl|RD|ST|AVE|LN|DR|CL)))', r'\1 \2')
+    ]
+    for pattern, replacement in patterns_to_fix:
+        delivery_address = re.sub(pattern, replacement, delivery_address, flags=re.IGNORECASE)
+    extracted_postcode, clean_address = split_postcode(delivery_address, bounded=False)
+    if extracted_postcode:
+        result['DELIVERY POSTCODE'] = extracted_postcode
+    address_parts = [part.strip() for part in clean_address.split(',') if part.strip()]
+    combined_parts = []
+    i = 0
+    while i < len(address_parts):
+        current_part = address_parts[i]
+        flex_prefix_pattern = r'^(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)$'
+        if i < len(address_parts) - 1 and re.match(flex_prefix_pattern, current_part, re.IGNORECASE):
+            if i < len(address_parts) - 2 and re.match(r'^\d+[\-\d]*$', address_parts[i+1]) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+2], re.IGNORECASE):
+                combined_parts.append(f"{current_part} {address_parts[i+1]} {address_parts[i+2]}")
+                i += 3
+            else:
+                combined_parts.append(f"{current_part} {address_parts[i+1]}")
+                i += 2
+        elif i < len(address_parts) - 1 and re.match(r'^\d+[\-\d]*$', current_part) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+1], re.IGNORECASE):
+            combined_parts.append(f"{current_part} {address_parts[i+1]}")
+            i += 2
+        else:
+            combined_parts.append(current_part)
+            i += 1
+    address_parts = combined_parts
+    addr1 = addr2 = addr3 = addr4 = ""
+    if len(address_parts) > 0:
+        addr1 = address_parts[0]
+    if len(address_parts) > 1:
+        road_pattern = r'^\d+[\-\d]*\s+[A-Za-z\s]+'
+        if len(address_parts) > 2 and (re.match(road_pattern, address_parts[1]) or
+                                       re.search(r'\b(Road|Street|Avenue|Lane|Drive|Close)\b', address_parts[1], re.IGNORECASE)):
+            addr2 = address_parts[1]
+            if len(address_parts) > 3:
+                addr3 = address_parts[2]
+                addr4 = address_parts[3]
+            elif len(address_parts) > 2:
+                addr3 = address_parts[2]
+        else:
+            if len(address_parts) > 2:
+                addr2 = address_parts[1]
+                addr3 = address_parts[2]
+                if len(address_parts) > 3:
+                    addr4 = ' '.join(address_parts[3:])
+            else:
+                addr2 = address_parts[1]
+    if not addr4 and addr3 and len(addr3.split()) <= 2:
+        addr4 = addr3
+        addr3 = ""
+    result.update({'DELIVERY ADDR1': addr1, 'DELIVERY ADDR2': addr2,
+                   'DELIVERY ADDR3': addr3, 'DELIVERY ADDR4': addr4})
+    return tuple(result.values())
+
+
+def make_addresses(rows, seed=1):
+    """A delivery address column: mostly repeated branches, some one-offs."""
+    rng = random.Random(seed)
+    addresses = []
+    for i in range(rows):
+        if rng.random() < 0.8:
+            addresses.append(rng.choice(BRANCHES))
+        else:
+            parts = [f"Customer {i}", f"{rng.randint(1, 200)}", rng.choice(ROADS), rng.choice(TOWNS)]
+            rng.shuffle(parts)
+            addresses.append(", ".join(parts[:rng.randint(1, 4)]) + rng.choice([", B69 2EX", " ls14bb", ""]))
+    return pd.Series(addresses, dtype=object)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--write-golden', action='store_true')
+    args = parser.parse_args()
+
+    if args.write_golden:
+        with open(GOLDEN_PATH, 'w', encoding='utf-8') as f:
+            # One address per line, so changes to the set diff cleanly
+            f.write('[\n' + ',\n'.join(json.dumps([address, list(legacy_split(address))])
+                                       for address in GOLDEN_ADDRESSES) + '\n]\n')
+    with open(GOLDEN_PATH, encoding='utf-8') as f:
+        golden = json.load(f)
+    splitter = DeliveryAddressSplitter()
+    wrong = [(address, expected, splitter.split(address)) for address, expected in golden
+             if list(splitter.split(address)) != expected]
+    for address, expected, got in wrong:
+        print(f"golden MISMATCH {address!r}\n  expected {expected}\n  got      {list(got)}")
+    print(f"golden set: {len(golden) - len(wrong)}/{len(golden)} ok")
+
+    addresses = make_addresses(args.rows)
+    legacy_time, expected = timed(lambda: [legacy_split(address) for address in addresses])
+    split = DeliveryAddressSplitter().split
+    cold_time, rows = timed(lambda: [split(address) for address in addresses])
+    column_time = min(timed(lambda: DeliveryAddressSplitter().split_column(addresses))[0] for _ in range(args.repeat))
+    column = list(DeliveryAddressSplitter().split_column(addresses).itertuples(index=False, name=None))
+    ok = rows == expected and column == expected
+    print(f"{len(addresses):>7} addresses  per row {legacy_time:7.3f}s  split() {cold_time:7.3f}s  "
+          f"split_column() {column_time:7.3f}s  {'ok' if ok else 'MISMATCH'}")
+    if wrong or not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
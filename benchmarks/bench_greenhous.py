@@ -0,0 +1,126 @@
+"""Greenhous (GR11/GR15) workbook ingestion benchmark.
+
+Usage:
+    python benchmarks/bench_greenhous.py [--rows 50000] [--repeat 3]
+
+Builds a weekly-sheet-sized DataFrame (blank and whitespace registrations,
+real and text dates, makes in and out of the model, both PDI centres) and
+turns it into preview rows with greenhous.gr_preview_frame and with the
+row-by-row loop load_excel_data used to run. Fails if the rows differ.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from greenhous import GR_REQUIRED_COLUMNS, find_columns, gr_preview_frame  # noqa: E402
+
+PDI_CENTRES = ["Upper Heyford", "HIGH ERCALL", "heyford park", "Osbaston", None, "Telford"]
+MODELS = ["FORD TRANSIT CUSTOM", "Transit Connect", "vauxhall vivaro", "VW Crafter", "Crafter VW",
+          "Mercedes Sprinter", "Kia Niro ford edition", "MOVANO", "", None, "  fiat ducato  "]
+ADDRESSES = ["FLEX E REN 84-90, BRADES ROAD, OLDBURY, B69 2EX", "1 High Street, Leeds, LS1 4BB", None]
+
+
+def make_sheet(rows, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 6)
+    regs, dates = [], []
+    for i in range(rows):
+        roll = rng.random()
+        regs.append(None if roll < 0.02 else "  " if roll < 0.03 else "AB%02dCDE" % (i % 100))
+        roll = rng.random()
+        dates.append(None if roll < 0.05 else "TBC" if roll < 0.1 else start + timedelta(days=rng.randint(0, 60)))
+    return pd.DataFrame({
+        'REG NO': regs,
+        'PDI Centre': [rng.choice(PDI_CENTRES) for _ in range(rows)],
+        'Model': [rng.choice(MODELS) for _ in range(rows)],
+        'Chassis': ["WF0XXXTTGX%07d" % rng.randint(0, 9999999) if rng.random() > 0.05 else None
+                    for _ in range(rows)],
+        'Delivery Due Date': dates,
+        'Delivery Address': [rng.choice(ADDRESSES) for _ in range(rows)],
+    })
+
+
+def legacy_rows(df, columns):
+    """The per-row loop load_excel_data ran before the column-level version."""
+    reg_col, pdi_col, model_col, chassis_col, date_col, address_col = (columns[name] for name in GR_REQUIRED_COLUMNS)
+    makes = ["FORD", "VAUXHALL", "VOLKSWAGEN", "VW", "BMW", "MERCEDES", "AUDI",
+             "TOYOTA", "HONDA", "NISSAN", "HYUNDAI", "KIA", "SKODA", "SEAT",
+             "RENAULT", "PEUGEOT", "CITROEN", "FIAT", "MAZDA", "VOLVO"]
+    rows = []
+    for _, row in df.iterrows():
+        if pd.isna(row[reg_col]) or str(row[reg_col]).strip() == "":
+            continue
+        delivery_date = ""
+        if not pd.isna(row[date_col]):
+            if isinstance(row[date_col], str):
+                delivery_date = row[date_col]
+            else:
+                try:
+                    delivery_date = row[date_col].strftime("%d/%m/%Y")
+                except Exception:
+                    delivery_date = str(row[date_col])
+        pdi_centre = str(row[pdi_col]) if not pd.isna(row[pdi_col]) else ""
+        customer_ref = "GR15" if "UPPER" in pdi_centre.upper() or "HEYFORD" in pdi_centre.upper() else "GR11"
+        if customer_ref == "GR15":
+            collection_addr = "Greenhous Upper Heyford, Heyford Park, Bicester, OX25 5HA"
+        else:
+            collection_addr = "Greenhous High Ercall, Greenhous Village Osbaston, TF6 6RA"
+        make = ""
+        model = str(row[model_col]) if not pd.isna(row[model_col]) else ""
+        if model:
+            for m in makes:
+                if m.lower() in model.lower():
+                    make = m
+                    if model.lower().startswith(m.lower()):
+                        model = model[len(m):].strip()
+                    break
+        delivery_addr = str(row[address_col]) if not pd.isna(row[address_col]) else ""
+        rows.append((str(row[reg_col]), customer_ref,
+                     str(row[chassis_col]) if not pd.isna(row[chassis_col]) else "",
+                     make, model, delivery_date, collection_addr, delivery_addr, pdi_centre))
+    return rows
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_sheet(args.rows)
+    columns, missing = find_columns(df, GR_REQUIRED_COLUMNS)
+    assert not missing, missing
+    for datetimes in (False, True):
+        if datetimes:
+            # A sheet whose due dates are all real dates loads as datetime64
+            df = df.assign(**{'Delivery Due Date': pd.to_datetime(
+                df['Delivery Due Date'].where(df['Delivery Due Date'] != "TBC"))})
+        label = "datetime64 dates" if datetimes else "mixed dates"
+        legacy_time, expected = best_of(1, lambda: legacy_rows(df, columns))
+        frame_time, frame = best_of(args.repeat, lambda: gr_preview_frame(df, columns))
+        rows = list(frame.itertuples(index=False, name=None))
+        status = "ok" if rows == expected else "MISMATCH"
+        print(f"{label:<17} {len(rows):>7} rows  row loop {legacy_time:7.3f}s  columns {frame_time:7.3f}s  {status}")
+        if rows != expected:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Memory benchmark: bytes per job for plain dicts vs JobRecord.
+
+Usage:
+    python benchmarks/bench_job_record.py [--jobs 100000]
+
+Builds GR11-style jobs the way process_gr_jobs does, from freshly created
+strings (as read back from the Treeview), and measures the memory held by the
+whole list with tracemalloc.
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from job_record import JOB_DEFAULTS, JobRecord  # noqa: E402
+
+COLLECTION = {
+    'GR11': ("Greenhous High Ercall", "Greenhous Village Osbaston", "High Ercall", "", "TF6 6RA"),
+    'GR15': ("Greenhous Upper Heyford", "Heyford Park, Bicester", "Bicester", "UPPER HEYFORD", "OX25 5HA"),
+}
+MODELS = ["TRANSIT CUSTOM", "TRANSIT", "RANGER", "PUMA", "KUGA"]
+TOWNS = ["Leeds", "Oldbury", "Bristol", "Glasgow", "Reading"]
+
+
+def _fresh(value):
+    # A new str object with the same text, like every Treeview/Excel read gives
+    return ''.join(list(value))
+
+
+def make_rows(count, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        ref = 'GR15' if rng.random() < 0.3 else 'GR11'
+        addr1, addr2, addr3, addr4, postcode = COLLECTION[ref]
+        date = "%02d/%02d/2025" % (rng.randint(1, 28), rng.randint(1, 12))
+        rows.append({
+            'REG NUMBER': "YT%02dKX%d" % (rng.randint(10, 74), i % 10),
+            'VIN': "WF0XXXTTGX%07d" % i,
+            'MAKE': _fresh("FORD"),
+            'MODEL': _fresh(rng.choice(MODELS)),
+            'COLLECTION DATE': _fresh(date),
+            'YOUR REF NO': "YT%02dKX%d" % (rng.randint(10, 74), i % 10),
+            'COLLECTION ADDR1': _fresh(addr1),
+            'COLLECTION ADDR2': _fresh(addr2),
+            'COLLECTION ADDR3': _fresh(addr3),
+            'COLLECTION ADDR4': _fresh(addr4),
+            'COLLECTION POSTCODE': _fresh(postcode),
+            'DELIVERY DATE': _fresh(date),
+            'DELIVERY ADDR1': "FLEX-E-RENT %d" % rng.randint(1, 400),
+            'DELIVERY ADDR2': "%d BRADES ROAD" % rng.randint(1, 200),
+            'DELIVERY ADDR4': _fresh(rng.choice(TOWNS)),
+            'DELIVERY POSTCODE': "B69 %dAY" % rng.randint(1, 9),
+            'SPECIAL INSTRUCTIONS': "VIN: WF0XXXTTGX%07d" % i,
+            'CUSTOMER REF': _fresh(ref),
+        })
+    return rows
+
+
+def measure(label, build, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    rows = make_rows(count)
+    jobs = [build(row) for row in rows]
+    del rows
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<10} {count:>7} jobs  {(after - before) / count:8.0f} bytes/job")
+    return jobs
+
+
+def as_dict(row):
+    job = dict(JOB_DEFAULTS)
+    job.update(row)
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    args = parser.parse_args()
+
+    # Both numbers include the field values themselves, not just the container
+    measure("dict", as_dict, args.jobs)
+    measure("JobRecord", JobRecord, args.jobs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Re-paste benchmark for the parse cache.
+
+Usage:
+    python benchmarks/bench_parse_cache.py [--jobs 5000] [--disk PATH]
+
+Parses a generated AC01 paste with no cache, then through a ParseCache:
+once cold, then again after changing one job (an operator fixing a typo and
+re-running the batch), which should cost one parse plus a hash and lookup
+per unchanged block. --disk adds the SQLite tier and a run with a fresh
+cache reading only from disk. Fails if any run's jobs differ from the
+uncached parse.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_parsers import make_ac01_text  # noqa: E402
+from job_parser_core import JobParser  # noqa: E402
+from parse_cache import ParseCache  # noqa: E402
+
+
+def timed_parse(text, cache):
+    parser = JobParser("01/01/2025", "06/01/2025", cache=cache)
+    start = time.perf_counter()
+    jobs = parser.parse_jobs(text)
+    return time.perf_counter() - start, [dict(job) for job in jobs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--disk', help="SQLite file for the disk tier (emptied first)")
+    args = parser.parse_args()
+
+    text = make_ac01_text(args.jobs)
+    # The same paste with the first vehicle's colour corrected
+    edited = text.replace(" Blue ", " Grey ", 1)
+    if args.disk:
+        ParseCache(path=args.disk).invalidate()
+    cache = ParseCache(path=args.disk)
+
+    runs = [("uncached", text, None), ("cold", text, cache), ("re-paste", edited, cache)]
+    if args.disk:
+        runs.append(("from disk", edited, ParseCache(path=args.disk)))
+    expected = {text: timed_parse(text, None)[1], edited: timed_parse(edited, None)[1]}
+    failed = False
+    for label, paste, run_cache in runs:
+        elapsed, jobs = timed_parse(paste, run_cache)
+        ok = jobs == expected[paste]
+        failed |= not ok
+        stats = run_cache.stats() if run_cache else {}
+        print(f"{label:<10} {len(jobs):>7} jobs {elapsed:8.3f}s  {elapsed / len(jobs) * 1e6:7.1f} us/job  "
+              f"hits {stats.get('hits', 0):>6} misses {stats.get('misses', 0):>6}  {'ok' if ok else 'MISMATCH'}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
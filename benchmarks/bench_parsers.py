@@ -0,0 +1,116 @@
+"""Throughput benchmark for the AC01 and BC04 text parsers.
+
+Usage:
+    python benchmarks/bench_parsers.py [--jobs 5000] [--repeat 3] [--comment-lines 1] [--workers 1] [--module PATH]
+
+--module points at another copy of the parser module (for example one
+extracted with `git show <rev>:src/job_parser_core.py > /tmp/old.py`) so the
+before/after jobs/sec can be compared on the same generated input.
+--comment-lines pads every AC01 job's COMMENTS block, the way some brokers
+paste long delivery notes.
+--workers > 1 (0 for one per core) benchmarks the process pool parse mode.
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+MAKES = ["FORD", "VAUXHALL", "KIA", "TOYOTA", "BMW", "NISSAN", "MG"]
+MODELS = ["Focus ST-Line", "Corsa", "Sportage GT Line", "Yaris", "320d M Sport", "Qashqai", "ZS EV"]
+COLOURS = ["Blue", "Grey", "Black", "White", "Red", "Silver"]
+DEPOTS = ["18 AC Stoke Logistics Hub", "4 AC Accrington Logistics Hub", "Arnold Clark Glasgow", "St. Andrews Motors"]
+STREETS = ["12 High Street", "St Johns Road", "Peel Avenue", "Trading Estate"]
+TOWNS = ["Stoke-on-Trent", "Accrington", "Glasgow", "Leeds", "Wakefield"]
+POSTCODES = ["ST4 4AA", "BB5 0RN", "G1 1AA", "LS11 5TT", "WF2 7UL"]
+
+
+def _reg(rng):
+    letters = "ABCDEFGHKLMNPRSTVWXY"
+    return "%s%02d%s" % ("".join(rng.choice(letters) for _ in range(2)), rng.randint(10, 74),
+                         "".join(rng.choice(letters) for _ in range(3)))
+
+
+def make_ac01_text(count, seed=1, comment_lines=1):
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        jobs.append("\n".join([
+            "FROM", rng.choice(DEPOTS), rng.choice(STREETS), rng.choice(TOWNS), rng.choice(POSTCODES),
+            "Tel: 01782 %06d" % rng.randint(0, 999999),
+            "TO", "Customer %d" % rng.randint(1, 999), rng.choice(STREETS), rng.choice(TOWNS), rng.choice(POSTCODES),
+            "Phone: 07700 %06d" % rng.randint(0, 999999),
+            "JOB NO KEY LOC BARCODE", str(rng.randint(100000, 999999)),
+            "MAKE MODEL COLOUR REGISTRATION CHASSIS",
+            "%s %s %s %s WF0XXXGCDX%07d" % (rng.choice(MAKES), rng.choice(MODELS), rng.choice(COLOURS),
+                                            _reg(rng), rng.randint(0, 9999999)),
+            "COMMENTS", "\n".join(["Please call ahead"] * comment_lines),
+            "VALUE", "%d.%02d" % (rng.randint(50, 400), rng.randint(0, 99)),
+        ]))
+    return "\n".join(jobs) + "\n"
+
+
+def make_bc04_text(count, seed=1):
+    rng = random.Random(seed)
+    sheets = []
+    for _ in range(count):
+        reg = _reg(rng)
+        sheets.append("\n".join([
+            "Job Sheet", "Job Number  Customer", "Motability %d/1" % rng.randint(1000, 99999),
+            "Special Instructions", "Call ahead",
+            "Motability Ops", "1 Long Lane", "Coventry", "CV1 2AB",
+            "Mr J Smith", "5 High St", "Leeds", "LS1 4BB",
+            "%s   %d" % (reg, rng.randint(10 ** 10, 10 ** 12)),
+            "%011d  %011d" % (rng.randint(0, 10 ** 11), rng.randint(0, 10 ** 11)),
+            "%02d/%02d/2025" % (rng.randint(1, 28), rng.randint(1, 12)),
+            "%02d/%02d/2025" % (rng.randint(1, 28), rng.randint(1, 12)),
+            "Price £%d.%02d" % (rng.randint(10, 300), rng.randint(0, 99)),
+        ]))
+    return "\n".join(sheets) + "\n"
+
+
+def load_module(path):
+    if not path:
+        import job_parser_core
+        return job_parser_core
+    spec = importlib.util.spec_from_file_location("bench_parser_module", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench(label, parse, text, repeat):
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(parse(text))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<6} {count:>7} jobs  {best:8.3f}s  {count / best:10.0f} jobs/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--comment-lines', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--module', default=None, help="parser module to benchmark instead of src/job_parser_core.py")
+    args = parser.parse_args()
+
+    module = load_module(args.module)
+    ac01_text = make_ac01_text(args.jobs, comment_lines=args.comment_lines)
+    bc04_text = make_bc04_text(args.jobs)
+    # Older modules passed with --module have no workers option
+    options = {} if args.workers == 1 else {'workers': args.workers or None}
+    bench("AC01", lambda t: module.JobParser("01/01/2025", "06/01/2025").parse_jobs(t, **options), ac01_text, args.repeat)
+    bench("BC04", lambda t: module.BC04Parser("01/01/2025", "02/01/2025").parse_jobs(t, **options), bc04_text, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Worst-case latency check for the AC01 and BC04 text parsers.
+
+Usage:
+    python benchmarks/bench_pathological.py [--chars 200000] [--repeat 3] [--case NAME ...]
+
+Parses a corpus of hostile pastes (no TO block, thousands of blank lines,
+runs of spaces in the vehicle line, "Job Number" repeated without a number,
+endless digit runs...) at a tenth of --chars and at --chars, and fails if a
+case grows faster than linearly or if the large one doesn't fit in the
+parsers' per-job time budget (job_parser_core.JOB_TIME_BUDGET). It then
+checks that a job over MAX_JOB_CHARS is quarantined rather than parsed.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import job_parser_core  # noqa: E402
+from job_parser_core import BC04Parser, JobParser  # noqa: E402
+
+# Ten times the input should take about ten times as long. Anything quadratic
+# comes out near 100x, so there is plenty of room for timer noise
+MAX_GROWTH = 30
+
+VEHICLE_HEADER = "MAKE MODEL COLOUR REGISTRATION CHASSIS\n"
+
+
+def _ac01(body):
+    return "FROM\nDepot\nTO\nCustomer\n" + body
+
+
+# name -> (parser class, builds a job from a repeat count)
+CORPUS = {
+    "ac01 no TO": (JobParser, lambda n: "FROM\n" + "Depot line\n" * n + "TO\n"),
+    "ac01 blank lines": (JobParser, lambda n: _ac01("\n" * n + VEHICLE_HEADER + "FORD FOCUS Blue AB12CDE X\n")),
+    "ac01 whitespace lines": (JobParser, lambda n: _ac01(" \n" * n + "JOB NO\n")),
+    "ac01 huge comments": (JobParser, lambda n: _ac01(
+        VEHICLE_HEADER + "FORD FOCUS Blue AB12CDE X\nCOMMENTS\n" + "call ahead please\n" * n)),
+    "ac01 vehicle no colour": (JobParser, lambda n: _ac01(VEHICLE_HEADER + "FORD " + "focus " * n)),
+    "ac01 vehicle spaces": (JobParser, lambda n: _ac01(VEHICLE_HEADER + "FORD" + " " * n + "x")),
+    "ac01 vehicle words and spaces": (JobParser, lambda n: _ac01(VEHICLE_HEADER + "FORD " + "a  " * n)),
+    "ac01 long model field": (JobParser, lambda n: _ac01("MODEL: " + "A " * n)),
+    "ac01 repeated model": (JobParser, lambda n: _ac01("MODEL:A " * n)),
+    "ac01 repeated make": (JobParser, lambda n: _ac01("MAKE:" * n)),
+    "ac01 repeated job no": (JobParser, lambda n: _ac01("JOB NO " * n)),
+    "ac01 repeated your_ref": (JobParser, lambda n: _ac01("YOUR_REF" * n)),
+    "ac01 repeated ref": (JobParser, lambda n: _ac01("REF " * n)),
+    "ac01 long reg field": (JobParser, lambda n: _ac01("REG " + "A" * n)),
+    "ac01 long tel line": (JobParser, lambda n: "FROM\nt" + " " * n + "x\nTO\nx\n"),
+    "ac01 many tel lines": (JobParser, lambda n: "FROM\n" + "Tel: 0121 788 6940\n" * n + "TO\nx\n"),
+    "ac01 many address lines": (JobParser, lambda n: _ac01("Tel 1\n" + "Some Street\n" * n + "B1 1AA\n")),
+    "ac01 repeated town": (JobParser, lambda n: _ac01("Leeds\n" * n)),
+    "bc04 repeated job number": (BC04Parser, lambda n: "Job Number " * n + "AB12CDE\n"),
+    "bc04 digit run before a dot": (BC04Parser, lambda n: "AB12CDE 123456789\n" + "1" * n + "."),
+    "bc04 digits only": (BC04Parser, lambda n: "AB12CDE\n" + "1" * n),
+    "bc04 repeated reg": (BC04Parser, lambda n: "AB12CDE " * n),
+    "bc04 repeated special instructions": (BC04Parser, lambda n: "Special Instructions\n" * n + "AB12CDE 1234567890\n"),
+    "bc04 many address lines": (BC04Parser, lambda n: "Special Instructions\n" + "Some Street\n" * n + "AB12CDE 1234567890\n"),
+    "bc04 long phone line": (BC04Parser, lambda n: "AB12CDE\n" + "12345678 " * n + "\n01/01/2025\n"),
+    "bc04 long reg line": (BC04Parser, lambda n: "AB12CDE " + "9" * n + " " + "x" * n),
+}
+
+
+def build(make_job, chars):
+    """The job from make_job repeated to about chars characters."""
+    per_repeat = max(1, len(make_job(100)) // 100)
+    return make_job(max(1, chars // per_repeat))
+
+
+def time_parse(parser_class, job_text, repeat):
+    # Straight to _parse_job_text so the limits being checked don't apply
+    parser = parser_class("01/01/2025", "02/01/2025")
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser._parse_job_text(job_text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def check_quarantine(chars):
+    """A job over MAX_JOB_CHARS is quarantined and its neighbours still parse."""
+    job = "FROM\nDepot\nB1 1AA\nTO\nCustomer\nLS11 5TT\n" + VEHICLE_HEADER + "FORD FOCUS Blue AB12CDE X\n"
+    huge = "FROM\n" + "x\n" * (job_parser_core.MAX_JOB_CHARS // 2 + 1) + "TO\nY\n"
+    parser = JobParser("01/01/2025")
+    start = time.perf_counter()
+    jobs = parser.parse_jobs(job + "\n" + huge + "\n" + job)
+    elapsed = time.perf_counter() - start
+    ok = len(jobs) == 2 and [problem.index for problem in parser.quarantined] == [1]
+    print(f"{'oversize job quarantined':<36} {elapsed * 1e3:9.2f}ms  {'ok' if ok else 'FAILED'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--chars', type=int, default=job_parser_core.MAX_JOB_CHARS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', action='append', choices=sorted(CORPUS), help="run only these cases")
+    args = parser.parse_args()
+
+    budget = job_parser_core.JOB_TIME_BUDGET
+    failures = []
+    for name in args.case or CORPUS:
+        parser_class, make_job = CORPUS[name]
+        small = time_parse(parser_class, build(make_job, args.chars // 10), args.repeat)
+        large = time_parse(parser_class, build(make_job, args.chars), args.repeat)
+        growth = large / max(small, 1e-4)
+        problems = []
+        if growth > MAX_GROWTH:
+            problems.append("superlinear")
+        if budget is not None and large > budget:
+            problems.append("over budget")
+        print(f"{name:<36} {small * 1e3:9.2f}ms {large * 1e3:9.2f}ms  x{growth:5.1f}  "
+              f"{', '.join(problems) or 'ok'}")
+        if problems:
+            failures.append(name)
+
+    if not args.case and not check_quarantine(args.chars):
+        failures.append("oversize job quarantined")
+    if failures:
+        print(f"failed: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Sharded job export benchmark.
+
+Usage:
+    python benchmarks/bench_sharded_export.py [--jobs 100000] [--max-rows 10000] [--max-bytes 1000000]
+
+Writes the same jobs as one CSV with csv_export.write_csv() and as shards
+with sharded_export.write_shards(): with one writer thread and with four,
+then split by customer ref. Checks every shard is within the
+limits and matches its manifest checksum, and that the shards hold exactly
+the rows of the single CSV; fails otherwise.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_csv_export import make_jobs  # noqa: E402
+from csv_export import job_rows, write_csv  # noqa: E402
+from sharded_export import check_shards, manifest_path, write_shards  # noqa: E402
+
+REFS = ('GR11', 'GR15')
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))[1:]
+
+
+def check(csv_path, shard_path, manifest, max_rows, max_bytes):
+    directory = os.path.dirname(shard_path)
+    problems = check_shards(manifest_path(shard_path))
+    rows = []
+    for entry in manifest['shards']:
+        path = os.path.join(directory, entry['file'])
+        if entry['rows'] > max_rows or os.path.getsize(path) > max_bytes:
+            problems.append(entry)
+        rows.extend(read_rows(path))
+    return not problems and sorted(rows) == sorted(read_rows(csv_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--max-rows', type=int, default=10000)
+    parser.add_argument('--max-bytes', type=int, default=1000000)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    for i, job in enumerate(jobs):
+        job['CUSTOMER REF'] = REFS[i % len(REFS)]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'jobs.csv')
+        start = time.perf_counter()
+        write_csv(csv_path, job_rows(jobs))
+        elapsed = time.perf_counter() - start
+        print(f"single CSV           {len(jobs):>7} jobs {elapsed:7.3f}s")
+
+        ok = True
+        runs = [("shards, 1 thread", 1, None), ("shards, 4 threads", 4, None),
+                ("shards by ref", 4, 'CUSTOMER REF')]
+        for label, workers, split_field in runs:
+            directory = os.path.join(tmp, label.replace(' ', '_').replace(',', ''))
+            shard_path = os.path.join(directory, 'jobs.csv')
+            os.makedirs(directory)
+            start = time.perf_counter()
+            manifest = write_shards(shard_path, job_rows(jobs), max_rows=args.max_rows, max_bytes=args.max_bytes,
+                                    split_field=split_field, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<20} {len(jobs):>7} jobs {elapsed:7.3f}s  {len(manifest['shards'])} shards")
+            ok = ok and check(csv_path, shard_path, manifest, args.max_rows, args.max_bytes)
+        print(f"sample shard: {json.dumps(manifest['shards'][0])}")
+        print("shards match" if ok else "shards DIFFER")
+        if not ok:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Streaming workbook ingestion benchmark.
+
+Usage:
+    python benchmarks/bench_workbooks.py [--rows 50000] [--chunk-rows 2000]
+
+Writes a generated Greenhous sheet (see bench_greenhous.py) to an .xlsx file
+and turns it into preview rows twice: with pd.read_excel() and one
+gr_preview_frame() over the whole sheet, and chunk by chunk through
+workbooks.iter_sheet_chunks(). Reports the time to the first preview rows,
+the total time and (in a second, traced run) the peak Python memory of each,
+with the preview rows hashed as they come rather than kept. Fails if the
+rows differ.
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_greenhous import make_sheet  # noqa: E402
+from greenhous import GR_REQUIRED_COLUMNS, find_columns, gr_preview_frame, iter_gr_preview_frames  # noqa: E402
+from workbooks import iter_sheet_chunks  # noqa: E402
+
+
+def whole_sheet(path, chunk_rows):
+    df = pd.read_excel(path)
+    columns, _ = find_columns(df, GR_REQUIRED_COLUMNS)
+    yield gr_preview_frame(df, columns)
+
+
+def streamed(path, chunk_rows):
+    return iter_gr_preview_frames(iter_sheet_chunks(path, chunk_rows=chunk_rows))
+
+
+def consume(previews):
+    """(seconds to the first preview, total seconds, rows, digest of the rows)."""
+    start = time.perf_counter()
+    first = None
+    count = 0
+    digest = hashlib.blake2b(digest_size=16)
+    for preview in previews:
+        if first is None:
+            first = time.perf_counter() - start
+        for row in preview.itertuples(index=False, name=None):
+            digest.update(repr(row).encode())
+            count += 1
+    return first, time.perf_counter() - start, count, digest.hexdigest()
+
+
+def peak_memory(previews):
+    tracemalloc.start()
+    consume(previews)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--chunk-rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'greenhous.xlsx')
+        make_sheet(args.rows).to_excel(path, index=False)
+        expected = None
+        for label, read in (("read_excel", whole_sheet), ("streamed", streamed)):
+            first, total, count, digest = consume(read(path, args.chunk_rows))
+            peak = peak_memory(read(path, args.chunk_rows))
+            if expected is None:
+                expected = digest
+            ok = digest == expected
+            print(f"{label:<11} {count:>7} rows  first rows {first:7.3f}s  total {total:7.3f}s  "
+                  f"peak {peak / 2 ** 20:7.1f} MiB  {'ok' if ok else 'MISMATCH'}")
+            if not ok:
+                sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Job XLSX export benchmark.
+
+Usage:
+    python benchmarks/bench_xlsx_export.py [--jobs 100000] [--verify 2000]
+
+Writes the same jobs with csv_export.write_csv() and with
+xlsx_export.write_xlsx() (one sheet, then a sheet per customer ref) at a
+quarter, half and all of --jobs, so the time per row can be seen to stay
+flat, and reports the peak Python memory of the largest workbook. The first
+--verify rows of a workbook are read back with openpyxl and compared with
+the CSV; fails if they differ.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from openpyxl import load_workbook  # noqa: E402
+
+from bench_csv_export import make_jobs  # noqa: E402
+from csv_export import job_rows, write_csv  # noqa: E402
+from xlsx_export import write_xlsx  # noqa: E402
+
+REFS = ('GR11', 'GR15')
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def cell_text(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'strftime'):
+        return value.strftime('%d/%m/%Y')
+    if isinstance(value, (int, float)):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def verify(csv_path, xlsx_path, limit):
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        expected = [row for _, row in zip(range(limit + 1), csv.reader(f))]
+    workbook = load_workbook(xlsx_path, read_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        # A write-only sheet has no dimensions, so trailing blanks aren't read back
+        actual = [[cell_text(value) for value in row] + [''] * (len(expected[0]) - len(row))
+                  for _, row in zip(range(limit + 1), rows)]
+    finally:
+        workbook.close()
+    return actual == expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--verify', type=int, default=2000)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    for i, job in enumerate(jobs):
+        job['CUSTOMER REF'] = REFS[i % len(REFS)]
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'jobs.csv')
+        xlsx_path = os.path.join(tmp, 'jobs.xlsx')
+        for count in (args.jobs // 4, args.jobs // 2, args.jobs):
+            batch = jobs[:count]
+            runs = [
+                ("CSV", lambda: write_csv(csv_path, job_rows(batch))),
+                ("XLSX", lambda: write_xlsx(xlsx_path, job_rows(batch))),
+                ("XLSX per ref", lambda: write_xlsx(xlsx_path, job_rows(batch), sheet_field='CUSTOMER REF')),
+            ]
+            for label, export in runs:
+                elapsed = timed(export)
+                print(f"{label:<13} {count:>7} jobs {elapsed:7.3f}s  {elapsed / count * 1e6:6.1f} us/job")
+
+        tracemalloc.start()
+        write_xlsx(xlsx_path, job_rows(jobs), sheet_field='CUSTOMER REF')
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"XLSX per ref peak memory {peak / 2 ** 20:.1f} MiB, "
+              f"workbook {os.path.getsize(xlsx_path) / 1e6:.1f} MB, CSV {os.path.getsize(csv_path) / 1e6:.1f} MB")
+
+        write_xlsx(xlsx_path, job_rows(jobs))
+        same = verify(csv_path, xlsx_path, args.verify)
+        print("workbook matches CSV" if same else "workbook DIFFERS from CSV")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
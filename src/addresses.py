@@ -0,0 +1,82 @@
+"""Address line clean-up for the AC01 parser.
+
+The depot aliases ("18 AC Stoke Logistics Hub" -> "18 Arnold Clark ...") and
+the names that must never be rewritten ("St. Andrews", "D.M. Keith", "J. R.
+Smith") are compiled into one alternation, so a line is fixed up in a single
+regex pass however many aliases there are. Protected names match as spans
+of their own and are copied through untouched. Nothing is swapped for
+placeholder characters, so addresses containing '@' or '#' come out exactly
+as written. The same depot lines turn up in every batch, so results are
+memoised per line.
+"""
+import re
+from functools import lru_cache
+
+# Names copied through as written, never rewritten by an alias
+PROTECTED_NAMES = (
+    r'St\.?\s+[A-Z][a-z]+',       # St. Andrews, St Mary's etc
+    r'D\.\s*M\.\s*Keith',         # D.M.Keith
+    r'[A-Z]\.\s+[A-Z]\.\s+\w+',   # Any X.Y. format names
+)
+
+# Depot names as they appear on job sheets -> the name used in the CSV
+LOCATION_ALIASES = {
+    '18 AC Stoke Logistics Hub': '18 Arnold Clark Stoke Logistics Hub',
+    '4 AC Accrington Logistics Hub': '4 Arnold Clark Accrington Logistics Hub',
+}
+
+# A line containing one of these is replaced by the location as a whole
+LOCATION_OVERRIDES = {
+    'Unit 1 Calder Park Services': 'Wakefield Motorstore',
+}
+
+ADDRESS_CACHE_SIZE = 16384
+
+
+class AddressNormalizer:
+    """Applies LOCATION_ALIASES/LOCATION_OVERRIDES to a line in one pass."""
+
+    def __init__(self, aliases=LOCATION_ALIASES, overrides=LOCATION_OVERRIDES, protected=PROTECTED_NAMES):
+        self.aliases = dict(aliases)
+        self.overrides = dict(overrides)
+
+        def alternation(names):
+            # Longest first so an alias never loses to one of its prefixes
+            return '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+
+        # An empty alternative would match everywhere, so leave groups out
+        # when there is nothing to put in them
+        parts = []
+        if self.overrides:
+            parts.append(f'(?P<override>{alternation(self.overrides)})')
+        if self.aliases:
+            parts.append(f'(?P<alias>{alternation(self.aliases)})')
+        if protected:
+            parts.append('(?P<protected>' + '|'.join(f'(?:{name})' for name in protected) + ')')
+        # Every name starts a word, so most positions are rejected by \b
+        # before any alternative is tried
+        self.pattern = re.compile(r'\b(?:' + '|'.join(parts) + ')') if parts else None
+        self.normalize_line = lru_cache(maxsize=ADDRESS_CACHE_SIZE)(self._normalize_line)
+
+    def _normalize_line(self, line):
+        """The line with depot aliases expanded, or its override location."""
+        if self.pattern is None:
+            return line
+        pieces = []
+        pos = 0
+        for match in self.pattern.finditer(line):
+            kind = match.lastgroup
+            if kind == 'override':
+                return self.overrides[match.group()]
+            if kind == 'alias':
+                pieces.append(line[pos:match.start()])
+                pieces.append(self.aliases[match.group()])
+                pos = match.end()
+        if not pieces:
+            return line
+        pieces.append(line[pos:])
+        return ''.join(pieces)
+
+
+# Shared instance with the built-in tables
+default_normalizer = AddressNormalizer()
@@ -0,0 +1,165 @@
+"""UK business-day calendar for delivery dates.
+
+The weekends and bank holidays of a range of years are worked out once into
+an ordinal index: for every day in the range, how many business days fall on
+or before it. "N business days after D" is then two list lookups instead of
+stepping a day at a time and asking holidays.UK() about each one. Dates
+outside the range grow it on demand.
+
+add_business_days_array() does the same for a whole column of dates at once
+with NumPy's busday_offset, sharing the calendar's holiday list; the GR11
+loader offsets its due-date column with it (greenhous.offset_dates).
+"""
+import threading
+from datetime import date
+
+import numpy as np
+
+try:
+    import holidays
+    HOLIDAYS_AVAILABLE = True
+except ImportError:
+    HOLIDAYS_AVAILABLE = False
+
+# Years covered by the default calendar, relative to this year
+DEFAULT_YEARS_BACK = 2
+DEFAULT_YEARS_AHEAD = 10
+
+# Business days between collection and delivery for each job type
+AC01_DELIVERY_DAYS = 3
+BC04_DELIVERY_DAYS = 1
+# GR11/GR15 jobs are collected on the sheet's due date
+GR_DELIVERY_DAYS = 1
+
+
+def uk_holiday_dates(first_year, last_year):
+    """UK bank holidays from first_year to last_year inclusive, as dates.
+
+    Empty when the holidays package isn't installed, so only weekends count.
+    """
+    if not HOLIDAYS_AVAILABLE:
+        return []
+    return sorted(holidays.UK(years=range(first_year, last_year + 1)))
+
+
+class BusinessCalendar:
+    """Precomputed Monday-Friday, non-holiday calendar over a range of years."""
+
+    def __init__(self, first_year, last_year, holiday_source=uk_holiday_dates):
+        self._holiday_source = holiday_source
+        self._lock = threading.Lock()
+        self._build(first_year, last_year)
+
+    def _build(self, first_year, last_year):
+        holiday_dates = self._holiday_source(first_year, last_year)
+        holiday_ordinals = {day.toordinal() for day in holiday_dates}
+        start = date(first_year, 1, 1).toordinal()
+        end = date(last_year, 12, 31).toordinal()
+
+        # rank[i]: business days on or before start + i
+        # business_ordinals[k]: ordinal of the (k + 1)th business day
+        rank = []
+        business_ordinals = []
+        for ordinal in range(start, end + 1):
+            # date.fromordinal(1) is a Monday, so ordinal % 7 is 0 on Sundays
+            # and 6 on Saturdays
+            if ordinal % 7 not in (0, 6) and ordinal not in holiday_ordinals:
+                business_ordinals.append(ordinal)
+            rank.append(len(business_ordinals))
+
+        weekday_holidays = [day for day in holiday_dates if day.weekday() < 5]
+        numpy_calendar = np.busdaycalendar(
+            weekmask='1111100', holidays=np.array(weekday_holidays, dtype='datetime64[D]'))
+        # Swapped in as one tuple so a lookup racing a rebuild never mixes
+        # the old and new index
+        self._index = (first_year, last_year, start, rank, business_ordinals, numpy_calendar)
+        self.holidays = weekday_holidays
+
+    @property
+    def first_year(self):
+        return self._index[0]
+
+    @property
+    def last_year(self):
+        return self._index[1]
+
+    def _ensure_covers(self, first_year, last_year):
+        if first_year < self._index[0] or last_year > self._index[1]:
+            with self._lock:
+                current_first, current_last = self._index[:2]
+                if first_year < current_first or last_year > current_last:
+                    self._build(min(first_year, current_first), max(last_year, current_last))
+        return self._index
+
+    def is_business_day(self, day):
+        """True if day (a date or datetime) is a weekday and not a bank holiday."""
+        _, _, start, rank, _, _ = self._ensure_covers(day.year, day.year)
+        index = day.toordinal() - start
+        return rank[index] != (rank[index - 1] if index else 0)
+
+    def add_business_days(self, day, count):
+        """The date count business days after day (count >= 1).
+
+        day can be a date or a datetime and the result is the same type; a
+        datetime keeps its time of day. day itself never counts, even if it
+        is a business day.
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        # Generous headroom for the result, a year has ~250 business days
+        _, _, start, rank, business_ordinals, _ = self._ensure_covers(
+            day.year, day.year + 1 + count // 250)
+        ordinal = day.toordinal()
+        target = business_ordinals[rank[ordinal - start] + count - 1]
+        return day + (date.fromordinal(target) - date.fromordinal(ordinal))
+
+    def add_business_days_array(self, dates, count):
+        """Vectorised add_business_days for a column of dates.
+
+        dates is anything NumPy can turn into datetime64 (a pandas Series of
+        timestamps, a list of dates...). Returns a datetime64[D] array, or a
+        Series with the same index when given a Series. NaT stays NaT.
+        """
+        # A Series' index (list.index is a method, not one)
+        index = None if isinstance(dates, (list, tuple)) else getattr(dates, 'index', None)
+        days = np.asarray(dates, dtype='datetime64[D]')
+        valid = days[~np.isnat(days)]
+        if valid.size:
+            years = valid.astype('datetime64[Y]').astype(int) + 1970
+            numpy_calendar = self._ensure_covers(
+                int(years.min()), int(years.max()) + 1 + count // 250)[5]
+        else:
+            numpy_calendar = self._index[5]
+        # Rolling a weekend/holiday back to the previous business day first
+        # means the day itself never counts, like add_business_days
+        result = np.busday_offset(days, count, roll='backward', busdaycal=numpy_calendar)
+        if index is not None:
+            import pandas as pd
+            return pd.Series(result, index=index)
+        return result
+
+
+_default_calendar = None
+_default_calendar_lock = threading.Lock()
+
+
+def default_calendar():
+    """The shared UK calendar, built on first use."""
+    global _default_calendar
+    if _default_calendar is None:
+        with _default_calendar_lock:
+            if _default_calendar is None:
+                this_year = date.today().year
+                _default_calendar = BusinessCalendar(
+                    this_year - DEFAULT_YEARS_BACK, this_year + DEFAULT_YEARS_AHEAD)
+    return _default_calendar
+
+
+def add_business_days(day, count):
+    """count UK business days after day, see BusinessCalendar.add_business_days."""
+    return default_calendar().add_business_days(day, count)
+
+
+def add_business_days_array(dates, count):
+    """Vectorised add_business_days on the shared UK calendar."""
+    return default_calendar().add_business_days_array(dates, count)
@@ -0,0 +1,214 @@
+"""Typed Parquet / Arrow IPC copies of the job exports.
+
+The job CSVs are all text, so the TMS import and the reporting jobs parse
+all 25 columns of every file again each time they read it. With
+JOB_COLUMNAR_FORMAT set to 'parquet' or 'arrow', or when the GUI's "Also
+save as Parquet" box or the web form's columnar_format asks for it, an
+export also writes the same jobs to a columnar file beside the CSV
+(jobs_x.csv -> jobs_x.parquet), with one fixed schema, JOB_SCHEMA, for every job type:
+COLLECTION DATE and DELIVERY DATE are dates, PRICE is a decimal in pounds
+and pence and CUSTOMER REF is dictionary encoded; the rest stay text, as in
+the CSV. A date or price that doesn't parse is null rather than an error.
+
+ColumnarWriter takes the same row tuples as csv_export.write_csv(), batch by
+batch, and tee() lets one pass over the parsed jobs feed both files, so the
+columnar copy never goes through CSV text. Like the CSVs it is written to a
+temporary file and renamed into place when complete.
+
+Because every file has the same schema, a folder of them (the web app's
+history, or jobs/<job type>/) can be read as one dataset with
+scan_job_files(), reading only the columns asked for.
+
+pyarrow is optional; without it COLUMNAR_AVAILABLE is False and the
+exports are CSV only.
+"""
+import os
+from contextlib import ExitStack
+
+from csv_export import atomic_file
+from job_record import CSV_FIELDNAMES, PRICE_PRECISION, PRICE_SCALE, parse_job_date, parse_job_price
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
+# Columnar formats and the extension each is written with
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Format the exports add beside each CSV, '' for CSV only
+COLUMNAR_FORMAT = os.environ.get('JOB_COLUMNAR_FORMAT', '').strip().lower()
+if COLUMNAR_FORMAT not in COLUMNAR_FORMATS:
+    COLUMNAR_FORMAT = ''
+
+# Format of the copy when the GUI or web form asks for one
+COLUMNAR_OPTION_FORMAT = COLUMNAR_FORMAT or 'parquet'
+
+# Rows per record batch (and Parquet row group at most)
+COLUMNAR_BATCH_ROWS = 10000
+
+DATE_FIELDS = ('COLLECTION DATE', 'DELIVERY DATE')
+PRICE_FIELD = 'PRICE'
+CUSTOMER_REF_FIELD = 'CUSTOMER REF'
+
+
+def _field_type(field):
+    if field in DATE_FIELDS:
+        return pa.date32()
+    if field == PRICE_FIELD:
+        return pa.decimal128(PRICE_PRECISION, PRICE_SCALE)
+    if field == CUSTOMER_REF_FIELD:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+if COLUMNAR_AVAILABLE:
+    JOB_SCHEMA = pa.schema([pa.field(field, _field_type(field)) for field in CSV_FIELDNAMES])
+else:
+    JOB_SCHEMA = None
+
+
+def _text(values):
+    return [value if value is None or type(value) is str else str(value) for value in values]
+
+
+def columnar_path(csv_path, fmt=COLUMNAR_FORMAT):
+    """The file a columnar copy of csv_path is written to."""
+    return os.path.splitext(csv_path)[0] + COLUMNAR_FORMATS[fmt]
+
+
+class ColumnarWriter:
+    """Writes job rows to a Parquet or Arrow IPC file with JOB_SCHEMA.
+
+    fields is the layout of the incoming row tuples (CSV_FIELDNAMES, or
+    JOB_FIELDS for the web app's AC01 CSVs); fields not in the schema are
+    left out. Rows are buffered into batches of batch_rows. Use it as a
+    context manager: the file is renamed into place when the block exits
+    cleanly and discarded if it raises.
+    """
+
+    def __init__(self, path, fmt=None, fields=CSV_FIELDNAMES, batch_rows=COLUMNAR_BATCH_ROWS):
+        if not COLUMNAR_AVAILABLE:
+            raise RuntimeError("pyarrow is needed for Parquet/Arrow exports")
+        if fmt is None:
+            fmt = next((name for name, ext in COLUMNAR_FORMATS.items() if path.endswith(ext)), None)
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format for {path}: {fmt!r}")
+        self.path = path
+        self.format = fmt
+        self.batch_rows = batch_rows
+        self.count = 0
+        positions = {field: i for i, field in enumerate(fields)}
+        missing = [field for field in JOB_SCHEMA.names if field not in positions]
+        if missing:
+            raise ValueError(f"Rows have no {', '.join(missing)} field")
+        self._positions = [positions[field] for field in JOB_SCHEMA.names]
+        self._pending = []
+        # Customer refs seen so far; every batch's dictionary starts with
+        # them, so the IPC file only ever gets dictionary deltas
+        self._refs = {}
+        self._stack = ExitStack()
+        f = self._stack.enter_context(atomic_file(path, 'wb'))
+        try:
+            if fmt == 'parquet':
+                self._writer = pq.ParquetWriter(f, JOB_SCHEMA, compression='zstd')
+            else:
+                self._writer = ipc.new_file(f, JOB_SCHEMA, options=ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+        except BaseException as e:
+            self._stack.__exit__(type(e), e, e.__traceback__)
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort(exc_type, exc, tb)
+        return False
+
+    def write_rows(self, rows):
+        """Add row tuples to the file."""
+        for _ in self.tee(rows):
+            pass
+
+    def tee(self, rows):
+        """Yield rows unchanged, adding each to the file on the way past,
+        e.g. write_csv(path, writer.tee(rows))."""
+        for row in rows:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_rows:
+                self._flush()
+            yield row
+
+    def close(self):
+        """Write what is buffered, finish the file and move it into place.
+
+        Returns the number of rows written.
+        """
+        self._flush()
+        self._writer.close()
+        self._stack.close()
+        return self.count
+
+    def abort(self, exc_type=None, exc=None, tb=None):
+        """Drop the file; path is left as it was."""
+        try:
+            self._writer.close()
+        except Exception:
+            pass
+        self._stack.__exit__(exc_type or RuntimeError, exc or RuntimeError("export aborted"), tb)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        columns = list(zip(*self._pending))
+        arrays = []
+        for field, position in zip(JOB_SCHEMA.names, self._positions):
+            values = columns[position]
+            if field in DATE_FIELDS:
+                arrays.append(pa.array([parse_job_date(value) if value else None for value in _text(values)],
+                                       pa.date32()))
+            elif field == PRICE_FIELD:
+                arrays.append(pa.array([parse_job_price(value) if value else None for value in _text(values)],
+                                       JOB_SCHEMA.field(field).type))
+            elif field == CUSTOMER_REF_FIELD:
+                refs = self._refs
+                indices = [refs.setdefault(value, len(refs)) for value in _text(values)]
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()),
+                                                             pa.array(list(refs), pa.string())))
+            else:
+                try:
+                    arrays.append(pa.array(values, pa.string()))
+                except (pa.ArrowTypeError, pa.ArrowInvalid):
+                    arrays.append(pa.array(_text(values), pa.string()))
+        self._writer.write_batch(pa.record_batch(arrays, schema=JOB_SCHEMA))
+        self.count += len(self._pending)
+        self._pending = []
+
+
+def write_columnar(path, rows, fmt=None, fields=CSV_FIELDNAMES):
+    """Write row tuples of fields to a Parquet/Arrow file at path (the
+    format from its extension unless given), atomically; returns the count."""
+    with ColumnarWriter(path, fmt, fields) as writer:
+        writer.write_rows(rows)
+    return writer.count
+
+
+def scan_job_files(directory, columns=None, fmt='parquet'):
+    """One pyarrow Table of every fmt job file in directory (and below),
+    reading only columns (all of them by default)."""
+    if not COLUMNAR_AVAILABLE:
+        raise RuntimeError("pyarrow is needed to read Parquet/Arrow exports")
+    extension = COLUMNAR_FORMATS[fmt]
+    paths = sorted(os.path.join(root, name)
+                   for root, _, names in os.walk(directory)
+                   for name in names if name.endswith(extension))
+    dataset = ds.dataset(paths, schema=JOB_SCHEMA, format='parquet' if fmt == 'parquet' else 'ipc')
+    return dataset.to_table(columns=columns)
+
@@ -0,0 +1,95 @@
+"""Atomic CSV export shared by the GUI, the web app and the email automation.
+
+Every job CSV is written to a temporary file in the target directory and
+renamed over the target once it is complete, so a half-written file is never
+seen by the import that picks it up and a failed export leaves any earlier
+file untouched. Nothing is probed beforehand: if the directory isn't
+writable or the target is open in Excel, the real write or rename raises the
+PermissionError.
+
+Rows are tuples in a field order worked out once per export (JobRecords go
+through job_record.values_getter()), so the cost is the csv module writing
+bytes and nothing per field or per row on top.
+"""
+import csv
+import os
+import tempfile
+from contextlib import contextmanager
+
+from job_record import CSV_FIELDNAMES, JobRecord, values_getter
+
+# Permissions of an export that doesn't replace an existing file
+DEFAULT_FILE_MODE = 0o644
+
+
+def job_rows(jobs, fields=CSV_FIELDNAMES):
+    """Row tuples of fields for an iterable of jobs (JobRecords or dicts)."""
+    get_values = values_getter(fields)
+    for job in jobs:
+        if type(job) is JobRecord:
+            yield get_values(job)
+        else:
+            yield tuple(job.get(field, '') for field in fields)
+
+
+def frame_rows(frames, fields=CSV_FIELDNAMES):
+    """Row tuples of fields for an iterable of job DataFrames (see
+    greenhous.gr_job_frame() and cw09.cw_job_frame())."""
+    columns = list(fields)
+    for frame in frames:
+        yield from frame[columns].itertuples(index=False, name=None)
+
+
+@contextmanager
+def atomic_file(path, mode='w'):
+    """Open a temporary file beside path for writing, in mode ('w' text,
+    'wb' binary), and rename it over path when the block exits cleanly.
+
+    On any error the temporary file is removed and path is left as it was.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        if 'b' in mode:
+            f = os.fdopen(fd, mode)
+        else:
+            f = os.fdopen(fd, mode, newline='', encoding='utf-8')
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp() files are private to us; give the export the target's
+        # permissions, or the usual ones for a new file
+        try:
+            file_mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            file_mode = DEFAULT_FILE_MODE
+        os.chmod(temp_path, file_mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_csv(path, rows, fields=CSV_FIELDNAMES):
+    """Write a header of fields and then rows to path, atomically.
+
+    Returns the number of rows written. On any error the temporary file is
+    removed and path is left as it was.
+    """
+    count = 0
+    with atomic_file(path) as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for count, row in enumerate(rows, 1):
+            writer.writerow(row)
+    return count
+
+
+def write_jobs_csv(path, jobs, fields=CSV_FIELDNAMES):
+    """write_csv() for an iterable of jobs; returns the number written."""
+    return write_csv(path, job_rows(jobs, fields), fields)
@@ -0,0 +1,83 @@
+"""CW09 workbook ingestion.
+
+CW09 sends a sheet with one column per job field. CW_COLUMN_MAP says which
+sheet column fills which job field and how it is cleaned up on the way;
+cw_job_frame() applies it to a whole sheet (or a chunk of one) a column at
+a time and gives back the final job table, one row per job in JOB_FIELDS
+order. The CW09 Treeview only displays that table and process_cw_jobs
+exports it, nothing is read back out of the Treeview.
+"""
+from collections import namedtuple
+
+import pandas as pd
+
+from greenhous import text_column
+from job_record import JOB_FIELDS
+from phones import normalize_phones
+from postcodes import normalize_postcodes
+
+# One job field filled from one sheet column; transform (a Series ->
+# Series function) runs on the raw column before it is turned into text
+ColumnMapping = namedtuple('ColumnMapping', 'field source transform', defaults=(None,))
+
+CW_COLUMN_MAP = (
+    ColumnMapping('REG NUMBER', 'Reg'),
+    ColumnMapping('VIN', 'VIN'),
+    ColumnMapping('MAKE', 'Make'),
+    ColumnMapping('MODEL', 'Model'),
+    ColumnMapping('COLLECTION DATE', 'Collection Date'),
+    ColumnMapping('YOUR REF NO', 'Your Ref No'),
+    ColumnMapping('COLLECTION ADDR1', 'Collection Address1'),
+    ColumnMapping('COLLECTION ADDR2', 'Collection Address2'),
+    ColumnMapping('COLLECTION ADDR3', 'Collection Address3'),
+    ColumnMapping('COLLECTION ADDR4', 'Collection Address4'),
+    ColumnMapping('COLLECTION POSTCODE', 'Collection Postcode', normalize_postcodes),
+    # The contact name heads the delivery address, so the sheet's three
+    # address lines move down to ADDR2-4
+    ColumnMapping('DELIVERY ADDR1', 'Delivery Contact Name'),
+    ColumnMapping('DELIVERY ADDR2', 'Delivery Address1'),
+    ColumnMapping('DELIVERY ADDR3', 'Delivery Address2'),
+    ColumnMapping('DELIVERY ADDR4', 'Delivery Address3'),
+    ColumnMapping('DELIVERY POSTCODE', 'Delivery Postcode', normalize_postcodes),
+    ColumnMapping('SPECIAL INSTRUCTIONS', 'SpecialInstructions'),
+    ColumnMapping('PRICE', 'Price'),
+    ColumnMapping('DELIVERY CONTACT PHONE', 'Delivery Contact Phone', normalize_phones),
+    ColumnMapping('DELIVERY CONTACT NAME', 'Delivery Contact Name'),
+)
+
+# Fields every CW09 job gets regardless of the sheet
+CW_FIXED_FIELDS = {'CUSTOMER REF': 'CW09'}
+
+# Job fields shown in the CW09 Treeview, in its column order
+CW_TREE_FIELDS = (
+    'REG NUMBER', 'VIN', 'MAKE', 'MODEL', 'COLLECTION DATE', 'YOUR REF NO', 'COLLECTION ADDR1',
+    'COLLECTION ADDR2', 'COLLECTION ADDR3', 'COLLECTION ADDR4', 'COLLECTION POSTCODE', 'DELIVERY ADDR1',
+    'DELIVERY ADDR2', 'DELIVERY ADDR3', 'DELIVERY ADDR4', 'DELIVERY POSTCODE', 'SPECIAL INSTRUCTIONS', 'PRICE',
+)
+
+
+def _job_column(series, transform):
+    if transform is not None:
+        series = transform(series)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        # str() of each Timestamp, as the Treeview has always shown them,
+        # rather than astype(str)'s date-only form
+        series = series.astype(object)
+    text = text_column(series)
+    # Sheets exported from other tools spell blanks out as 'nan'
+    return text.where(text.str.lower() != 'nan', '')
+
+
+def cw_job_frame(df, column_map=CW_COLUMN_MAP):
+    """The job table (JOB_FIELDS columns, all text) for the rows of a CW09 sheet.
+
+    Fields with no mapping, or whose column isn't in the sheet, are ''.
+    """
+    jobs = pd.DataFrame('', index=pd.RangeIndex(len(df)), columns=list(JOB_FIELDS), dtype=object)
+    for mapping in column_map:
+        if mapping.source in df.columns:
+            column = df[mapping.source].reset_index(drop=True)
+            jobs[mapping.field] = _job_column(column, mapping.transform)
+    for field, value in CW_FIXED_FIELDS.items():
+        jobs[field] = value
+    return jobs
@@ -0,0 +1,163 @@
+"""Debug log of the desktop app, its email automation and the web app.
+
+log_debug() used to open debug_log.txt, append one line and close it again
+on every call, several times per row in the load and export loops. Now
+everything logs through the standard logging module to app_log, whose one
+handler, a BackgroundLogHandler, only puts the record on a bounded queue.
+A logging.handlers.QueueListener thread takes records off the queue and
+writes them through a RotatingFileHandler, which starts a new file once the
+current one passes LOG_MAX_BYTES (keeping LOG_BACKUPS old ones).
+
+Messages below the log level are dropped before they are formatted, so hot
+loops pass %-style arguments (app_log.debug("Job %d: %s", i, reg)) rather
+than f-strings, and guard anything costly with app_log.isEnabledFor(DEBUG).
+The level comes from the DEBUG_LOG_LEVEL environment variable; QUIET (only
+errors) is the production setting. If the writer falls behind, new records
+are dropped and counted rather than stalling the caller. The web app sends
+its Flask logger to the same file at the same level with add_log_handler().
+
+A forked process (the parsers' pool workers) doesn't inherit the listener
+thread, and may inherit the queue's lock held, so in a child every
+BackgroundLogHandler gets a fresh queue and discards what is logged to it.
+Pool workers send back anything worth logging for the parent to log.
+"""
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import threading
+import weakref
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+# DEBUG_LOG_LEVEL values; QUIET keeps errors only
+LOG_LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR, 'QUIET': ERROR}
+
+LOG_NAME = 'vehicle_transport'
+DEBUG_LOG_PATH = os.path.join(tempfile.gettempdir(), "debug_log.txt")
+DEFAULT_LOG_LEVEL = 'INFO'
+LOG_FORMAT = '[%(asctime)s] %(levelname)s: %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Records waiting for the writer; past this, new ones are dropped
+LOG_QUEUE_SIZE = 10000
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room rather than fail to stop when the queue is full
+        self.queue.put(self._sentinel)
+
+
+# Every BackgroundLogHandler, to reset in forked children
+_background_handlers = weakref.WeakSet()
+
+
+class BackgroundLogHandler(logging.handlers.QueueHandler):
+    """Queues records for a QueueListener thread that writes them to handlers.
+
+    The thread starts with the first record. Records are formatted by the
+    thread, not the caller, so the arguments of a call must not change after
+    it (pass copies of anything mutable). In a forked child, records are
+    discarded.
+    """
+
+    def __init__(self, *handlers, queue_size=LOG_QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.handlers = handlers
+        self.queue_size = queue_size
+        self.listener = None
+        self.forked = False
+        # Records dropped because the queue was full, and of those the ones
+        # not yet reported in the log
+        self.dropped = 0
+        self._unreported = 0
+        self._start_lock = threading.Lock()
+        _background_handlers.add(self)
+
+    def prepare(self, record):
+        # Leave formatting to the listener thread
+        return record
+
+    def enqueue(self, record):
+        if self.forked:
+            return
+        if self.listener is None:
+            self._start()
+        try:
+            if self._unreported:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': record.name, 'levelno': WARNING, 'levelname': 'WARNING',
+                    'msg': "%d log records dropped, the log fell behind", 'args': (self._unreported,)}))
+                self._unreported = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+    def _start(self):
+        with self._start_lock:
+            if self.listener is None:
+                listener = _Listener(self.queue, *self.handlers, respect_handler_level=True)
+                listener.start()
+                self.listener = listener
+
+    def flush(self):
+        """Wait until every queued record has been written."""
+        if self.listener is not None:
+            self.queue.join()
+            for handler in self.handlers:
+                handler.flush()
+
+    def after_fork_in_child(self):
+        """Drop the parent's queue and listener, and log nothing from here on."""
+        self.forked = True
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        self.listener = None
+        self._start_lock = threading.Lock()
+
+    def close(self):
+        """Write what is queued and stop the writer (logging.shutdown() runs
+        this at exit)."""
+        with self._start_lock:
+            listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
+
+def file_log_handler(path=DEBUG_LOG_PATH, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS, queue_size=LOG_QUEUE_SIZE):
+    """A BackgroundLogHandler writing to a size-rotated file at path."""
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                   encoding='utf-8', delay=True)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+    return BackgroundLogHandler(handler, queue_size=queue_size)
+
+
+def add_log_handler(logger):
+    """Send logger's records (the web app's Flask logger) to the app log
+    file too, at the app log's level."""
+    logger.addHandler(log_handler)
+    logger.setLevel(app_log.level)
+
+
+def _after_fork_in_child():
+    for handler in list(_background_handlers):
+        handler.after_fork_in_child()
+
+
+# The log everything in the app writes to
+app_log = logging.getLogger(LOG_NAME)
+app_log.setLevel(LOG_LEVELS.get(os.environ.get('DEBUG_LOG_LEVEL', DEFAULT_LOG_LEVEL).upper(), INFO))
+app_log.propagate = False
+log_handler = file_log_handler()
+app_log.addHandler(log_handler)
+os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,78 @@
+"""Every file one job export writes, from a single pass over the jobs.
+
+The CSV is always written; it is what the TMS import picks up. For the
+carrier portal's upload limits it can instead be split into shards with a
+manifest (sharded_export.py). Alongside it an export can add a typed
+Parquet/Arrow copy (columnar_export.py, on when JOB_COLUMNAR_FORMAT is set)
+and an Excel workbook for the customer (xlsx_export.py). The rows are teed
+through each extra writer on their way into the CSV, so the jobs are only
+iterated, and parsed, once.
+"""
+import os
+from collections import namedtuple
+from contextlib import ExitStack
+
+from columnar_export import COLUMNAR_AVAILABLE, COLUMNAR_FORMAT, ColumnarWriter, columnar_path
+from csv_export import write_csv
+from job_record import CSV_FIELDNAMES
+from sharded_export import manifest_path, write_shards
+from xlsx_export import JobWorkbookWriter
+
+# Field the workbook is split on when it has one sheet per customer ref
+SHEET_PER_REF_FIELD = 'CUSTOMER REF'
+
+# What write_exports() wrote: the row count, the columnar, workbook and
+# shard manifest paths (None for those it didn't write) and how many shards
+# the CSV was split into (0 if it wasn't)
+ExportResult = namedtuple('ExportResult', 'count columnar_path xlsx_path manifest_path shard_count',
+                          defaults=(None, 0))
+
+
+def xlsx_path(csv_path):
+    """The file an Excel copy of csv_path is written to."""
+    return os.path.splitext(csv_path)[0] + '.xlsx'
+
+
+def write_exports(csv_path, rows, fields=CSV_FIELDNAMES, columnar_format=COLUMNAR_FORMAT, xlsx=False,
+                  sheet_per_ref=False, shards=None):
+    """write_csv() of rows to csv_path, plus the columnar copy (if
+    columnar_format is set and pyarrow is installed) and the .xlsx workbook
+    (if xlsx, split into a sheet per customer ref with sheet_per_ref) beside
+    it. The extra files are only kept if the CSV is written in full.
+
+    With shards (a sharded_export.ShardLimits) the CSV is written as shards
+    and a manifest named after csv_path instead of as csv_path itself.
+
+    Returns an ExportResult.
+    """
+    with ExitStack() as stack:
+        columnar_file = workbook_file = None
+        if columnar_format and COLUMNAR_AVAILABLE:
+            columnar_file = columnar_path(csv_path, columnar_format)
+            rows = stack.enter_context(ColumnarWriter(columnar_file, columnar_format, fields)).tee(rows)
+        if xlsx:
+            workbook_file = xlsx_path(csv_path)
+            sheet_field = SHEET_PER_REF_FIELD if sheet_per_ref else None
+            rows = stack.enter_context(JobWorkbookWriter(workbook_file, fields, sheet_field)).tee(rows)
+        if shards is not None:
+            manifest = write_shards(csv_path, rows, fields, *shards)
+            count, shard_count = manifest['rows'], len(manifest['shards'])
+            manifest_file = manifest_path(csv_path)
+        else:
+            count = write_csv(csv_path, rows, fields)
+            manifest_file, shard_count = None, 0
+    return ExportResult(count, columnar_file, workbook_file, manifest_file, shard_count)
+
+
+def describe_export(csv_path, export):
+    """Lines saying where an export's files went, for messages to the user."""
+    if export.manifest_path:
+        shards = "1 shard" if export.shard_count == 1 else f"{export.shard_count} shards"
+        lines = [f"CSV split into {shards}, listed in:", export.manifest_path]
+    else:
+        lines = ["CSV:", csv_path]
+    if export.xlsx_path:
+        lines += ["Excel copy:", export.xlsx_path]
+    if export.columnar_path:
+        lines += ["Columnar copy:", export.columnar_path]
+    return lines
@@ -0,0 +1,341 @@
+"""Greenhous (GR11/GR15) workbook ingestion.
+
+A weekly Greenhous sheet can run to tens of thousands of rows, so it is
+turned into preview rows a column at a time rather than row by row: blank
+registrations are dropped with one mask, GR11/GR15 is decided with one
+string search over the PDI Centre column, dates are formatted in one
+strftime() and the make is split off the model with one pass per known
+make. The result is the same as the old per-row loop, value for value.
+
+Exporting turns the preview into jobs the same way (gr_job_frame()). The
+delivery address is split into ADDR1-4 and a postcode by a
+DeliveryAddressSplitter, which compiles its rules once and splits each
+distinct address once, however many rows share it.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from business_days import GR_DELIVERY_DAYS, add_business_days_array
+from job_record import DATE_FORMAT, JOB_FIELDS
+from postcodes import split_postcode
+
+# Workbook columns a Greenhous sheet must have (matched case-insensitively)
+GR_REQUIRED_COLUMNS = ('Reg No', 'PDI Centre', 'Model', 'Chassis', 'Delivery Due Date', 'Delivery Address')
+
+# Makes recognised in the Model column, in the order they are tried
+GR_MAKES = ("FORD", "VAUXHALL", "VOLKSWAGEN", "VW", "BMW", "MERCEDES", "AUDI",
+            "TOYOTA", "HONDA", "NISSAN", "HYUNDAI", "KIA", "SKODA", "SEAT",
+            "RENAULT", "PEUGEOT", "CITROEN", "FIAT", "MAZDA", "VOLVO")
+
+# Vehicles at the Upper Heyford PDI centre are GR15, everything else GR11
+GR15_PDI_PATTERN = 'UPPER|HEYFORD'
+GR_COLLECTION_ADDRESSES = {
+    'GR11': "Greenhous High Ercall, Greenhous Village Osbaston, TF6 6RA",
+    'GR15': "Greenhous Upper Heyford, Heyford Park, Bicester, OX25 5HA",
+}
+
+# Collection address fields of each customer ref: ADDR1-4 and postcode
+GR_COLLECTION_FIELDS = {
+    'GR11': ("Greenhous High Ercall", "Greenhous Village Osbaston", "High Ercall", "", "TF6 6RA"),
+    'GR15': ("Greenhous Upper Heyford", "Heyford Park, Bicester", "Bicester", "UPPER HEYFORD", "OX25 5HA"),
+}
+
+# Preview columns, in the GR11 Treeview's order
+GR_PREVIEW_COLUMNS = ("reg_no", "customer_ref", "vin", "make", "model", "collection_date",
+                      "collection_addr", "delivery_addr", "pdi_centre")
+
+# Delivery addresses come from a few hundred rental branches, each repeated
+# across thousands of rows
+ADDRESS_SPLIT_CACHE_SIZE = 16384
+
+# Fix-ups applied in order to a delivery address before it is split, keeping
+# branch names with their numbers ("FLEX E REN, 84-90") and road numbers
+# with their roads ("84-90, BRADES ROAD"). All are case-insensitive.
+BRANCH_PREFIX_PATTERN = r'FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS'
+BRANCH_FIXES = (
+    (r'(' + BRANCH_PREFIX_PATTERN + r')[\s,]+(\d+[\-\d]*)', r'\1 \2'),
+    (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(WEST)', r'\1 \2'),
+    (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ST)', r'\1 \2'),
+    (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(UNIT)', r'\1 \2'),
+    (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(MARCH)', r'\1 \2'),
+    (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(IVATT)', r'\1 \2'),
+    (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(LANDGATI)', r'\1 \2'),
+    (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ASCOT)', r'\1 \2'),
+)
+ROAD_NUMBER_FIXES = (
+    (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:Road|Street|Avenue|Lane|Drive|Close|Way|ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY))', r'\1 \2'),
+    (r'(\d+[\-\d]*)\s*,\s*(BRADES[\s]*ROAD)', r'\1 \2'),
+    (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:\s(?:Rd|St|Ave|Ln|Dr|Cl|RD|ST|AVE|LN|DR|CL)))', r'\1 \2'),
+)
+
+# Delivery fields split out of one address
+DELIVERY_ADDRESS_FIELDS = ('DELIVERY ADDR1', 'DELIVERY ADDR2', 'DELIVERY ADDR3', 'DELIVERY ADDR4', 'DELIVERY POSTCODE')
+
+
+def find_columns(df, required):
+    """Map each required column name to the workbook's own spelling of it.
+
+    Returns (found, missing): a dict of the matches and a list of the
+    required names with no column, both in the order of required.
+    """
+    by_lower = {}
+    for column in df.columns:
+        by_lower.setdefault(str(column).lower(), column)
+    found = {name: by_lower[name.lower()] for name in required if name.lower() in by_lower}
+    return found, [name for name in required if name not in found]
+
+
+def text_column(series):
+    """str() of every value, '' for blanks (NaN, None, NaT)."""
+    return series.astype(str).where(series.notna(), "")
+
+
+def _format_date(value):
+    if isinstance(value, str):
+        return value
+    try:
+        return value.strftime(DATE_FORMAT)
+    except Exception:
+        return str(value)
+
+
+def format_dates(series):
+    """dd/mm/yyyy for dates, strings as they are, '' for blanks.
+
+    Anything else (Excel serial numbers...) is written out with str(). A
+    sheet only covers a few weeks, so each distinct date is formatted once.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(series) and series.dtype != object:
+        return text_column(series)
+    codes, uniques = pd.factorize(series)
+    if pd.api.types.is_datetime64_any_dtype(uniques):
+        formatted = np.asarray(uniques.strftime(DATE_FORMAT), dtype=object)
+    elif all(isinstance(value, (str, date)) for value in uniques):
+        formatted = np.array([_format_date(value) for value in uniques], dtype=object)
+    else:
+        # factorize() treats 1, 1.0 and True as one value but str() doesn't
+        return series.map(_format_date).where(series.notna(), "")
+    # factorize() gives blanks the code -1, which picks the trailing ''
+    return pd.Series(np.append(formatted, "")[codes], index=series.index, dtype=object)
+
+
+def offset_dates(dates, count):
+    """dd/mm/yyyy date strings count UK business days later, the whole
+    column in one busday_offset (see business_days.py).
+
+    Anything that isn't such a date ('TBC', '') is left as it is.
+    """
+    codes, uniques = pd.factorize(dates)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=DATE_FORMAT, errors='coerce')
+    shifted = pd.Series(add_business_days_array(parsed, count)).dt.strftime(DATE_FORMAT)
+    formatted = np.asarray(shifted.where(parsed.notna(), pd.Series(uniques, dtype=object)), dtype=object)
+    return pd.Series(formatted[codes], index=dates.index, dtype=object)
+
+
+def split_makes(models, makes=GR_MAKES):
+    """(make, model) columns from a Model column of text.
+
+    The make is the first of makes found anywhere in the model, ignoring
+    case, and is cut off the front of the model when the model starts
+    with it.
+    """
+    models = models.copy()
+    lowered = models.str.lower()
+    found = pd.Series("", index=models.index, dtype=object)
+    unmatched = models != ""
+    for make in makes:
+        if not unmatched.any():
+            break
+        candidates = lowered[unmatched]
+        hit = candidates.str.contains(make.lower(), regex=False)
+        hit_index = candidates.index[hit.to_numpy(dtype=bool)]
+        if not len(hit_index):
+            continue
+        found[hit_index] = make
+        unmatched[hit_index] = False
+        leading = hit_index[lowered[hit_index].str.startswith(make.lower()).to_numpy(dtype=bool)]
+        models[leading] = models[leading].str[len(make):].str.strip()
+    return found, models
+
+
+def gr_customer_refs(pdi_centres):
+    """'GR15' for the Upper Heyford PDI centre, 'GR11' otherwise."""
+    gr15 = pdi_centres.str.upper().str.contains(GR15_PDI_PATTERN, regex=True).to_numpy(dtype=bool)
+    return pd.Series(np.where(gr15, 'GR15', 'GR11'), index=pdi_centres.index, dtype=object)
+
+
+def gr_preview_frame(df, columns):
+    """Preview rows (GR_PREVIEW_COLUMNS) for the rows of df with a registration.
+
+    columns maps each of GR_REQUIRED_COLUMNS to its name in df, see
+    find_columns().
+    """
+    regs = df[columns['Reg No']]
+    keep = regs.notna() & (regs.astype(str).str.strip() != "")
+    df = df[keep].reset_index(drop=True)
+
+    pdi_centres = text_column(df[columns['PDI Centre']])
+    customer_refs = gr_customer_refs(pdi_centres)
+    makes, models = split_makes(text_column(df[columns['Model']]))
+    return pd.DataFrame({
+        'reg_no': df[columns['Reg No']].astype(str),
+        'customer_ref': customer_refs,
+        'vin': text_column(df[columns['Chassis']]),
+        'make': makes,
+        'model': models,
+        'collection_date': format_dates(df[columns['Delivery Due Date']]),
+        'collection_addr': customer_refs.map(GR_COLLECTION_ADDRESSES),
+        'delivery_addr': text_column(df[columns['Delivery Address']]),
+        'pdi_centre': pdi_centres,
+    }, columns=list(GR_PREVIEW_COLUMNS))
+
+
+def iter_gr_preview_frames(chunks):
+    """gr_preview_frame() of each chunk of one sheet, see
+    workbooks.iter_sheet_chunks().
+
+    Raises ValueError if the sheet is missing any of GR_REQUIRED_COLUMNS.
+    """
+    columns = None
+    for chunk in chunks:
+        if columns is None:
+            columns, missing = find_columns(chunk, GR_REQUIRED_COLUMNS)
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        yield gr_preview_frame(chunk, columns)
+
+
+class DeliveryAddressSplitter:
+    """Splits a Greenhous delivery address into ADDR1-4 and a postcode.
+
+    The rules are compiled once. split() is memoised per address, and
+    split_column() splits only the distinct addresses of a column. The
+    fix-ups that need "FLEX"/"ENTERPRI" or a number before a comma are
+    skipped for addresses without one, which is what most are.
+    """
+
+    def __init__(self, branch_fixes=BRANCH_FIXES, road_number_fixes=ROAD_NUMBER_FIXES,
+                 cache_size=ADDRESS_SPLIT_CACHE_SIZE):
+        self.branch_fixes = [(re.compile(pattern, re.IGNORECASE), replacement)
+                             for pattern, replacement in branch_fixes]
+        self.road_number_fixes = [(re.compile(pattern, re.IGNORECASE), replacement)
+                                  for pattern, replacement in road_number_fixes]
+        self.branch_prefix = re.compile(r'^(' + BRANCH_PREFIX_PATTERN + r')$', re.IGNORECASE)
+        self.number = re.compile(r'^\d+[\-\d]*$')
+        self.road = re.compile(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY)$', re.IGNORECASE)
+        self.numbered_road = re.compile(r'^\d+[\-\d]*\s+[A-Za-z\s]+')
+        self.road_word = re.compile(r'\b(Road|Street|Avenue|Lane|Drive|Close)\b', re.IGNORECASE)
+        self.number_comma = re.compile(r'\d\s*,')
+        self.split = lru_cache(maxsize=cache_size)(self._split)
+
+    def _fix_up(self, address):
+        upper = address.upper()
+        if 'FLEX' in upper or 'ENTERPRI' in upper:
+            for pattern, replacement in self.branch_fixes:
+                address = pattern.sub(replacement, address)
+        if self.number_comma.search(address):
+            for pattern, replacement in self.road_number_fixes:
+                address = pattern.sub(replacement, address)
+        return address
+
+    def _combine(self, parts):
+        """Join branch prefixes and road numbers back onto what follows them."""
+        combined = []
+        i = 0
+        while i < len(parts):
+            part = parts[i]
+            if i < len(parts) - 1 and self.branch_prefix.match(part):
+                if i < len(parts) - 2 and self.number.match(parts[i + 1]) and self.road.match(parts[i + 2]):
+                    # [FLEX-E-RE], [84-90], [BRADES ROAD]
+                    combined.append(f"{part} {parts[i + 1]} {parts[i + 2]}")
+                    i += 3
+                else:
+                    combined.append(f"{part} {parts[i + 1]}")
+                    i += 2
+            elif i < len(parts) - 1 and self.number.match(part) and self.road.match(parts[i + 1]):
+                # [84-90], [BRADES ROAD]
+                combined.append(f"{part} {parts[i + 1]}")
+                i += 2
+            else:
+                combined.append(part)
+                i += 1
+        return combined
+
+    def _split(self, address):
+        """(addr1, addr2, addr3, addr4, postcode) of one delivery address."""
+        if not address:
+            return ("", "", "", "", "")
+        # Unbounded, like the per-row split: the postcode is sometimes run
+        # into the town before it
+        postcode, rest = split_postcode(self._fix_up(address), bounded=False)
+        parts = self._combine([part.strip() for part in rest.split(',') if part.strip()])
+
+        addr1 = parts[0] if parts else ""
+        addr2 = addr3 = addr4 = ""
+        if len(parts) > 2 and (self.numbered_road.match(parts[1]) or self.road_word.search(parts[1])):
+            # A street address stays in ADDR2, the next two parts follow it
+            addr2 = parts[1]
+            addr3 = parts[2]
+            if len(parts) > 3:
+                addr4 = parts[3]
+        elif len(parts) > 2:
+            addr2, addr3 = parts[1], parts[2]
+            if len(parts) > 3:
+                addr4 = ' '.join(parts[3:])
+        elif len(parts) > 1:
+            addr2 = parts[1]
+
+        # A short town name left in ADDR3 belongs in ADDR4
+        if not addr4 and addr3 and len(addr3.split()) <= 2:
+            addr3, addr4 = "", addr3
+        return (addr1, addr2, addr3, addr4, postcode)
+
+    def split_column(self, addresses):
+        """DataFrame of DELIVERY_ADDRESS_FIELDS for a column of address text."""
+        codes, uniques = pd.factorize(addresses)
+        splits = [self.split(address) for address in uniques]
+        # Blank cells (code -1) pick the trailing empty split
+        splits.append(self.split(""))
+        table = np.empty((len(splits), len(DELIVERY_ADDRESS_FIELDS)), dtype=object)
+        table[:] = splits
+        return pd.DataFrame(table[codes], index=addresses.index, columns=list(DELIVERY_ADDRESS_FIELDS))
+
+
+# Shared instance, so the memo carries over from one sheet to the next
+default_splitter = DeliveryAddressSplitter()
+
+
+def gr_job_frame(preview, today, splitter=default_splitter):
+    """The job table (JOB_FIELDS columns) for a frame of GR_PREVIEW_COLUMNS rows.
+
+    Rows without a registration are dropped. today (dd/mm/yyyy) stands in
+    for missing due dates, TRANSIT/VAN for a missing make/model. Jobs are
+    collected on the due date and delivered GR_DELIVERY_DAYS business days
+    later.
+    """
+    preview = preview[preview['reg_no'] != ""].reset_index(drop=True)
+    jobs = pd.DataFrame('', index=preview.index, columns=list(JOB_FIELDS), dtype=object)
+    customer_refs = preview['customer_ref'].where(preview['customer_ref'] != "", 'GR11')
+    dates = preview['collection_date'].where(preview['collection_date'] != "", today)
+    jobs['REG NUMBER'] = preview['reg_no']
+    jobs['VIN'] = preview['vin']
+    jobs['MAKE'] = preview['make'].where(preview['make'] != "", "TRANSIT")
+    jobs['MODEL'] = preview['model'].where(preview['model'] != "", "VAN")
+    jobs['COLLECTION DATE'] = dates
+    # The registration doubles as our reference
+    jobs['YOUR REF NO'] = preview['reg_no']
+    # Anything but GR15 is collected from High Ercall
+    collection = np.array([GR_COLLECTION_FIELDS['GR11'], GR_COLLECTION_FIELDS['GR15']], dtype=object)
+    collection = collection[(customer_refs == 'GR15').to_numpy(dtype=int)]
+    for i, field in enumerate(('COLLECTION ADDR1', 'COLLECTION ADDR2', 'COLLECTION ADDR3',
+                               'COLLECTION ADDR4', 'COLLECTION POSTCODE')):
+        jobs[field] = collection[:, i]
+    jobs['DELIVERY DATE'] = offset_dates(dates, GR_DELIVERY_DAYS)
+    jobs[list(DELIVERY_ADDRESS_FIELDS)] = splitter.split_column(preview['delivery_addr'])
+    jobs['SPECIAL INSTRUCTIONS'] = "VIN: " + preview['vin'].where(preview['vin'] != "", 'Unknown')
+    jobs['CUSTOMER REF'] = customer_refs
+    return jobs
@@ -0,0 +1,1055 @@
+"""Text parsers for AC01/EU01 and BC04 job pastes.
+
+Kept free of any tkinter imports so the web app and the email automation can
+share the exact same parsing code as the desktop GUI.
+"""
+import itertools
+import os
+import re
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from addresses import default_normalizer as address_normalizer
+from business_days import AC01_DELIVERY_DAYS, BC04_DELIVERY_DAYS, add_business_days
+from debug_log import app_log
+from job_record import JOB_DEFAULTS, JobRecord
+from phones import normalize_phone
+from postcodes import find_postcode, parse_postcode_line
+from registrations import is_valid_uk_registration
+
+# ---------------------------------------------------------------------------
+# Compiled rule table
+#
+# Every pattern used while parsing a job is compiled once here at import time.
+# parse_single_job runs ~20 searches per job, so on large pastes going through
+# re's pattern cache for each call was the bulk of the parse time.
+# ---------------------------------------------------------------------------
+
+# Job separators for in-memory text, file-like input is split line by line
+JOB_SPLIT_RE = re.compile(r'\nFROM\n')
+BC04_JOB_SPLIT_RE = re.compile(r'Job Sheet\s*\n')
+
+# AC01 section scanners
+#
+# Each scanner reports everything it knows about in one finditer() pass, see
+# scan_job_sections() and scan_job_fields(). Every branch consumes a single
+# character and checks the rest in a lookahead, so anchors that overlap
+# ("\nTO\n" both ends FROM and starts TO) are all reported. Branches sharing
+# a first character are mutually exclusive, except the two JOB NO forms where
+# the stricter one is listed (and preferred) first. No lookahead can run
+# past the end of its own line's whitespace, so blank lines cost one check
+# each (the vehicle table is stripped, so ending it at the newline just
+# before COMMENTS rather than at the first blank line gives the same text).
+SECTION_SCAN_RE = re.compile(r'''
+    [\nFTMmJj] (?:
+        (?<=\n) (?:
+            (?=TO) (?P<from_end>)
+          | (?=JOB\ NO) (?P<to_end>)
+          | (?=[^\S\n]*(?i:COMMENTS|ORIGIN|VALUE)) (?P<vehicle_end>)
+        )
+      | (?<=F) (?=ROM\n) (?P<from_start>)
+      | (?<=T) (?=O\n) (?P<to_start>)
+      | (?<=[Mm]) (?i:(?=(?P<vehicle_start>AKE\s+MODEL\s+COLOU?R\s+REGISTRATION(?:\s+CHASSIS)?\s*\n)))
+      | (?<=[Jj]) (?i:
+            (?=OB\s+NO(?:\s+KEY\s+LOC\s+BARCODE)?\s*\n(?P<job_no>\d+))
+          | (?=OB\s+NO[\s:.]+(?P<job_no_short>\d+))
+        )
+    )''', re.VERBOSE)
+
+# "MAKE: FORD" style fields, used when the vehicle table is missing or short
+FIELD_SCAN_RE = re.compile(r'''
+    [MmCcRrYy] (?:
+        (?<=[Mm]) (?i:
+            (?=AKE\s*:\s*(?P<make>[A-Z-]+(?:-[A-Z]+)?))
+          | (?=ODEL\s*:\s*(?P<model>[A-Z0-9\s]+?)(?:\n|$))
+        )
+      | (?<=[Cc]) (?i:
+            (?=OLOU?R\s*:\s*(?P<colour>[A-Za-z]+))
+          | (?=HASSIS\s*:?\s*(?P<chassis>[A-Z0-9]+))
+        )
+      | (?<=[Rr]) (?i:
+            (?=EG(?:ISTRATION)?\s*:?\s*(?P<reg>[A-Z0-9]+))
+          | (?=EF(?:ERENCE)?(?:\s+NO)?[\s:.]+(?P<ref>\d+))
+        )
+      | (?<=[Yy]) (?i:(?=OUR_REF(?:(?!YOUR_REF)[^\n])*\n(?P<your_ref>\d+)))
+    )''', re.VERBOSE)
+# YOUR_REF looks no further than the next YOUR_REF on its line: every one on
+# a line finds the same number, so only the last needs to read to the end of
+# the line (reading on from each of them was quadratic).
+
+# Phone lines inside the FROM / TO blocks
+PHONE_LINE_RE = re.compile(r'(?:Tel|Phone|T|Telephone)[\s:.]+[+\d()\s-]+', re.IGNORECASE)
+PHONE_CAPTURE_RE = re.compile(r'(?:Tel|Phone|T|Telephone)[\s:.]+([+\d()\s-]+)', re.IGNORECASE)
+
+# Vehicle details
+#
+# Written so a run of spaces can only be split one way (the old
+# "\s+([\w\s]+?)\s+" form backtracked cubically on long runs of spaces).
+# The make takes all the spaces after it and the model starts at the next
+# word; only if that finds no colour can the model be blank, with the colour
+# straight after the make (VEHICLE_LINE_NO_MODEL_RE). Models are stripped.
+VEHICLE_COLOURS = 'Blue|Grey|Black|White|Red|Silver|Green|Yellow|Orange|Purple|Brown|Gold'
+VEHICLE_LINE_RE = re.compile(
+    r'(\w+(?:-\w+)?)\s+(?=\S)([\w\s]+?)\s(' + VEHICLE_COLOURS + r')\s+([A-Z0-9]+)(?:\s+([A-Z0-9]*))?',
+    re.IGNORECASE)
+VEHICLE_LINE_NO_MODEL_RE = re.compile(
+    r'(\w+(?:-\w+)?)\s(\s+)\s(' + VEHICLE_COLOURS + r')\s+([A-Z0-9]+)(?:\s+([A-Z0-9]*))?',
+    re.IGNORECASE)
+CHASSIS_TOKEN_RE = re.compile(r'^[A-Z0-9]+$')
+REG_FIELD_RE = re.compile(r'REG(?:ISTRATION)?\s*:?\s*([A-Z0-9]+)', re.IGNORECASE)
+
+# BC04 job sheets
+# The job number is the first "123/45" after the first "Job Number", searched
+# for from there with pos= rather than with a lazy ".*?" that re-read the rest
+# of the sheet at every "Job Number"
+BC04_JOB_NUMBER_LABEL = 'Job Number'
+BC04_JOB_NUMBER_RE = re.compile(r'(?<!\d)(\d+/\d+)')
+BC04_REG_RE = re.compile(r'([A-Z]{2}\d{2}[A-Z]{3})')
+BC04_VIN_AFTER_REG_RE = re.compile(r'\s+(\d{9,})')
+# A run of digits is only tried from its first digit, or straight after a
+# price that ended inside it, so a long run is read once rather than once per
+# digit (where the old pattern would fail anyway)
+BC04_PRICE_RE = re.compile(r'£?\s*(?:(?<!\d)|(?<=\.\d\d))(\d+\.\d{2})')
+BC04_DATE_RE = re.compile(r'\d{2}/\d{2}/\d{4}')
+BC04_PHONE_RE = re.compile(r'\d{8,}')
+
+# BC04 line classifier
+#
+# Matches once at every line (MULTILINE) and tags the ones that matter:
+#   special   "Special Instructions" line, the addresses follow it
+#   reg_line  "AB12CDE  123456789..." reg/VIN line, ends the addresses
+#   date      line starting dd/mm/yyyy (the line before it may be the phones)
+# The three can't overlap: they start with a letter, an upper case reg and a
+# digit respectively.
+BC04_LINE_RE = re.compile(r'''
+    ^[^\S\n]*
+    (?:
+        (?P<special>(?i:special\ instructions))
+      | (?P<reg_line>[A-Z]{2}\d{2}[A-Z]{3}[^\S\n]+\d{9,})
+      | (?P<date>\d{2}/\d{2}/\d{4})
+    )?
+    [^\n]*''', re.MULTILINE | re.VERBOSE)
+
+# Dates are taken from up to this many lines after the phone line
+BC04_DATE_LOOKAHEAD = 4
+
+# Address fields filled from the lines between "Special Instructions" and
+# the reg/VIN line
+BC04_ADDRESS_FIELDS = {
+    prefix: (f'{prefix} ADDR1', f'{prefix} ADDR2', f'{prefix} ADDR3', f'{prefix} ADDR4', f'{prefix} POSTCODE')
+    for prefix in ('COLLECTION', 'DELIVERY')
+}
+
+
+def scan_job_sections(job_text):
+    """Split an AC01 job into its sections with a single scan of the text.
+
+    Returns a dict with the FROM, TO and vehicle table ('VEHICLE') text and
+    the job number, None where missing. Sections keep the boundaries the old
+    per-section searches used: FROM runs to the next line starting "TO", TO
+    runs to "JOB NO" and the vehicle table stops at COMMENTS, ORIGIN or VALUE.
+    """
+    job_no = job_no_short = None
+    from_start = to_start = vehicle_start = None
+    from_end = to_end = vehicle_end = None
+    for match in SECTION_SCAN_RE.finditer(job_text):
+        name = match.lastgroup
+        pos = match.start()
+        if name == 'from_end':
+            if from_end is None and from_start is not None and pos >= from_start:
+                from_end = pos
+        elif name == 'to_end':
+            if to_end is None and to_start is not None and pos >= to_start:
+                to_end = pos
+        elif name == 'vehicle_end':
+            if vehicle_end is None and vehicle_start is not None and pos >= vehicle_start:
+                vehicle_end = pos
+        elif name == 'from_start':
+            if from_start is None:
+                from_start = pos + len('FROM\n')
+        elif name == 'to_start':
+            if to_start is None:
+                to_start = pos + len('TO\n')
+        elif name == 'vehicle_start':
+            if vehicle_start is None:
+                vehicle_start = match.end(name)
+        elif name == 'job_no':
+            if job_no is None:
+                job_no = match.group(name)
+        elif job_no_short is None:
+            job_no_short = match.group(name)
+        # Everything after the vehicle table is comments and price, stop as
+        # soon as there is nothing left to find
+        if (vehicle_end is not None and from_end is not None and to_end is not None
+                and job_no is not None):
+            break
+
+    end = len(job_text)
+    sections = {'FROM': None, 'TO': None, 'VEHICLE': None, 'JOB NO': job_no or job_no_short}
+    if from_start is not None:
+        sections['FROM'] = job_text[from_start:from_end if from_end is not None else end]
+    if to_start is not None:
+        sections['TO'] = job_text[to_start:to_end if to_end is not None else end]
+    if vehicle_start is not None:
+        sections['VEHICLE'] = job_text[vehicle_start:vehicle_end if vehicle_end is not None else end]
+    return sections
+
+
+def scan_job_fields(job_text):
+    """First value of each single-line field rule, found in one scan.
+
+    Keys are make, model, colour, reg, chassis, ref and your_ref; fields that
+    never appear are left out.
+    """
+    fields = {}
+    for match in FIELD_SCAN_RE.finditer(job_text):
+        name = match.lastgroup
+        if name not in fields:
+            fields[name] = match.group(name)
+    return fields
+
+
+def _find_vin_after_reg(job_text, reg):
+    """Return the 9+ digit VIN that follows the first "<reg> <digits>" in job_text."""
+    start = job_text.find(reg)
+    while start != -1:
+        vin_match = BC04_VIN_AFTER_REG_RE.match(job_text, start + len(reg))
+        if vin_match:
+            return vin_match.group(1)
+        start = job_text.find(reg, start + 1)
+    return None
+
+
+def _iter_split(pattern, text):
+    """re.split() for a group-free pattern, one piece at a time."""
+    start = 0
+    for match in pattern.finditer(text):
+        yield text[start:match.start()]
+        start = match.end()
+    yield text[start:]
+
+
+def _iter_lines(source):
+    """Yield the lines of a file-like object or an iterator of lines.
+
+    Every line but the last is given its trailing newline, so lists of lines
+    without terminators split into jobs the same as the joined text would.
+    """
+    previous = None
+    for line in source:
+        if previous is not None:
+            yield previous if previous.endswith('\n') else previous + '\n'
+        previous = line
+    if previous is not None:
+        yield previous
+
+
+def iter_ac01_job_texts(source):
+    """Yield the raw text of each AC01 job, one "FROM" line to the next.
+
+    Same pieces as re.split(r'\nFROM\n', text) but only one job's lines are
+    held at a time. A FROM line at the very start of the input, or straight
+    after another FROM line, stays part of the job like it did with the split.
+    """
+    if isinstance(source, str):
+        yield from _iter_split(JOB_SPLIT_RE, source)
+        return
+    block = []
+    for line in _iter_lines(source):
+        if line == 'FROM\n' and block:
+            # The newline before FROM belongs to the separator
+            yield ''.join(block)[:-1]
+            block = []
+        else:
+            block.append(line)
+    yield ''.join(block)
+
+
+def iter_bc04_job_texts(source):
+    """Yield the raw text of each BC04 job sheet.
+
+    Same pieces as re.split(r'Job Sheet\s*\n', text): a "Job Sheet" with
+    nothing but whitespace after it on the line ends the current job.
+    """
+    if isinstance(source, str):
+        yield from _iter_split(BC04_JOB_SPLIT_RE, source)
+        return
+    block = []
+    for line in _iter_lines(source):
+        index = line.rfind('Job Sheet')
+        if index != -1 and line.endswith('\n') and not line[index + len('Job Sheet'):].strip():
+            block.append(line[:index])
+            yield ''.join(block)
+            block = []
+        else:
+            block.append(line)
+    yield ''.join(block)
+
+
+# Parallel parsing: job texts per pool task, and the smallest paste worth
+# starting a pool for (below this the worker startup costs more than it saves)
+PARALLEL_CHUNK_SIZE = 500
+PARALLEL_MIN_JOBS = 2000
+
+
+# Per-job limits. Every pattern above runs in time linear in the length of
+# the job, so a job over MAX_JOB_CHARS (far beyond any real job sheet) is
+# quarantined without being parsed at all, and one that raises is
+# quarantined instead of taking the batch down. A parse that takes longer
+# than JOB_TIME_BUDGET seconds is only logged as a warning: the job is still
+# used, since wall-clock time depends on the machine and its load. None
+# switches a limit off.
+JOB_TIME_BUDGET = 0.5
+MAX_JOB_CHARS = 200_000
+QUARANTINE_EXCERPT_CHARS = 200
+
+# A job left out of the results: its position among the raw job texts
+# (counting from 0), why, how long parsing took before it failed and the
+# start of its text
+QuarantinedJob = namedtuple('QuarantinedJob', 'index reason elapsed excerpt')
+
+_PENDING = object()
+
+
+def parse_job_text(parser, index, job_text):
+    """Parse one raw job text within the parser's limits (and through its cache).
+
+    job_text is a piece from iter_ac01_job_texts/iter_bc04_job_texts and
+    index its position, used in diagnostics. Returns (job, None), where job
+    is None if the piece isn't a job, or (None, QuarantinedJob) for a job
+    over MAX_JOB_CHARS or one that raised.
+    """
+    excerpt = job_text[:QUARANTINE_EXCERPT_CHARS]
+    max_chars = parser.max_job_chars
+    if max_chars is not None and len(job_text) > max_chars:
+        reason = f"{len(job_text)} characters, the limit is {max_chars}"
+        return None, QuarantinedJob(index, reason, 0.0, excerpt)
+    start = time.perf_counter()
+    try:
+        job = parser._parse_job_text(job_text)
+    except Exception as e:
+        return None, QuarantinedJob(index, f"{type(e).__name__}: {e}", time.perf_counter() - start, excerpt)
+    return job, None
+
+
+def _cache_key(parser, job_text):
+    return parser.cache.key(type(parser).__name__, parser.collection_date, parser.delivery_date, job_text)
+
+
+def _log_slow_job(parser_name, elapsed, length, budget, excerpt):
+    app_log.warning("%s took %.3fs to parse a %d character job, the budget is %ss: %r",
+                    parser_name, elapsed, length, budget, excerpt)
+
+
+def _parse_prepared_timed(parser, job_text):
+    """parser._parse_prepared(job_text), logging a warning (or adding it to
+    parser.slow_jobs) if it takes longer than the parser's time budget."""
+    start = time.perf_counter()
+    job = parser._parse_prepared(job_text)
+    elapsed = time.perf_counter() - start
+    budget = parser.time_budget
+    if budget is not None and elapsed > budget:
+        slow_job = (type(parser).__name__, elapsed, len(job_text), budget, job_text[:QUARANTINE_EXCERPT_CHARS])
+        if parser.slow_jobs is None:
+            _log_slow_job(*slow_job)
+        else:
+            parser.slow_jobs.append(slow_job)
+    return job
+
+
+def _parse_prepared_cached(parser, job_text):
+    """parser._parse_prepared(job_text) through the parser's cache, if any.
+
+    Only the parse itself counts against the time budget, not the cache.
+    """
+    if parser.cache is None:
+        return _parse_prepared_timed(parser, job_text)
+    key = _cache_key(parser, job_text)
+    found, job = parser.cache.get(key)
+    if not found:
+        job = _parse_prepared_timed(parser, job_text)
+        parser.cache.put(key, job)
+    return job
+
+
+def _parse_chunk(parser_class, collection_date, delivery_date, limits, indexed_texts):
+    """Pool task: parse (index, raw job text) pairs with a fresh parser.
+
+    Returns one result per pair (the job, None if it isn't one, or a
+    QuarantinedJob) and the jobs over the time budget, for the parent to
+    log: a forked worker can't write to the log itself.
+    """
+    parser = parser_class(collection_date, delivery_date, *limits)
+    parser.slow_jobs = []
+    results = []
+    for index, job_text in indexed_texts:
+        job, problem = parse_job_text(parser, index, job_text)
+        results.append(problem or job)
+    return results, parser.slow_jobs
+
+
+def _iter_parsed(parser, job_texts, workers, chunk_size, min_jobs, quarantine=None):
+    """Parse raw job texts in order, on a process pool when it is worth it.
+
+    workers=None uses every core. Only a few chunks per worker are in flight
+    at once, so streamed input is still read as it is needed. Jobs over the
+    parser's limits are left out and, if quarantine is a list, appended to it
+    as QuarantinedJob records. With a parser.cache, blocks parsed before are
+    taken from it (in this process) and only new ones go to the pool.
+    """
+    try:
+        yield from _iter_parsed_texts(parser, job_texts, workers, chunk_size, min_jobs, quarantine)
+    finally:
+        if parser.cache is not None:
+            parser.cache.flush()
+
+
+def _iter_parsed_texts(parser, job_texts, workers, chunk_size, min_jobs, quarantine):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    head = []
+    if workers > 1:
+        job_texts = iter(job_texts)
+        head = list(itertools.islice(job_texts, min_jobs))
+    if workers <= 1 or len(head) < min_jobs:
+        for index, job_text in enumerate(itertools.chain(head, job_texts)):
+            job, problem = parse_job_text(parser, index, job_text)
+            if problem:
+                if quarantine is not None:
+                    quarantine.append(problem)
+            elif job:
+                yield job
+        return
+
+    job_texts = itertools.chain(head, job_texts)
+    limits = (parser.time_budget, parser.max_job_chars)
+    cache = parser.cache
+
+    def submit(pool, first_index, chunk):
+        # One (cache key, job) slot per job in the chunk; jobs still to be
+        # parsed are _PENDING until the pool's results come back
+        slots = []
+        to_parse = []
+        for index, job_text in enumerate(chunk, first_index):
+            job_text = parser._prepare_job_text(job_text)
+            if job_text is None:
+                continue
+            key = None
+            if cache is not None:
+                key = _cache_key(parser, job_text)
+                found, job = cache.get(key)
+                if found:
+                    slots.append((None, job))
+                    continue
+            slots.append((key, _PENDING))
+            to_parse.append((index, job_text))
+        future = None
+        if to_parse:
+            future = pool.submit(_parse_chunk, type(parser), parser.collection_date,
+                                 parser.delivery_date, limits, to_parse)
+        return slots, future
+
+    def results(slots, future):
+        parsed, slow_jobs = future.result() if future else ((), ())
+        for slow_job in slow_jobs:
+            _log_slow_job(*slow_job)
+        parsed = iter(parsed)
+        for key, job in slots:
+            if job is _PENDING:
+                job = next(parsed)
+                if isinstance(job, QuarantinedJob):
+                    if quarantine is not None:
+                        quarantine.append(job)
+                    continue
+                if key is not None:
+                    cache.put(key, job)
+            if job:
+                yield job
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        first_index = 0
+        while True:
+            chunk = list(itertools.islice(job_texts, chunk_size))
+            if not chunk:
+                break
+            pending.append(submit(pool, first_index, chunk))
+            first_index += len(chunk)
+            if len(pending) >= workers * 2:
+                yield from results(*pending.popleft())
+        while pending:
+            yield from results(*pending.popleft())
+
+
+class JobParser:
+    def __init__(self, collection_date, delivery_date=None, time_budget=JOB_TIME_BUDGET, max_job_chars=MAX_JOB_CHARS,
+                 cache=None):
+        self.jobs = []
+        self.quarantined = []
+        self.collection_date = collection_date
+        self.delivery_date = delivery_date if delivery_date else collection_date
+        self.time_budget = time_budget
+        self.max_job_chars = max_job_chars
+        # A parse_cache.ParseCache, or None to parse every block
+        self.cache = cache
+        # A list to collect jobs over the time budget in instead of logging
+        # them (pool workers send theirs back to the parent)
+        self.slow_jobs = None
+        
+    def calculate_delivery_date(self, collection_date):
+        """Calculate delivery date as 3 business days from collection date."""
+        # Convert string date to datetime if needed
+        if isinstance(collection_date, str):
+            collection_date = datetime.strptime(collection_date, "%d/%m/%Y")
+            
+        delivery_date = add_business_days(collection_date, AC01_DELIVERY_DAYS)
+                
+        # Format the date back to string
+        return delivery_date.strftime("%d/%m/%Y")
+        
+    def fix_location_name(self, name):
+        # Fix common location names (depot aliases, and "Unit 1 Calder Park
+        # Services" -> Wakefield Motorstore), see addresses.LOCATION_ALIASES
+        return address_normalizer.normalize_line(name)
+        
+    def clean_phone_number(self, phone):
+        """Clean and format phone number (10-digit national number, see phones.py)."""
+        return normalize_phone(phone)
+
+    def is_postcode(self, line):
+        """Return the canonical postcode if the line is one (optionally "Postcode: ..."), else None"""
+        return parse_postcode_line(line)
+
+    def parse_jobs(self, text, workers=1, chunk_size=PARALLEL_CHUNK_SIZE, min_jobs=PARALLEL_MIN_JOBS):
+        """Parse all jobs in text, replacing any from a previous call.
+
+        Quarantined jobs end up in self.quarantined. See iter_jobs for the
+        parallel options.
+        """
+        self.quarantined = []
+        self.jobs = list(self.iter_jobs(text, workers, chunk_size, min_jobs, self.quarantined))
+        return self.jobs
+
+    def iter_jobs(self, source, workers=1, chunk_size=PARALLEL_CHUNK_SIZE, min_jobs=PARALLEL_MIN_JOBS,
+                  quarantine=None):
+        """Yield one job dict at a time from a str, file-like object or iterator of lines.
+
+        Nothing is stored on the parser, so one instance can be shared between
+        threads and large inputs can be streamed straight into a CSV writer.
+
+        With workers > 1 (None for one per core) inputs of at least min_jobs
+        jobs are parsed chunk_size jobs at a time on a process pool. Jobs still
+        come out in input order and identical to the serial parse.
+
+        Jobs longer than max_job_chars or that fail to parse are skipped;
+        pass a list as quarantine to collect them as QuarantinedJob records.
+        Jobs slower than time_budget are kept and logged as warnings.
+        """
+        return _iter_parsed(self, iter_ac01_job_texts(source), workers, chunk_size, min_jobs, quarantine)
+
+    def _parse_job_text(self, job_text):
+        """Parse one piece from iter_ac01_job_texts, None if it isn't a job"""
+        job_text = self._prepare_job_text(job_text)
+        if job_text is None:
+            return None
+        return _parse_prepared_cached(self, job_text)
+
+    def _prepare_job_text(self, job_text):
+        """The text parse_single_job gets for a piece, None if it isn't a job.
+
+        Pieces that prepare to the same text parse to the same job, so this
+        is what the parse cache is keyed on.
+        """
+        if not job_text.strip():
+            return None
+        if not job_text.startswith('FROM'):
+            job_text = 'FROM\n' + job_text
+        
+        if 'TO\n' not in job_text:
+            return None
+        return job_text
+
+    def _parse_prepared(self, job_text):
+        job = self.parse_single_job(job_text)
+        if job:
+            # Ensure special instructions are set for each job
+            if 'SPECIAL INSTRUCTIONS' not in job or not job['SPECIAL INSTRUCTIONS']:
+                job['SPECIAL INSTRUCTIONS'] = 'Please call 1 hour before collection'
+        return job
+    
+    def parse_address_lines(self, lines):
+        """Helper method to parse address lines, dropping blank ones.
+
+        Lines are kept as written ("St. Andrews", "D.M. Keith", '@' and '#'
+        included); ADDR1 gets its location aliases from fix_location_name.
+        """
+        return [line.strip() for line in lines if line.strip()]
+
+    def clean_duplicate_towns(self, lines):
+        """Remove duplicate consecutive town names while preserving the last occurrence"""
+        if not lines:
+            return lines
+        
+        cleaned_lines = []
+        i = 0
+        while i < len(lines):
+            # If we're at the last line or current line is different from next line
+            if i == len(lines) - 1 or lines[i].strip().upper() != lines[i + 1].strip().upper():
+                cleaned_lines.append(lines[i])
+                i += 1
+            else:
+                # Skip the first occurrence of duplicate town
+                i += 1
+        return cleaned_lines
+
+    def parse_single_job(self, job_text):
+        # Fill a plain dict while parsing (every field starts out empty) and
+        # pack it into a JobRecord at the end
+        job = dict(JOB_DEFAULTS)
+        job['COLLECTION DATE'] = self.collection_date
+        job['DELIVERY DATE'] = self.delivery_date
+        job['SPECIAL INSTRUCTIONS'] = 'Must call 1hour before collection and get a name'
+        job['CUSTOMER REF'] = 'AC01'
+        
+        sections = scan_job_sections(job_text)
+
+        # Extract FROM section
+        if sections['FROM'] is not None:
+            from_text = sections['FROM'].strip()
+            from_lines = [line.strip() for line in from_text.split('\n') if line.strip()]
+            
+            # Process phone number first - Updated pattern to better match phone numbers
+            phone_lines = []
+            other_lines = []
+            for line in from_lines:
+                (phone_lines if PHONE_LINE_RE.search(line) else other_lines).append(line)
+            if phone_lines:
+                phone_match = PHONE_CAPTURE_RE.search(phone_lines[0])
+                if phone_match:
+                    phone_number = phone_match.group(1).strip()
+                    # Clean and store the phone number
+                    job['COLLECTION PHONE'] = self.clean_phone_number(phone_number)
+                # Remove phone lines from address processing
+                from_lines = other_lines
+            
+            # Process remaining lines for address
+            address_lines = []
+            postcode = None
+            
+            for line in from_lines:
+                # Check if line is a postcode
+                postcode_value = self.is_postcode(line)
+                if postcode_value:
+                    postcode = postcode_value
+                    continue
+                # Add to address lines if not a postcode
+                address_lines.append(line)
+            
+            # Process address lines with special handling for St. names
+            address_lines = self.parse_address_lines(address_lines)
+            
+            # Remove duplicate town names
+            address_lines = self.clean_duplicate_towns(address_lines)
+            
+            # Process address lines
+            if address_lines:
+                # First line is always ADDR1
+                job['COLLECTION ADDR1'] = self.fix_location_name(address_lines[0])
+                
+                # Handle remaining address lines
+                remaining_lines = address_lines[1:]
+                
+                # Assign remaining lines
+                if len(remaining_lines) > 0:
+                    # Always assign the second line to ADDR2 if it exists
+                    if len(remaining_lines) >= 1:
+                        job['COLLECTION ADDR2'] = remaining_lines[0]
+                    
+                    # For the rest of the lines
+                    if len(remaining_lines) == 2:
+                        job['COLLECTION ADDR3'] = ''  # Ensure ADDR3 is empty
+                        job['COLLECTION ADDR4'] = remaining_lines[1]  # Town
+                    elif len(remaining_lines) >= 3:
+                        job['COLLECTION ADDR3'] = remaining_lines[1]
+                        job['COLLECTION ADDR4'] = remaining_lines[-1]  # Town
+                    
+                    # Ensure ADDR4 is not empty if we have remaining lines
+                    if not job['COLLECTION ADDR4'] and remaining_lines:
+                        job['COLLECTION ADDR4'] = remaining_lines[-1]
+            
+            if postcode:
+                job['COLLECTION POSTCODE'] = postcode
+        
+        # Extract TO section
+        if sections['TO'] is not None:
+            to_text = sections['TO'].strip()
+            to_lines = [line.strip() for line in to_text.split('\n') if line.strip()]
+            
+            # Process phone number first - Updated pattern to better match phone numbers
+            phone_lines = []
+            other_lines = []
+            for line in to_lines:
+                (phone_lines if PHONE_LINE_RE.search(line) else other_lines).append(line)
+            if phone_lines:
+                phone_match = PHONE_CAPTURE_RE.search(phone_lines[0])
+                if phone_match:
+                    phone_number = phone_match.group(1).strip()
+                    # Clean and store the phone number
+                    job['DELIVERY CONTACT PHONE'] = self.clean_phone_number(phone_number)
+                # Remove phone lines from address processing
+                to_lines = other_lines
+            
+            # Process remaining lines for address
+            address_lines = []
+            postcode = None
+            
+            for line in to_lines:
+                # Check if line is a postcode
+                postcode_value = self.is_postcode(line)
+                if postcode_value:
+                    postcode = postcode_value
+                    continue
+                # Add to address lines if not a postcode
+                address_lines.append(line)
+            
+            # Process address lines with special handling for St. names
+            address_lines = self.parse_address_lines(address_lines)
+            
+            # Remove duplicate town names
+            address_lines = self.clean_duplicate_towns(address_lines)
+            
+            # Process address lines
+            if address_lines:
+                # First line is always ADDR1
+                job['DELIVERY ADDR1'] = self.fix_location_name(address_lines[0])
+                
+                # Special handling for Wakefield Motorstore
+                if job['DELIVERY ADDR1'] == "Wakefield Motorstore":
+                    # Check if "Peel Avenue" exists in the address lines
+                    has_peel_avenue = False
+                    for line in address_lines:
+                        if "Peel Avenue" in line:
+                            has_peel_avenue = True
+                            # Insert Unit 1 Calder Park Services as ADDR2
+                            job['DELIVERY ADDR2'] = "Unit 1 Calder Park Services"
+                            job['DELIVERY ADDR3'] = "Peel Avenue"
+                            job['DELIVERY ADDR4'] = "Wakefield"
+                            # Set the correct phone number for Wakefield Motorstore
+                            job['DELIVERY CONTACT PHONE'] = '01924975790'
+                            # Don't return early - continue processing to handle other fields
+                            break
+                
+                # Handle remaining address lines
+                remaining_lines = address_lines[1:]
+                
+                # Only process remaining lines if we haven't already set them for Wakefield
+                if not (job['DELIVERY ADDR1'] == "Wakefield Motorstore" and 
+                        job['DELIVERY ADDR2'] == "Unit 1 Calder Park Services"):
+                    # Assign remaining lines
+                    if len(remaining_lines) > 0:
+                        # Always assign the second line to ADDR2 if it exists
+                        if len(remaining_lines) >= 1:
+                            job['DELIVERY ADDR2'] = remaining_lines[0]
+                        
+                        # For the rest of the lines
+                        if len(remaining_lines) == 2:
+                            job['DELIVERY ADDR3'] = ''  # Ensure ADDR3 is empty
+                            job['DELIVERY ADDR4'] = remaining_lines[1]  # Town
+                        elif len(remaining_lines) >= 3:
+                            job['DELIVERY ADDR3'] = remaining_lines[1]
+                            job['DELIVERY ADDR4'] = remaining_lines[-1]  # Town
+                        
+                        # Ensure ADDR4 is not empty if we have remaining lines
+                        if not job['DELIVERY ADDR4'] and remaining_lines:
+                            job['DELIVERY ADDR4'] = remaining_lines[-1]
+            
+            if postcode:
+                job['DELIVERY POSTCODE'] = postcode
+        
+        # Extract vehicle details - better pattern for the format in the provided example
+        if sections['VEHICLE'] is not None:
+            vehicle_line = sections['VEHICLE'].strip()
+            
+            # Try to match with a more structured pattern first - chassis is optional
+            structured_match = VEHICLE_LINE_RE.match(vehicle_line) or VEHICLE_LINE_NO_MODEL_RE.match(vehicle_line)
+            
+            if structured_match:
+                make = structured_match.group(1).strip()
+                model = structured_match.group(2).strip()
+                color = structured_match.group(3).strip()
+                registration = structured_match.group(4).strip()
+                # Chassis might be empty, that's okay
+                chassis = structured_match.group(5).strip() if structured_match.group(5) else ''
+                
+                job['MAKE'] = make
+                job['MODEL'] = model
+                job['COLOR'] = color
+                if self.is_valid_uk_registration(registration):
+                    job['REG NUMBER'] = registration
+                else:
+                    job['REG NUMBER'] = ''
+                job['VIN'] = chassis
+            else:
+                # Split the vehicle line into parts - fallback method
+                parts = vehicle_line.split()
+                
+                if len(parts) >= 4:  # We need at least make, model, color, and registration
+                    # Start from the end and work backwards
+                    if len(parts) >= 5 and CHASSIS_TOKEN_RE.match(parts[-1]):
+                        # Last part looks like a chassis number
+                        chassis = parts[-1]
+                        registration = parts[-2]
+                        color_index = -3
+                    else:
+                        # No chassis number
+                        chassis = ''
+                        registration = parts[-1]
+                        color_index = -2
+                    
+                    # Color is typically one word
+                    color = parts[color_index] if abs(color_index) < len(parts) else ''
+                    
+                    # Make is usually one word, but can be hyphenated
+                    common_makes = ["AUDI", "BMW", "CUPRA", "DACIA", "FORD", "HYUNDAI", "KIA", "MG", 
+                                    "NISSAN", "PEUGEOT", "RENAULT", "SEAT", "SKODA", "TOYOTA", 
+                                    "VAUXHALL", "VOLKSWAGEN", "VOLVO", "MERCEDES-BENZ"]
+                    
+                    # Try to identify the make
+                    make = parts[0]
+                    model_start = 1
+                    
+                    # Handle hyphenated makes like MERCEDES-BENZ
+                    if len(parts) > 4 and parts[0] + "-" + parts[1] in [m.upper() for m in common_makes]:
+                        make = parts[0] + "-" + parts[1]
+                        model_start = 2
+                    
+                    # The model is everything between make and color
+                    model = " ".join(parts[model_start:color_index])
+                    
+                    job['MAKE'] = make
+                    job['MODEL'] = model
+                    job['COLOR'] = color
+                    if self.is_valid_uk_registration(registration):
+                        job['REG NUMBER'] = registration
+                    else:
+                        job['REG NUMBER'] = ''
+                    job['VIN'] = chassis
+        
+        # Look for individual fields if not found above
+        fields = {}
+        if (not (job['MAKE'] and job['MODEL'] and job['COLOR'] and job['REG NUMBER'] and job['VIN'])
+                or sections['JOB NO'] is None):
+            fields = scan_job_fields(job_text)
+
+        if not job['MAKE'] and 'make' in fields:
+            job['MAKE'] = fields['make'].strip()
+                
+        if not job['MODEL'] and 'model' in fields:
+            job['MODEL'] = fields['model'].strip()
+                
+        if not job['COLOR'] and 'colour' in fields:
+            job['COLOR'] = fields['colour'].strip()
+                
+        if not job['REG NUMBER'] and 'reg' in fields:
+            reg_candidate = fields['reg'].strip()
+            if self.is_valid_uk_registration(reg_candidate):
+                job['REG NUMBER'] = reg_candidate
+            else:
+                job['REG NUMBER'] = ''
+        
+        if not job['VIN'] and 'chassis' in fields:
+            job['VIN'] = fields['chassis'].strip()
+        
+        # Extract job number - specific pattern for "JOB NO KEY LOC BARCODE" format,
+        # falling back to a number under YOUR_REF and then "REF 123"
+        job_no = sections['JOB NO'] or fields.get('your_ref') or fields.get('ref')
+        if job_no is not None:
+            job['YOUR REF NO'] = job_no.strip()
+        
+        # The VALUE block is the price, which we don't store as requested
+        
+        return JobRecord(job)
+
+    def is_valid_uk_registration(self, reg):
+        return is_valid_uk_registration(reg)
+
+
+class BC04Parser:
+    def __init__(self, collection_date, delivery_date=None, time_budget=JOB_TIME_BUDGET, max_job_chars=MAX_JOB_CHARS,
+                 cache=None):
+        self.jobs = []
+        self.quarantined = []
+        self.collection_date = collection_date
+        self.delivery_date = delivery_date if delivery_date else collection_date
+        self.time_budget = time_budget
+        self.max_job_chars = max_job_chars
+        # A parse_cache.ParseCache, or None to parse every block
+        self.cache = cache
+        # A list to collect jobs over the time budget in instead of logging
+        # them (pool workers send theirs back to the parent)
+        self.slow_jobs = None
+        self.bc04_special_instructions = (
+            "MUST GET A FULL NAME AND SIGNATURE ON COLLECTION CALL OFFICE AND Non Conformance Motability on 0121 788 6940 option 1 IF THEY REFUSE ** - PHOTO'S MUST BE CLEAR PLEASE. COLL AND DEL 09:00-17:00 ONLY"
+        )
+    def calculate_delivery_date(self, collection_date):
+        """Calculate delivery date based on collection date (next business day)"""
+        # Weekends and bank holidays are skipped (only weekends if the
+        # holidays package isn't installed)
+        return add_business_days(collection_date, BC04_DELIVERY_DAYS)
+    
+    def clean_phone_number(self, phone):
+        """Clean and format phone number, the same format as AC01 jobs"""
+        return normalize_phone(phone)
+    
+    def is_postcode(self, line):
+        """Check if a line contains a UK postcode and return it if found"""
+        return find_postcode(line)
+    
+    def parse_jobs(self, text, workers=1, chunk_size=PARALLEL_CHUNK_SIZE, min_jobs=PARALLEL_MIN_JOBS):
+        """Parse BC04 jobs from text input, quarantined ones go in self.quarantined"""
+        self.quarantined = []
+        self.jobs = list(self.iter_jobs(text, workers, chunk_size, min_jobs, self.quarantined))
+        return self.jobs
+
+    def iter_jobs(self, source, workers=1, chunk_size=PARALLEL_CHUNK_SIZE, min_jobs=PARALLEL_MIN_JOBS,
+                  quarantine=None):
+        """Yield BC04 jobs one at a time from a str, file-like object or iterator of lines.
+
+        Keeps no state on the parser and takes the same parallel and
+        quarantine options as JobParser.iter_jobs.
+        """
+        # Split by "Job Sheet" sections
+        return _iter_parsed(self, iter_bc04_job_texts(source), workers, chunk_size, min_jobs, quarantine)
+
+    def _parse_job_text(self, section):
+        """Parse one piece from iter_bc04_job_texts, None if it isn't a job"""
+        section = self._prepare_job_text(section)
+        if section is None:
+            return None
+        return _parse_prepared_cached(self, section)
+
+    def _prepare_job_text(self, section):
+        """The text parse_single_job gets for a piece (the cache key), None if empty"""
+        return section.strip() or None
+
+    def _parse_prepared(self, section):
+        job = self.parse_single_job(section)
+        if job and job.get('REG NUMBER'):  # Only add if we found a registration
+            return job
+        return None
+    
+    def parse_single_job(self, job_text):
+        # Fill a plain dict while parsing (every field starts out empty) and
+        # pack it into a JobRecord at the end
+        job = dict(JOB_DEFAULTS)
+        job['COLLECTION DATE'] = self.collection_date
+        job['DELIVERY DATE'] = self.delivery_date
+        job['SPECIAL INSTRUCTIONS'] = self.bc04_special_instructions
+        job['CUSTOMER REF'] = 'BC04'
+
+        # Extract job number and vehicle registration
+        label_at = job_text.find(BC04_JOB_NUMBER_LABEL)
+        job_number_match = label_at >= 0 and BC04_JOB_NUMBER_RE.search(
+            job_text, label_at + len(BC04_JOB_NUMBER_LABEL))
+        if job_number_match:
+            job['YOUR REF NO'] = job_number_match.group(1)
+        # Robust registration extraction (UK reg: 2 letters, 2 digits, 3 letters)
+        reg_match = BC04_REG_RE.search(job_text)
+        if reg_match:
+            job['REG NUMBER'] = reg_match.group(1)
+        # VIN extraction (12+ digits, after reg)
+        if job['REG NUMBER']:
+            vin = _find_vin_after_reg(job_text, job['REG NUMBER'])
+            if vin:
+                job['VIN'] = vin
+        # --- MAKE and MODEL are always blank for BC04 ---
+        job['MAKE'] = ''
+        job['MODEL'] = ''
+
+        # One pass over the lines, see BC04_LINE_RE for the tags
+        address_lines = []
+        in_address = False      # after "Special Instructions", before the reg line
+        reg_line_found = False
+        previous_line = ''
+        phones_found = False
+        date_lines_left = 0
+        dates = []
+        prices = []
+        for match in BC04_LINE_RE.finditer(job_text):
+            line = match.group()
+            tag = match.lastgroup
+            if not reg_line_found:
+                if tag == 'special':
+                    # A later "Special Instructions" line restarts the address
+                    address_lines = []
+                    in_address = True
+                elif tag == 'reg_line':
+                    reg_line_found = True
+                elif in_address:
+                    stripped = line.strip()
+                    if stripped:
+                        address_lines.append(stripped)
+
+            if tag == 'date' and not phones_found:
+                # The phone line is the first one with two phone numbers
+                # (8+ digits) that is directly followed by a date line
+                phones = BC04_PHONE_RE.findall(previous_line)
+                if len(phones) >= 2:
+                    job['COLLECTION PHONE'] = self.clean_phone_number(phones[0])
+                    job['DELIVERY CONTACT PHONE'] = self.clean_phone_number(phones[1])
+                    phones_found = True
+                    date_lines_left = BC04_DATE_LOOKAHEAD
+            previous_line = line
+
+            if date_lines_left:
+                # Collection and delivery dates are the first two dates
+                # within a few lines of the phone line
+                dates += BC04_DATE_RE.findall(line)
+                date_lines_left = 0 if len(dates) >= 2 else date_lines_left - 1
+
+            # The first two prices anywhere in the job (the second one wins)
+            if len(prices) < 2 and '.' in line:
+                prices += BC04_PRICE_RE.findall(line)
+
+        if reg_line_found and address_lines:
+            has_postcode = [bool(self.is_postcode(line)) for line in address_lines]
+            if has_postcode.count(True) == 2:
+                split_idx = has_postcode.index(True) + 1
+            else:
+                split_idx = len(address_lines) // 2
+            self._assign_address(job, 'COLLECTION', address_lines[:split_idx], has_postcode[:split_idx])
+            self._assign_address(job, 'DELIVERY', address_lines[split_idx:], has_postcode[split_idx:])
+
+        # Without a phone line the dates from the form are kept
+        if len(dates) >= 2:
+            job['COLLECTION DATE'] = dates[0]
+            job['DELIVERY DATE'] = dates[1]
+
+        if len(prices) >= 2:
+            job['PRICE'] = prices[1]
+        elif prices:
+            job['PRICE'] = prices[0]
+        return JobRecord(job)
+
+    def _assign_address(self, job, prefix, lines, has_postcode):
+        """Fill ADDR1-3, ADDR4 (town) and POSTCODE of one address.
+
+        Lines up to the first postcode line are the address, the last of them
+        the town. Without a postcode (or with nothing before it) the first
+        four lines go into ADDR1-4 as they are.
+        """
+        if not lines:
+            return
+        addr1, addr2, addr3, addr4, postcode = BC04_ADDRESS_FIELDS[prefix]
+        postcode_idx = has_postcode.index(True) if True in has_postcode else None
+        if postcode_idx:
+            addr = lines[:postcode_idx]
+            for field, i in ((addr1, 0), (addr2, 1), (addr3, 2)):
+                job[field] = addr[i] if i < len(addr) - 1 else ''
+            job[addr4] = addr[-1]
+            job[postcode] = lines[postcode_idx]
+        else:
+            for field, val in zip((addr1, addr2, addr3, addr4), lines):
+                job[field] = val
@@ -0,0 +1,221 @@
+"""Compact record for one transport job.
+
+Every job type (AC01/EU01, BC04, GR11/GR15, CW09) ends up with the same 26
+fields. A plain dict per job costs over a kilobyte, which adds up on 100k-row
+Greenhous workbooks, so JobRecord keeps the fields in __slots__ instead and
+looks like a dict to everything else (csv.DictWriter, web_app, job.get()).
+
+Job dates and prices are text in every job type. parse_job_date() and
+parse_job_price() read them for the exports that store typed values
+(columnar, XLSX, shard manifests) without those pulling in pandas.
+"""
+import sys
+from collections.abc import MutableMapping
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from operator import attrgetter
+
+# Field order of every job, the same order the parsers have always filled
+# them in (web_app writes its CSV columns in this order)
+JOB_FIELDS = (
+    'REG NUMBER',
+    'VIN',
+    'MAKE',
+    'MODEL',
+    'COLOR',
+    'COLLECTION DATE',
+    'YOUR REF NO',
+    'COLLECTION ADDR1',
+    'COLLECTION ADDR2',
+    'COLLECTION ADDR3',
+    'COLLECTION ADDR4',
+    'COLLECTION POSTCODE',
+    'COLLECTION CONTACT NAME',
+    'COLLECTION PHONE',
+    'DELIVERY DATE',
+    'DELIVERY ADDR1',
+    'DELIVERY ADDR2',
+    'DELIVERY ADDR3',
+    'DELIVERY ADDR4',
+    'DELIVERY POSTCODE',
+    'DELIVERY CONTACT NAME',
+    'DELIVERY CONTACT PHONE',
+    'SPECIAL INSTRUCTIONS',
+    'PRICE',
+    'CUSTOMER REF',
+    'TRANSPORT TYPE',
+)
+
+# Column order of the job CSVs (every job field except COLOR)
+CSV_FIELDNAMES = [field for field in JOB_FIELDS if field != 'COLOR']
+
+# Fields that only take a handful of distinct values in a batch (dates,
+# customer ref, the fixed Greenhous collection addresses...). Their strings
+# are interned so every job shares one copy. Per-job values like REG and VIN
+# are left alone, interning those would just grow the intern table.
+INTERNED_FIELDS = frozenset((
+    'MAKE',
+    'COLOR',
+    'COLLECTION DATE',
+    'COLLECTION ADDR1',
+    'COLLECTION ADDR2',
+    'COLLECTION ADDR3',
+    'COLLECTION ADDR4',
+    'COLLECTION POSTCODE',
+    'COLLECTION CONTACT NAME',
+    'COLLECTION PHONE',
+    'DELIVERY DATE',
+    'CUSTOMER REF',
+    'TRANSPORT TYPE',
+))
+
+# How every job type writes COLLECTION DATE and DELIVERY DATE
+DATE_FORMAT = "%d/%m/%Y"
+
+# Prices up to £99,999,999.99
+PRICE_PRECISION = 10
+PRICE_SCALE = 2
+
+# Distinct dates and prices seen in a batch are few, parse each once
+VALUE_CACHE_SIZE = 4096
+
+_PENNY = Decimal(1).scaleb(-PRICE_SCALE)
+_MAX_PRICE = Decimal(10) ** (PRICE_PRECISION - PRICE_SCALE)
+
+# Every field empty, copy it to start a job as a plain dict
+JOB_DEFAULTS = dict.fromkeys(JOB_FIELDS, '')
+
+# 'REG NUMBER' -> 'reg_number' etc, the slot holding each field
+_SLOTS = tuple(field.lower().replace(' ', '_') for field in JOB_FIELDS)
+_SLOT_FOR_FIELD = dict(zip(JOB_FIELDS, _SLOTS))
+_FIELD_SLOTS = tuple(zip(JOB_FIELDS, _SLOTS))
+_INTERNED_SLOTS = tuple(_SLOT_FOR_FIELD[field] for field in JOB_FIELDS if field in INTERNED_FIELDS)
+
+
+class JobRecord(MutableMapping):
+    """One job with a fixed set of fields, all defaulting to ''.
+
+    Reads and writes like a dict keyed by the CSV field names, iterating in
+    JOB_FIELDS order. Fields can't be added or removed; setting a name that
+    isn't in JOB_FIELDS raises KeyError.
+    """
+    __slots__ = _SLOTS
+
+    def __init__(self, fields=None):
+        """Build a record from a mapping of field name to value.
+
+        The parsers fill a plain dict (see JOB_DEFAULTS) and pack it once at
+        the end, which is much cheaper than going through __setitem__ for
+        every assignment.
+        """
+        if fields is None:
+            fields = JOB_DEFAULTS
+        elif not fields.keys() <= _SLOT_FOR_FIELD.keys():
+            raise KeyError(next(key for key in fields if key not in _SLOT_FOR_FIELD))
+        get = fields.get
+        for field, slot in _FIELD_SLOTS:
+            setattr(self, slot, get(field, ''))
+        self._intern()
+
+    @classmethod
+    def from_values(cls, values):
+        """Build a record from a sequence of values in JOB_FIELDS order."""
+        record = cls.__new__(cls)
+        for slot, value in zip(_SLOTS, values):
+            setattr(record, slot, value)
+        record._intern()
+        return record
+
+    def _intern(self):
+        for slot in _INTERNED_SLOTS:
+            value = getattr(self, slot)
+            if type(value) is str:
+                setattr(self, slot, sys.intern(value))
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, _SLOT_FOR_FIELD[key])
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            slot = _SLOT_FOR_FIELD[key]
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+        if key in INTERNED_FIELDS and type(value) is str:
+            value = sys.intern(value)
+        setattr(self, slot, value)
+
+    def __delitem__(self, key):
+        raise TypeError("JobRecord fields can't be removed")
+
+    def __iter__(self):
+        return iter(JOB_FIELDS)
+
+    def __len__(self):
+        return len(JOB_FIELDS)
+
+    def __contains__(self, key):
+        return key in _SLOT_FOR_FIELD
+
+    def get(self, key, default=None):
+        slot = _SLOT_FOR_FIELD.get(key)
+        return default if slot is None else getattr(self, slot)
+
+    def values_tuple(self):
+        """All values in JOB_FIELDS order."""
+        return tuple(getattr(self, slot) for slot in _SLOTS)
+
+    def copy(self):
+        return JobRecord.from_values(self.values_tuple())
+
+    def __reduce__(self):
+        # Keeps pickles (process pool results) small and re-interns on load
+        return JobRecord.from_values, (self.values_tuple(),)
+
+    def __repr__(self):
+        return f"JobRecord({dict(self)!r})"
+
+
+def values_getter(fields):
+    """A function returning a JobRecord's values for fields, as a tuple.
+
+    The slots are looked up once, so each job costs a single C call.
+    """
+    getter = attrgetter(*(_SLOT_FOR_FIELD[field] for field in fields))
+    if len(fields) == 1:
+        return lambda job: (getter(job),)
+    return getter
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def parse_job_date(text):
+    """A job date ('06/01/2025', or ISO as CW09 sheets give them) or None."""
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return datetime.strptime(text, DATE_FORMAT).date()
+    except ValueError:
+        pass
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def parse_job_price(text):
+    """A job price ('£1,250.00', '120') as a Decimal in pence, or None."""
+    text = text.strip().replace('£', '').replace(',', '')
+    if not text:
+        return None
+    try:
+        price = Decimal(text).quantize(_PENNY)
+    except (InvalidOperation, ValueError):
+        return None
+    if not price.is_finite() or abs(price) >= _MAX_PRICE:
+        return None
+    return price
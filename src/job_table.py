@@ -0,0 +1,82 @@
+"""Columnar job model behind the GR11 and CW09 tabs.
+
+A loaded sheet is kept as DataFrame chunks in a JobTable, which is what the
+tabs export from. Their Treeviews are only a view of it: each item's iid is
+its row number in the table, and nothing is ever read back out of the
+widget, so exporting 50k rows costs what writing them does rather than 50k
+round trips through Tk that also turn every value into a string.
+"""
+import numpy as np
+import pandas as pd
+
+from job_record import JOB_FIELDS, JobRecord
+
+
+class JobTable:
+    """The rows of one loaded sheet, in the given columns."""
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.clear()
+
+    def clear(self):
+        self._chunks = []
+        self._frame = None
+        self._length = 0
+
+    def append(self, frame):
+        """Add the rows of frame (which must have all of self.columns).
+
+        Returns the row number of the first of them.
+        """
+        start = self._length
+        self._chunks.append(frame[list(self.columns)].reset_index(drop=True))
+        self._frame = None
+        self._length += len(frame)
+        return start
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def frame(self):
+        """All rows as one DataFrame with a 0..n-1 index."""
+        if self._frame is None:
+            if self._chunks:
+                self._frame = pd.concat(self._chunks, ignore_index=True)
+            else:
+                self._frame = pd.DataFrame(columns=list(self.columns), dtype=object)
+            # One frame from here on, later appends add to it
+            self._chunks = [self._frame]
+        return self._frame
+
+    def rows(self, columns=None, start=0, stop=None):
+        """Tuples of the given columns (all by default) for rows start:stop."""
+        frame = self.frame.iloc[start:stop]
+        if columns is not None:
+            frame = frame[list(columns)]
+        return frame.itertuples(index=False, name=None)
+
+    def take(self, rows, columns=None):
+        """Tuples of the given columns (all by default) for the row numbers
+        in rows, in that order.
+
+        Reads the chunks directly, so showing a few rows while a sheet is
+        still loading doesn't join every chunk loaded so far.
+        """
+        columns = list(columns or self.columns)
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(self._chunks) == 1:
+            return list(self._chunks[0].iloc[rows][columns].itertuples(index=False, name=None))
+        starts = np.cumsum([0] + [len(chunk) for chunk in self._chunks[:-1]])
+        chunk_numbers = np.searchsorted(starts, rows, side='right') - 1
+        found = {}
+        for number in np.unique(chunk_numbers).tolist():
+            wanted = rows[chunk_numbers == number]
+            values = self._chunks[number].iloc[wanted - starts[number]][columns].itertuples(index=False, name=None)
+            found.update(zip(wanted.tolist(), values))
+        return [found[row] for row in rows.tolist()]
+
+    def records(self):
+        """A JobRecord per row; the table must have every one of JOB_FIELDS."""
+        return [JobRecord.from_values(values) for values in self.rows(JOB_FIELDS)]
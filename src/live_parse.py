@@ -0,0 +1,147 @@
+"""Background parsing for the AC01/BC04 text tabs.
+
+The tabs hand over their text once the operator has stopped typing for
+LIVE_PARSE_DELAY_MS. Splitting a paste into job blocks is cheap; only the
+blocks that changed since the last parse go through the parser, the rest
+keep the result they already have. Parsing runs on one background thread
+and a newer paste always takes over from an older one part way through, so
+typing into a 2 MB paste never waits for the parser.
+
+Every finished parse is kept as a LiveParse with a short preview of each
+job, and process_jobs exports it directly when the text and dates haven't
+changed since.
+"""
+import threading
+from collections import namedtuple
+
+from job_parser_core import BC04Parser, JobParser, iter_ac01_job_texts, iter_bc04_job_texts, parse_job_text
+
+# Quiet time after the last key press before the text is parsed again
+LIVE_PARSE_DELAY_MS = 400
+# How often the GUI checks whether a background parse has finished
+LIVE_PARSE_POLL_MS = 50
+
+LIVE_PARSERS = {
+    'AC01': (JobParser, iter_ac01_job_texts),
+    'BC04': (BC04Parser, iter_bc04_job_texts),
+}
+
+# Fields a job can't go out without, and how the preview names them
+PREVIEW_REQUIRED_FIELDS = (
+    ('REG NUMBER', 'reg'),
+    ('COLLECTION ADDR1', 'collection address'),
+    ('COLLECTION POSTCODE', 'collection postcode'),
+    ('DELIVERY ADDR1', 'delivery address'),
+    ('DELIVERY POSTCODE', 'delivery postcode'),
+)
+
+# One line of the preview; missing is a tuple of PREVIEW_REQUIRED_FIELDS names
+JobPreview = namedtuple('JobPreview', 'number reg collection_postcode delivery_postcode missing')
+
+# A finished parse of text with the given dates
+LiveParse = namedtuple('LiveParse', 'text collection_date delivery_date jobs previews quarantined')
+
+
+def preview_job(number, job):
+    """The JobPreview of the number'th job (from 1)."""
+    missing = tuple(label for field, label in PREVIEW_REQUIRED_FIELDS if not str(job.get(field) or '').strip())
+    return JobPreview(number, job.get('REG NUMBER') or '', job.get('COLLECTION POSTCODE') or '',
+                      job.get('DELIVERY POSTCODE') or '', missing)
+
+
+class LiveParser:
+    """Parses the latest text of one tab on a background thread."""
+
+    def __init__(self, job_type, cache=None):
+        self.parser_class, self.split_job_texts = LIVE_PARSERS[job_type]
+        self.cache = cache
+        self._condition = threading.Condition()
+        self._request = None
+        self._latest = None
+        self._busy = False
+        self._thread = None
+        # Raw block -> (job, QuarantinedJob) for the blocks of the last
+        # paste, only used with the same dates
+        self._blocks = {}
+        self._block_dates = None
+
+    def submit(self, text, collection_date, delivery_date):
+        """Parse text in the background, dropping any older text not yet done."""
+        with self._condition:
+            self._request = (text, collection_date, delivery_date)
+            self._busy = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='live-parse', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    @property
+    def busy(self):
+        """True while a submitted text hasn't been parsed yet."""
+        with self._condition:
+            return self._busy
+
+    def latest(self):
+        """The most recent finished LiveParse, or None."""
+        with self._condition:
+            return self._latest
+
+    def result_for(self, text, collection_date, delivery_date):
+        """Copies of the jobs parsed from exactly this text and dates, or None.
+
+        Returns (jobs, quarantined) for process_jobs to export.
+        """
+        latest = self.latest()
+        if latest is None or (latest.text, latest.collection_date, latest.delivery_date) != \
+                (text, collection_date, delivery_date):
+            return None
+        return [job.copy() for job in latest.jobs], list(latest.quarantined)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._request is None:
+                    self._condition.wait()
+                request, self._request = self._request, None
+            result = self._parse(*request)
+            with self._condition:
+                if result is not None:
+                    self._latest = result
+                if self._request is None:
+                    self._busy = False
+
+    def _superseded(self):
+        with self._condition:
+            return self._request is not None
+
+    def _parse(self, text, collection_date, delivery_date):
+        """Parse text, reusing the blocks it shares with the last paste.
+
+        Returns None if a newer text arrived first; the blocks parsed so far
+        are kept for it.
+        """
+        if self._block_dates != (collection_date, delivery_date):
+            self._blocks = {}
+            self._block_dates = (collection_date, delivery_date)
+        parser = self.parser_class(collection_date, delivery_date, cache=self.cache)
+        blocks = {}
+        jobs = []
+        quarantined = []
+        for index, block in enumerate(self.split_job_texts(text)):
+            result = blocks.get(block) or self._blocks.get(block)
+            if result is None:
+                if self._superseded():
+                    self._blocks.update(blocks)
+                    return None
+                result = parse_job_text(parser, index, block)
+            blocks[block] = result
+            job, problem = result
+            if problem:
+                quarantined.append(problem._replace(index=index))
+            elif job:
+                jobs.append(job)
+        if self.cache is not None:
+            self.cache.flush()
+        self._blocks = blocks
+        previews = [preview_job(number, job) for number, job in enumerate(jobs, 1)]
+        return LiveParse(text, collection_date, delivery_date, jobs, previews, quarantined)
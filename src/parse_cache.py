@@ -0,0 +1,183 @@
+"""Content-addressed cache of parsed AC01/BC04 job blocks.
+
+Operators fix one job and re-paste the whole batch, so most blocks in a paste
+have been parsed before. Each block is keyed by a hash of its text (as the
+parser normalises it) together with the parser, the collection/delivery
+dates and a fingerprint of the parsing code, so an unchanged block costs one
+hash and one lookup. A bounded in-memory LRU sits in front of an optional
+SQLite file that keeps results across restarts.
+
+Editing any of the parser modules changes the fingerprint, so results from
+old rules are never used; invalidate() drops everything explicitly.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from job_record import JobRecord
+
+PARSE_CACHE_SIZE = 20000
+PARSE_CACHE_DISK_SIZE = 500000
+# New entries are written to disk this many at a time (and by flush())
+PARSE_CACHE_DISK_BATCH = 500
+
+# Modules whose code decides what a block parses to
+RULE_MODULES = ('job_parser_core', 'addresses', 'phones', 'postcodes', 'registrations', 'job_record')
+
+_MISSING = object()
+
+
+def rules_fingerprint():
+    """Hash of the parser modules' source, part of every cache key."""
+    digest = hashlib.blake2b(digest_size=8)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in RULE_MODULES:
+        try:
+            with open(os.path.join(here, name + '.py'), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            # Frozen builds ship no sources, the build itself is the version
+            digest.update(name.encode())
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Parsed jobs by block hash: a bounded LRU and an optional SQLite tier.
+
+    Values are JobRecords (handed out as fresh copies, so callers can edit
+    them) or None for blocks that aren't a job. Safe to share between
+    threads.
+    """
+
+    def __init__(self, max_entries=PARSE_CACHE_SIZE, path=None, max_disk_entries=PARSE_CACHE_DISK_SIZE):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self.fingerprint = rules_fingerprint()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._unsaved = []
+
+    def key(self, parser_name, collection_date, delivery_date, job_text):
+        """The cache key of one normalised job block."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.fingerprint}\x1f{parser_name}\x1f{collection_date}\x1f{delivery_date}\x1f".encode())
+        digest.update(job_text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _disk(self):
+        # Opened on first use. A cache that can't be written to just stays
+        # in memory, it must never stop a batch from being parsed.
+        if self._db is None and self.path:
+            try:
+                db = sqlite3.connect(self.path, check_same_thread=False)
+                db.execute('PRAGMA journal_mode=WAL')
+                db.execute('PRAGMA synchronous=OFF')
+                db.execute('CREATE TABLE IF NOT EXISTS parsed (key TEXT PRIMARY KEY, job TEXT)')
+                self._db = db
+            except sqlite3.Error:
+                self.path = None
+        return self._db
+
+    def get(self, key):
+        """(found, job) for a key; job is a new JobRecord or None."""
+        with self._lock:
+            values = self._entries.get(key, _MISSING)
+            if values is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                values = self._disk_get(key)
+                if values is _MISSING:
+                    self.misses += 1
+                    return False, None
+                self._remember(key, values)
+                self.hits += 1
+                self.disk_hits += 1
+        return True, None if values is None else JobRecord.from_values(values)
+
+    def put(self, key, job):
+        """Store the result of parsing a block (a job, or None)."""
+        values = None if job is None else job.values_tuple()
+        with self._lock:
+            self._remember(key, values)
+            self._disk_put(key, values)
+
+    def _remember(self, key, values):
+        self._entries[key] = values
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key):
+        db = self._disk()
+        if db is None:
+            return _MISSING
+        try:
+            row = db.execute('SELECT job FROM parsed WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error:
+            return _MISSING
+        if row is None:
+            return _MISSING
+        values = json.loads(row[0])
+        return None if values is None else tuple(values)
+
+    def _disk_put(self, key, values):
+        if not self.path:
+            return
+        try:
+            self._unsaved.append((key, json.dumps(values)))
+        except TypeError:
+            # Only plain strings go to disk
+            return
+        if len(self._unsaved) >= PARSE_CACHE_DISK_BATCH:
+            self._write_unsaved()
+
+    def _write_unsaved(self):
+        unsaved, self._unsaved = self._unsaved, []
+        db = self._disk()
+        if db is None or not unsaved:
+            return
+        try:
+            with db:
+                db.executemany('INSERT OR REPLACE INTO parsed (key, job) VALUES (?, ?)', unsaved)
+                # Keep only the newest entries
+                db.execute('DELETE FROM parsed WHERE rowid <= (SELECT MAX(rowid) FROM parsed) - ?',
+                           (self.max_disk_entries,))
+        except sqlite3.Error:
+            pass
+
+    def flush(self):
+        """Write new entries to the disk tier now (parsers call this after every batch)."""
+        with self._lock:
+            self._write_unsaved()
+
+    def invalidate(self):
+        """Forget every cached block, in memory and on disk (e.g. after a rule change)."""
+        with self._lock:
+            self._entries.clear()
+            self._unsaved = []
+            db = self._disk()
+            if db is not None:
+                try:
+                    with db:
+                        db.execute('DELETE FROM parsed')
+                except sqlite3.Error:
+                    pass
+
+    def stats(self):
+        """Hit/miss counters and the number of blocks held in memory."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+            }
@@ -0,0 +1,54 @@
+"""UK phone number normalisation shared by every job type.
+
+All phones in the job CSVs use the format the AC01 parser has always
+written: the 10-digit national number without the trunk 0 or the 44/0044
+country code ("0121 788 6940" -> "1217886940"). Longer numbers are cut to
+10 digits and shorter ones padded with zeros.
+
+normalize_phone() handles one value and is memoised, since the same depot
+numbers come up on every batch. normalize_phones() does a whole pandas
+column (CW09 "Delivery Contact Phone") in a handful of vectorised passes.
+"""
+import re
+from functools import lru_cache
+
+PHONE_LENGTH = 10
+PHONE_CACHE_SIZE = 16384
+
+NON_DIGIT_RE = re.compile(r'\D')
+# Country code (44 or 0044) and/or the trunk 0, including the "+44 (0)" form.
+# All leading zeros go so normalising a normalised number changes nothing
+PHONE_PREFIX_RE = re.compile(r'^(?:(?:00)?44)?0*')
+# Spreadsheet cells read as floats lose their leading 0 and gain a ".0"
+FLOAT_SUFFIX_PATTERN = r'^(\d+)\.0$'
+FLOAT_SUFFIX_RE = re.compile(FLOAT_SUFFIX_PATTERN)
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def _normalize_text(text):
+    digits = text if text.isdigit() else NON_DIGIT_RE.sub('', FLOAT_SUFFIX_RE.sub(r'\1', text))
+    if not digits:
+        return ''
+    digits = PHONE_PREFIX_RE.sub('', digits, count=1)
+    return digits[:PHONE_LENGTH].ljust(PHONE_LENGTH, '0')
+
+
+def normalize_phone(phone):
+    """Return phone as a 10-digit national number, '' if it has no digits.
+
+    Accepts anything a parser or spreadsheet hands over: "Tel: 0121 788
+    6940", "+44 (0)1217 886940", 1217886940.0, None or NaN.
+    """
+    if phone is None or phone != phone:  # None or NaN
+        return ''
+    return _normalize_text(phone if isinstance(phone, str) else str(phone))
+
+
+def normalize_phones(series):
+    """Vectorised normalize_phone for a pandas Series."""
+    text = series.where(series.notna(), '').astype(str)
+    digits = (text.str.replace(FLOAT_SUFFIX_PATTERN, r'\1', regex=True)
+                  .str.replace(NON_DIGIT_RE.pattern, '', regex=True))
+    national = digits.str.replace(PHONE_PREFIX_RE.pattern, '', n=1, regex=True)
+    padded = national.str.slice(0, PHONE_LENGTH).str.ljust(PHONE_LENGTH, '0')
+    return padded.where(digits != '', '')
@@ -0,0 +1,69 @@
+"""UK postcode recognition shared by the AC01, BC04 and Greenhous parsers.
+
+Every lookup goes through one compiled pattern with the outward and inward
+codes as named groups, so recognising, extracting and re-spacing a postcode
+is a single regex pass. Postcodes always come back canonical: upper case with
+exactly one space ("ox255ha" -> "OX25 5HA").
+
+normalize_postcodes() does the same for a whole spreadsheet postcode column
+(CW09) in one vectorised pass.
+"""
+import re
+
+# Outward code (A9, A99, AA9, AA99, A9A, AA9A) then the inward code (9AA)
+POSTCODE_PATTERN = r'(?P<outward>[A-Z]{1,2}[0-9][0-9A-Z]?)\s*(?P<inward>[0-9][A-Z]{2})'
+
+# A postcode anywhere in a line of text
+POSTCODE_RE = re.compile(r'\b' + POSTCODE_PATTERN + r'\b', re.IGNORECASE)
+
+# The same without the word boundaries, so it also finds a postcode run into
+# the text around it ("...BRADES ROADB69 2EX"), as Greenhous addresses
+# sometimes have it
+POSTCODE_UNBOUNDED_RE = re.compile(POSTCODE_PATTERN, re.IGNORECASE)
+
+# A line that is nothing but a postcode, optionally labelled "Postcode: ..."
+# (the label is matched case-sensitively, like the AC01 parser always did)
+POSTCODE_LINE_RE = re.compile(
+    r'(?:(?-i:Postcode|Post Code|P/Code|PC)[\s:]+)?' + POSTCODE_PATTERN, re.IGNORECASE)
+
+# A cell that is a postcode with nothing else but surrounding whitespace
+_POSTCODE_CELL_PATTERN = r'^\s*' + POSTCODE_PATTERN + r'\s*$'
+
+
+def _canonical(match):
+    return f"{match.group('outward').upper()} {match.group('inward').upper()}"
+
+
+def parse_postcode_line(line):
+    """Return the canonical postcode if the whole line is one, else None."""
+    match = POSTCODE_LINE_RE.fullmatch(line.strip())
+    return _canonical(match) if match else None
+
+
+def find_postcode(text):
+    """Return the first postcode in text, canonically spaced, or None."""
+    match = POSTCODE_RE.search(text)
+    return _canonical(match) if match else None
+
+
+def split_postcode(text, bounded=True):
+    """Split an address string into (postcode, address without the postcode).
+
+    The postcode is '' and the address unchanged when there isn't one. With
+    bounded=False the postcode doesn't have to be a separate word.
+    """
+    match = (POSTCODE_RE if bounded else POSTCODE_UNBOUNDED_RE).search(text)
+    if not match:
+        return '', text
+    return _canonical(match), text.replace(match.group(0), '')
+
+
+def normalize_postcodes(series):
+    """Canonical postcodes for a postcode column.
+
+    Cells holding a postcode come back canonical, anything else (blanks,
+    NaN, free text) is left as it was.
+    """
+    parts = series.astype(str).str.extract(_POSTCODE_CELL_PATTERN, flags=re.IGNORECASE)
+    postcodes = parts['outward'].str.upper() + ' ' + parts['inward'].str.upper()
+    return postcodes.where(parts['outward'].notna(), series)
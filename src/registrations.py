@@ -0,0 +1,65 @@
+"""UK vehicle registration validation.
+
+All the plate formats are alternatives of one compiled pattern, so a plate is
+checked in a single fullmatch() and the named group that matched says which
+format family it belongs to. Results are memoised per raw plate since the
+same vehicles keep coming back batch after batch.
+"""
+import re
+from functools import lru_cache
+
+# Format families in the order they are tried. Both dateless layouts report
+# as 'dateless'.
+REGISTRATION_FORMATS = (
+    ('current', r'[A-Z]{2}[0-9]{2}[A-Z]{3}'),              # AB12CDE
+    ('prefix', r'[A-Z][0-9]{1,3}[A-Z]{3}'),                # A123BCD
+    ('suffix', r'[A-Z]{3}[0-9]{1,3}[A-Z]'),                # ABC123A
+    ('northern_ireland', r'[A-Z]{3}[0-9]{4}'),             # BYZ3210
+    ('dateless', r'[0-9]{1,4}[A-Z]{1,3}'),                 # 1-4 numbers + 1-3 letters
+    ('dateless_reversed', r'[A-Z]{1,3}[0-9]{1,4}'),        # 1-3 letters + 1-4 numbers
+)
+_FAMILY_FOR_GROUP = {'dateless_reversed': 'dateless'}
+
+REGISTRATION_PATTERN = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in REGISTRATION_FORMATS)
+REGISTRATION_RE = re.compile(REGISTRATION_PATTERN)
+
+REGISTRATION_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=REGISTRATION_CACHE_SIZE)
+def registration_format(reg):
+    """Return the format family of a plate ('current', 'prefix', ...) or None.
+
+    Case and spaces are ignored. Every family needs at least one letter, so
+    all-number strings are never valid.
+    """
+    if not isinstance(reg, str):
+        return None
+    match = REGISTRATION_RE.fullmatch(reg.upper().replace(" ", ""))
+    if not match:
+        return None
+    return _FAMILY_FOR_GROUP.get(match.lastgroup, match.lastgroup)
+
+
+def is_valid_uk_registration(reg):
+    """Return True if reg matches one of the known UK registration formats."""
+    return registration_format(reg) is not None
+
+
+def validate_registrations(regs):
+    """Validate a whole column of plates at once.
+
+    regs is a pandas Series (a registration column from a loaded workbook) or
+    any iterable of plates, e.g. [job['REG NUMBER'] for job in jobs]. Returns
+    (mask, families): whether each plate is valid and its format family (None
+    when invalid), as Series aligned with the input or as lists.
+    """
+    if hasattr(regs, 'str'):
+        cleaned = regs.where(regs.notna(), '').astype(str).str.upper().str.replace(' ', '', regex=False)
+        parts = cleaned.str.extract('^(?:' + REGISTRATION_PATTERN + ')$')
+        mask = parts.notna().any(axis=1)
+        families = parts.notna().idxmax(axis=1).replace(_FAMILY_FOR_GROUP).astype(object)
+        families[~mask] = None
+        return mask, families
+    families = [registration_format(reg) for reg in regs]
+    return [family is not None for family in families], families
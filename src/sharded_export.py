@@ -0,0 +1,234 @@
+"""Sharded job CSVs for the carrier portal's upload limits.
+
+The portal rejects files over a row count or a size, so a large batch is
+split into shards: CSVs of at most max_rows jobs and max_bytes bytes each
+(header included), optionally one run of shards per customer ref so GR11
+and GR15 never share a file. Each row is encoded once, in order, and a
+shard is handed to a worker thread to be written (and checksummed) as soon
+as it is full, so the shards are written in parallel with each other and
+with the encoding of the rest.
+
+Once every shard is in place a JSON manifest is written beside them
+(<stem>_manifest.json), listing for each shard its file, row count, size,
+SHA-256 and the range of its key fields, so uploads can run in parallel
+and check_shards() can tell which shard files need writing or uploading
+again. If anything fails, the shards already written are removed and no
+manifest is written.
+"""
+import csv
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from csv_export import atomic_file
+from job_record import CSV_FIELDNAMES, parse_job_date
+
+# The portal's limits, per file
+SHARD_MAX_ROWS = int(os.environ.get('JOB_SHARD_MAX_ROWS', 10000))
+SHARD_MAX_BYTES = int(os.environ.get('JOB_SHARD_MAX_BYTES', 5 * 1024 * 1024))
+
+# Threads writing shards
+SHARD_WORKERS = min(4, os.cpu_count() or 1)
+
+# Fields whose lowest and highest value go in the manifest for each shard,
+# compared as text unless they are dates
+SHARD_KEY_FIELDS = ('COLLECTION DATE', 'YOUR REF NO', 'REG NUMBER')
+# Of those, the ones compared as dates (and shown in ISO form)
+SHARD_DATE_FIELDS = ('COLLECTION DATE',)
+
+MANIFEST_VERSION = 1
+
+# How write_exports() shards its CSV; split_field (e.g. 'CUSTOMER REF')
+# gives each of its values its own shards
+ShardLimits = namedtuple('ShardLimits', 'max_rows max_bytes split_field',
+                         defaults=(SHARD_MAX_ROWS, SHARD_MAX_BYTES, None))
+
+_UNSAFE_FILENAME = re.compile(r'[^A-Za-z0-9_-]+')
+
+
+def manifest_path(csv_path):
+    """The manifest written for a sharded export of csv_path."""
+    return os.path.splitext(csv_path)[0] + '_manifest.json'
+
+
+class _LineBuffer:
+    """File-like for csv.writer that keeps the last row written."""
+
+    def write(self, line):
+        self.line = line
+
+
+class _Shard:
+    """A shard being filled: its encoded rows and key ranges."""
+
+    def __init__(self, name, split_value, number, key_count):
+        self.name = name
+        self.split_value = split_value
+        self.number = number
+        self.lines = []
+        self.rows = 0
+        self.size = 0
+        self.lows = [None] * key_count
+        self.highs = [None] * key_count
+
+    def add(self, line, keys):
+        self.lines.append(line)
+        self.rows += 1
+        self.size += len(line)
+        lows, highs = self.lows, self.highs
+        for i, key in enumerate(keys):
+            if key is None:
+                continue
+            if lows[i] is None or key < lows[i]:
+                lows[i] = key
+            if highs[i] is None or key > highs[i]:
+                highs[i] = key
+
+
+def _write_shard(path, header, lines):
+    data = b''.join([header, *lines])
+    with atomic_file(path, 'wb') as f:
+        f.write(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_shards(csv_path, rows, fields=CSV_FIELDNAMES, max_rows=SHARD_MAX_ROWS, max_bytes=SHARD_MAX_BYTES,
+                 split_field=None, workers=SHARD_WORKERS):
+    """Write row tuples of fields as shards named after csv_path
+    (<stem>_001.csv..., or <stem>_<value>_001.csv... with split_field),
+    then the manifest. A row bigger than max_bytes on its own gets a shard
+    to itself.
+
+    Returns the manifest, as written to manifest_path(csv_path).
+    """
+    if max_rows < 1:
+        raise ValueError("max_rows must be at least 1")
+    directory = os.path.dirname(os.path.abspath(csv_path))
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    header = buffer.line.encode('utf-8')
+    room = max(max_bytes - len(header), 1)
+    split_position = fields.index(split_field) if split_field else None
+    key_fields = [field for field in SHARD_KEY_FIELDS if field in fields]
+    key_positions = [(fields.index(field), field in SHARD_DATE_FIELDS) for field in key_fields]
+
+    # Split value -> (its shard being filled, how many it has had)
+    open_shards = {}
+    # Split value -> the part of the shard names for it
+    labels = {}
+    # (shard, future of its checksum) in the order they were started
+    written = []
+
+    def finish(shard):
+        path = os.path.join(directory, shard.name)
+        # The worker holds the only reference to the rows from here on
+        lines, shard.lines = shard.lines, None
+        written.append((shard, pool.submit(_write_shard, path, header, lines)))
+
+    def label(value):
+        if value not in labels:
+            text = _UNSAFE_FILENAME.sub('_', '' if value is None else str(value)).strip('_') or 'no_ref'
+            taken = set(labels.values())
+            candidate, n = text, 1
+            while candidate in taken:
+                n += 1
+                candidate = f"{text}_{n}"
+            labels[value] = candidate
+        return labels[value]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='shard') as pool:
+        try:
+            for row in rows:
+                writer.writerow(row)
+                line = buffer.line.encode('utf-8')
+                value = row[split_position] if split_position is not None else None
+                shard, count = open_shards.get(value, (None, 0))
+                if shard is not None and (shard.rows >= max_rows or shard.size + len(line) > room):
+                    finish(shard)
+                    shard = None
+                if shard is None:
+                    count += 1
+                    name = f"{stem}_{label(value)}_{count:03d}.csv" if split_field else f"{stem}_{count:03d}.csv"
+                    shard = _Shard(name, value, count, len(key_positions))
+                    open_shards[value] = (shard, count)
+                keys = []
+                for position, is_date in key_positions:
+                    key = row[position]
+                    if key is None or key == '':
+                        key = None
+                    elif is_date:
+                        key = parse_job_date(str(key))
+                    elif type(key) is not str:
+                        key = str(key)
+                    keys.append(key)
+                shard.add(line, keys)
+            for shard, _ in open_shards.values():
+                finish(shard)
+            done = [(shard, future.result()) for shard, future in written]
+        except BaseException:
+            for shard, future in written:
+                future.cancel()
+            pool.shutdown(wait=True)
+            for shard, _ in written:
+                try:
+                    os.remove(os.path.join(directory, shard.name))
+                except OSError:
+                    pass
+            raise
+
+    # Each split value's shards together, in order
+    done.sort(key=lambda item: (labels.get(item[0].split_value, ''), item[0].number))
+    shards = []
+    for shard, checksum in done:
+        ranges = {}
+        for field, low, high in zip(key_fields, shard.lows, shard.highs):
+            if low is not None:
+                ranges[field] = [low.isoformat(), high.isoformat()] if field in SHARD_DATE_FIELDS else [low, high]
+        entry = {'file': shard.name}
+        if split_field:
+            entry[split_field] = shard.split_value
+        entry.update({
+            'rows': shard.rows,
+            'bytes': len(header) + shard.size,
+            'sha256': checksum,
+            'key_ranges': ranges,
+        })
+        shards.append(entry)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'source': os.path.basename(csv_path),
+        'fields': list(fields),
+        'max_rows': max_rows,
+        'max_bytes': max_bytes,
+        'split_field': split_field,
+        'rows': sum(entry['rows'] for entry in shards),
+        'shards': shards,
+    }
+    with atomic_file(manifest_path(csv_path)) as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def check_shards(path):
+    """Entries of the manifest at path whose shard file is missing or
+    doesn't match its checksum."""
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    directory = os.path.dirname(os.path.abspath(path))
+    bad = []
+    for entry in manifest['shards']:
+        try:
+            with open(os.path.join(directory, entry['file']), 'rb') as f:
+                checksum = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            checksum = None
+        if checksum != entry['sha256']:
+            bad.append(entry)
+    return bad
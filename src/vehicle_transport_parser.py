@@ -1,19 +1,32 @@
 import re
-import csv
-from datetime import datetime, timedelta
+from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 from tkcalendar import DateEntry
-from datetime import datetime, timedelta
-import holidays
 import os
 from tkinter import font as tkfont
-import pandas as pd
 import tempfile
 import threading
 import time
 import schedule
 import json
+from job_parser_core import JobParser, BC04Parser, REG_FIELD_RE
+from parse_cache import ParseCache
+from live_parse import LIVE_PARSE_DELAY_MS, LIVE_PARSE_POLL_MS, LiveParser
+from registrations import is_valid_uk_registration, validate_registrations
+from business_days import AC01_DELIVERY_DAYS, add_business_days
+from job_record import JOB_FIELDS, JobRecord
+from greenhous import (GR_PREVIEW_COLUMNS, GR_REQUIRED_COLUMNS, find_columns, gr_job_frame, gr_preview_frame,
+                       iter_gr_preview_frames)
+from cw09 import CW_TREE_FIELDS, cw_job_frame
+from workbooks import iter_sheet_chunks
+from job_table import JobTable
+from columnar_export import COLUMNAR_AVAILABLE, COLUMNAR_FORMAT, COLUMNAR_OPTION_FORMAT
+from csv_export import frame_rows, job_rows, write_csv, write_jobs_csv
+from exports import describe_export, write_exports
+from sharded_export import ShardLimits
+from debug_log import DEBUG, app_log
+from virtual_tree import PREVIEW_FILTER_DELAY_MS, VirtualTreeview
 
 # Gmail API imports for email automation
 try:
@@ -40,18 +53,15 @@ try:
 except ImportError:
     ENV_AVAILABLE = False
 
-# Set up debug logging
-DEBUG_LOG = os.path.join(tempfile.gettempdir(), "debug_log.txt")
+# Parsed AC01/BC04 blocks, shared by the GUI tabs and the email automation
+# and kept on disk so re-pasted jobs are not parsed again after a restart
+PARSE_CACHE = ParseCache(path=os.path.join(tempfile.gettempdir(), "job_parse_cache.sqlite3"))
 
-def log_debug(message):
-    """Write debug message to file in a safe way"""
-    try:
-        with open(DEBUG_LOG, 'a') as f:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"[{timestamp}] {message}\n")
-    except Exception as e:
-        # If logging fails, silently ignore to avoid crashing the app
-        pass
+def log_quarantined(job_type, quarantined):
+    """Log the jobs a parser left out for being over its size or time limit"""
+    for problem in quarantined:
+        app_log.warning("%s job %d quarantined (%s): %r", job_type, problem.index + 1, problem.reason,
+                        problem.excerpt[:80])
 
 class RoundedButton(tk.Frame):
     """A simpler button implementation that works with standard tkinter"""
@@ -220,488 +230,6 @@ class TabButton(tk.Frame):
             self.command(self.text)
 
 
-class JobParser:
-    def __init__(self, collection_date, delivery_date=None):
-        self.jobs = []
-        self.collection_date = collection_date
-        self.delivery_date = delivery_date if delivery_date else collection_date
-        
-    def calculate_delivery_date(self, collection_date):
-        """Calculate delivery date as 3 business days from collection date."""
-        # Convert string date to datetime if needed
-        if isinstance(collection_date, str):
-            collection_date = datetime.strptime(collection_date, "%d/%m/%Y")
-            
-        # Get UK holidays
-        uk_holidays = holidays.UK()
-        
-        # Start with collection date
-        current_date = collection_date
-        business_days = 0
-        
-        # Keep adding days until we have 3 business days
-        while business_days < 3:
-            current_date += timedelta(days=1)
-            # Skip weekends and holidays
-            if current_date.weekday() < 5 and current_date not in uk_holidays:
-                business_days += 1
-                
-        # Format the date back to string
-        return current_date.strftime("%d/%m/%Y")
-        
-    def fix_location_name(self, name):
-        # Fix common location names
-        name = name.replace('18 AC Stoke Logistics Hub', '18 Arnold Clark Stoke Logistics Hub')
-        name = name.replace('4 AC Accrington Logistics Hub', '4 Arnold Clark Accrington Logistics Hub')
-        
-        # Handle "Unit" in address lines - fix for Wakefield Motorstore
-        if "Unit 1 Calder Park Services" in name:
-            return "Wakefield Motorstore"
-        
-        # Handle cases where Unit appears in other locations
-        if name.startswith("Unit ") and len(name.split()) >= 3:
-            # This is likely a unit number that should be in ADDR2
-            # Don't modify here - the whole address structure would need to change
-            pass
-            
-        return name
-        
-    def clean_phone_number(self, phone):
-        """Clean and format phone number."""
-        if not phone:
-            return ""
-            
-        # Remove any non-digit characters
-        digits = ''.join(c for c in phone if c.isdigit())
-        
-        # Handle various formats
-        if digits.startswith('44'):
-            # Remove 44 prefix
-            digits = digits[2:]
-        elif digits.startswith('0044'):
-            # Remove 0044 prefix
-            digits = digits[4:]
-        elif digits.startswith('0'):
-            # Remove leading 0
-            digits = digits[1:]
-            
-        # Ensure proper length (10 digits)
-        if len(digits) > 10:
-            digits = digits[:10]
-        elif len(digits) < 10:
-            # If less than 10 digits, pad with zeros at the end
-            digits = digits.ljust(10, '0')
-                
-        return digits
-
-    def is_postcode(self, line):
-        # More flexible UK postcode regex that handles common variations
-        postcode_patterns = [
-            # Standard format: AA9A 9AA, AA99 9AA, A9A 9AA, A99 9AA, AA9 9AA
-            r'^[A-Z]{1,2}[0-9][0-9A-Z]?\s*[0-9][A-Z]{2}$',
-            # With optional spaces and lowercase
-            r'^[A-Za-z]{1,2}[0-9][0-9A-Za-z]?\s*[0-9][A-Za-z]{2}$',
-            # With "Postcode:" prefix
-            r'^(?:Postcode|Post Code|P/Code|PC)[\s:]+[A-Za-z]{1,2}[0-9][0-9A-Za-z]?\s*[0-9][A-Za-z]{2}$'
-        ]
-        
-        line = line.strip()
-        for pattern in postcode_patterns:
-            if re.match(pattern, line):
-                # Extract just the postcode part if it has a prefix
-                postcode_match = re.search(r'([A-Za-z]{1,2}[0-9][0-9A-Za-z]?\s*[0-9][A-Za-z]{2})$', line)
-                if postcode_match:
-                    return postcode_match.group(1).upper()
-        return None
-
-    def parse_jobs(self, text):
-        # Split by FROM sections
-        job_texts = re.split(r'\nFROM\n', text)
-        job_texts = [t for t in job_texts if t.strip()]
-        
-        for job_text in job_texts:
-            if not job_text.startswith('FROM'):
-                job_text = 'FROM\n' + job_text
-            
-            if not re.search(r'TO\n', job_text):
-                continue
-                
-            job = self.parse_single_job(job_text)
-            if job:
-                # Ensure special instructions are set for each job
-                if 'SPECIAL INSTRUCTIONS' not in job or not job['SPECIAL INSTRUCTIONS']:
-                    job['SPECIAL INSTRUCTIONS'] = 'Please call 1 hour before collection'
-                self.jobs.append(job)
-            
-        return self.jobs
-    
-    def parse_address_lines(self, lines):
-        """Helper method to parse address lines while preserving St. and similar abbreviations"""
-        # Preserve common street name patterns before splitting
-        preserved_patterns = [
-            (r'St\.\s+[A-Z][a-z]+', lambda m: m.group().replace('.', '@')),  # St. Andrews, St. Mary's etc
-            (r'St\s+[A-Z][a-z]+', lambda m: m.group().replace(' ', '#')),    # St Andrews, St Mary's etc
-            (r'D\.\s*M\.\s*Keith', lambda m: m.group().replace('.', '@')),   # D.M.Keith
-            (r'[A-Z]\.\s+[A-Z]\.\s+\w+', lambda m: m.group().replace('.', '@')),  # Any X.Y. format names
-        ]
-        
-        processed_lines = []
-        for line in lines:
-            if not line.strip():
-                continue
-                
-            # Preserve special patterns
-            processed_line = line
-            for pattern, replacement in preserved_patterns:
-                processed_line = re.sub(pattern, replacement, processed_line)
-            
-            # Now restore the preserved patterns
-            processed_line = processed_line.replace('@', '.').replace('#', ' ')
-            processed_lines.append(processed_line.strip())
-            
-        return processed_lines
-
-    def clean_duplicate_towns(self, lines):
-        """Remove duplicate consecutive town names while preserving the last occurrence"""
-        if not lines:
-            return lines
-        
-        cleaned_lines = []
-        i = 0
-        while i < len(lines):
-            # If we're at the last line or current line is different from next line
-            if i == len(lines) - 1 or lines[i].strip().upper() != lines[i + 1].strip().upper():
-                cleaned_lines.append(lines[i])
-                i += 1
-            else:
-                # Skip the first occurrence of duplicate town
-                i += 1
-        return cleaned_lines
-
-    def parse_single_job(self, job_text):
-        job = {}
-        
-        # Initialize all fields to empty strings
-        job['REG NUMBER'] = ''
-        job['VIN'] = ''
-        job['MAKE'] = ''
-        job['MODEL'] = ''
-        job['COLOR'] = ''
-        job['COLLECTION DATE'] = self.collection_date
-        job['YOUR REF NO'] = ''
-        job['COLLECTION ADDR1'] = ''
-        job['COLLECTION ADDR2'] = ''
-        job['COLLECTION ADDR3'] = ''
-        job['COLLECTION ADDR4'] = ''
-        job['COLLECTION POSTCODE'] = ''
-        job['COLLECTION CONTACT NAME'] = ''
-        job['COLLECTION PHONE'] = ''
-        job['DELIVERY DATE'] = self.delivery_date
-        job['DELIVERY ADDR1'] = ''
-        job['DELIVERY ADDR2'] = ''
-        job['DELIVERY ADDR3'] = ''
-        job['DELIVERY ADDR4'] = ''
-        job['DELIVERY POSTCODE'] = ''
-        job['DELIVERY CONTACT NAME'] = ''
-        job['DELIVERY CONTACT PHONE'] = ''
-        job['SPECIAL INSTRUCTIONS'] = 'Must call 1hour before collection and get a name'
-        job['PRICE'] = ''
-        job['CUSTOMER REF'] = 'AC01'
-        job['TRANSPORT TYPE'] = ''
-        
-        # Extract FROM section
-        from_match = re.search(r'FROM\n(.*?)(?=\nTO|$)', job_text, re.DOTALL)
-        if from_match:
-            from_text = from_match.group(1).strip()
-            from_lines = [line.strip() for line in from_text.split('\n') if line.strip()]
-            
-            # Process phone number first - Updated pattern to better match phone numbers
-            phone_lines = [line for line in from_lines if re.search(r'(?:Tel|Phone|T|Telephone)[\s:.]+[+\d()\s-]+', line, re.IGNORECASE)]
-            if phone_lines:
-                phone_match = re.search(r'(?:Tel|Phone|T|Telephone)[\s:.]+([+\d()\s-]+)', phone_lines[0], re.IGNORECASE)
-                if phone_match:
-                    phone_number = phone_match.group(1).strip()
-                    # Clean and store the phone number
-                    job['COLLECTION PHONE'] = self.clean_phone_number(phone_number)
-                # Remove phone lines from address processing
-                from_lines = [line for line in from_lines if line not in phone_lines]
-            
-            # Process remaining lines for address
-            address_lines = []
-            postcode = None
-            
-            for line in from_lines:
-                # Check if line is a postcode
-                postcode_value = self.is_postcode(line)
-                if postcode_value:
-                    postcode = postcode_value
-                    continue
-                # Add to address lines if not a postcode
-                address_lines.append(line)
-            
-            # Process address lines with special handling for St. names
-            address_lines = self.parse_address_lines(address_lines)
-            
-            # Remove duplicate town names
-            address_lines = self.clean_duplicate_towns(address_lines)
-            
-            # Process address lines
-            if address_lines:
-                # First line is always ADDR1
-                job['COLLECTION ADDR1'] = self.fix_location_name(address_lines[0])
-                
-                # Handle remaining address lines
-                remaining_lines = address_lines[1:]
-                
-                # Assign remaining lines
-                if len(remaining_lines) > 0:
-                    # Always assign the second line to ADDR2 if it exists
-                    if len(remaining_lines) >= 1:
-                        job['COLLECTION ADDR2'] = remaining_lines[0]
-                    
-                    # For the rest of the lines
-                    if len(remaining_lines) == 2:
-                        job['COLLECTION ADDR3'] = ''  # Ensure ADDR3 is empty
-                        job['COLLECTION ADDR4'] = remaining_lines[1]  # Town
-                    elif len(remaining_lines) >= 3:
-                        job['COLLECTION ADDR3'] = remaining_lines[1]
-                        job['COLLECTION ADDR4'] = remaining_lines[-1]  # Town
-                    
-                    # Ensure ADDR4 is not empty if we have remaining lines
-                    if not job['COLLECTION ADDR4'] and remaining_lines:
-                        job['COLLECTION ADDR4'] = remaining_lines[-1]
-            
-            if postcode:
-                job['COLLECTION POSTCODE'] = postcode
-        
-        # Extract TO section
-        to_match = re.search(r'TO\n(.*?)(?=\nJOB NO|$)', job_text, re.DOTALL)
-        if to_match:
-            to_text = to_match.group(1).strip()
-            to_lines = [line.strip() for line in to_text.split('\n') if line.strip()]
-            
-            # Process phone number first - Updated pattern to better match phone numbers
-            phone_lines = [line for line in to_lines if re.search(r'(?:Tel|Phone|T|Telephone)[\s:.]+[+\d()\s-]+', line, re.IGNORECASE)]
-            if phone_lines:
-                phone_match = re.search(r'(?:Tel|Phone|T|Telephone)[\s:.]+([+\d()\s-]+)', phone_lines[0], re.IGNORECASE)
-                if phone_match:
-                    phone_number = phone_match.group(1).strip()
-                    # Clean and store the phone number
-                    job['DELIVERY CONTACT PHONE'] = self.clean_phone_number(phone_number)
-                # Remove phone lines from address processing
-                to_lines = [line for line in to_lines if line not in phone_lines]
-            
-            # Process remaining lines for address
-            address_lines = []
-            postcode = None
-            
-            for line in to_lines:
-                # Check if line is a postcode
-                postcode_value = self.is_postcode(line)
-                if postcode_value:
-                    postcode = postcode_value
-                    continue
-                # Add to address lines if not a postcode
-                address_lines.append(line)
-            
-            # Process address lines with special handling for St. names
-            address_lines = self.parse_address_lines(address_lines)
-            
-            # Remove duplicate town names
-            address_lines = self.clean_duplicate_towns(address_lines)
-            
-            # Process address lines
-            if address_lines:
-                # First line is always ADDR1
-                job['DELIVERY ADDR1'] = self.fix_location_name(address_lines[0])
-                
-                # Special handling for Wakefield Motorstore
-                if job['DELIVERY ADDR1'] == "Wakefield Motorstore":
-                    # Check if "Peel Avenue" exists in the address lines
-                    has_peel_avenue = False
-                    for line in address_lines:
-                        if "Peel Avenue" in line:
-                            has_peel_avenue = True
-                            # Insert Unit 1 Calder Park Services as ADDR2
-                            job['DELIVERY ADDR2'] = "Unit 1 Calder Park Services"
-                            job['DELIVERY ADDR3'] = "Peel Avenue"
-                            job['DELIVERY ADDR4'] = "Wakefield"
-                            # Set the correct phone number for Wakefield Motorstore
-                            job['DELIVERY CONTACT PHONE'] = '01924975790'
-                            # Don't return early - continue processing to handle other fields
-                            break
-                
-                # Handle remaining address lines
-                remaining_lines = address_lines[1:]
-                
-                # Only process remaining lines if we haven't already set them for Wakefield
-                if not (job['DELIVERY ADDR1'] == "Wakefield Motorstore" and 
-                        job['DELIVERY ADDR2'] == "Unit 1 Calder Park Services"):
-                    # Assign remaining lines
-                    if len(remaining_lines) > 0:
-                        # Always assign the second line to ADDR2 if it exists
-                        if len(remaining_lines) >= 1:
-                            job['DELIVERY ADDR2'] = remaining_lines[0]
-                        
-                        # For the rest of the lines
-                        if len(remaining_lines) == 2:
-                            job['DELIVERY ADDR3'] = ''  # Ensure ADDR3 is empty
-                            job['DELIVERY ADDR4'] = remaining_lines[1]  # Town
-                        elif len(remaining_lines) >= 3:
-                            job['DELIVERY ADDR3'] = remaining_lines[1]
-                            job['DELIVERY ADDR4'] = remaining_lines[-1]  # Town
-                        
-                        # Ensure ADDR4 is not empty if we have remaining lines
-                        if not job['DELIVERY ADDR4'] and remaining_lines:
-                            job['DELIVERY ADDR4'] = remaining_lines[-1]
-            
-            if postcode:
-                job['DELIVERY POSTCODE'] = postcode
-        
-        # Extract vehicle details - better pattern for the format in the provided example
-        vehicle_section_match = re.search(r'MAKE\s+MODEL\s+COLOU?R\s+REGISTRATION(?:\s+CHASSIS)?\s*\n(.*?)(?=\n\s*COMMENTS|\n\s*ORIGIN|\n\s*VALUE|$)', 
-                                         job_text, re.DOTALL | re.IGNORECASE)
-        
-        if vehicle_section_match:
-            vehicle_line = vehicle_section_match.group(1).strip()
-            
-            # Try to match with a more structured pattern first - chassis is optional
-            vehicle_pattern = r'(\w+(?:-\w+)?)\s+([\w\s]+?)\s+(Blue|Grey|Black|White|Red|Silver|Green|Yellow|Orange|Purple|Brown|Gold)\s+([A-Z0-9]+)(?:\s+([A-Z0-9]*))?'
-            structured_match = re.match(vehicle_pattern, vehicle_line, re.IGNORECASE)
-            
-            if structured_match:
-                make = structured_match.group(1).strip()
-                model = structured_match.group(2).strip()
-                color = structured_match.group(3).strip()
-                registration = structured_match.group(4).strip()
-                # Chassis might be empty, that's okay
-                chassis = structured_match.group(5).strip() if structured_match.group(5) else ''
-                
-                job['MAKE'] = make
-                job['MODEL'] = model
-                job['COLOR'] = color
-                if self.is_valid_uk_registration(registration):
-                    job['REG NUMBER'] = registration
-                else:
-                    job['REG NUMBER'] = ''
-                job['VIN'] = chassis
-            else:
-                # Split the vehicle line into parts - fallback method
-                parts = vehicle_line.split()
-                
-                if len(parts) >= 4:  # We need at least make, model, color, and registration
-                    # Start from the end and work backwards
-                    if len(parts) >= 5 and re.match(r'^[A-Z0-9]+$', parts[-1]):
-                        # Last part looks like a chassis number
-                        chassis = parts[-1]
-                        registration = parts[-2]
-                        color_index = -3
-                    else:
-                        # No chassis number
-                        chassis = ''
-                        registration = parts[-1]
-                        color_index = -2
-                    
-                    # Color is typically one word
-                    color = parts[color_index] if abs(color_index) < len(parts) else ''
-                    
-                    # Make is usually one word, but can be hyphenated
-                    common_makes = ["AUDI", "BMW", "CUPRA", "DACIA", "FORD", "HYUNDAI", "KIA", "MG", 
-                                    "NISSAN", "PEUGEOT", "RENAULT", "SEAT", "SKODA", "TOYOTA", 
-                                    "VAUXHALL", "VOLKSWAGEN", "VOLVO", "MERCEDES-BENZ"]
-                    
-                    # Try to identify the make
-                    make = parts[0]
-                    model_start = 1
-                    
-                    # Handle hyphenated makes like MERCEDES-BENZ
-                    if len(parts) > 4 and parts[0] + "-" + parts[1] in [m.upper() for m in common_makes]:
-                        make = parts[0] + "-" + parts[1]
-                        model_start = 2
-                    
-                    # The model is everything between make and color
-                    model = " ".join(parts[model_start:color_index])
-                    
-                    job['MAKE'] = make
-                    job['MODEL'] = model
-                    job['COLOR'] = color
-                    if self.is_valid_uk_registration(registration):
-                        job['REG NUMBER'] = registration
-                    else:
-                        job['REG NUMBER'] = ''
-                    job['VIN'] = chassis
-        
-        # Look for individual fields if not found above
-        if not job['MAKE']:
-            make_match = re.search(r'MAKE\s*:\s*([A-Z-]+(?:-[A-Z]+)?)', job_text, re.IGNORECASE)
-            if make_match:
-                job['MAKE'] = make_match.group(1).strip()
-                
-        if not job['MODEL']:
-            model_match = re.search(r'MODEL\s*:\s*([A-Z0-9\s]+?)(?:\n|$)', job_text, re.IGNORECASE)
-            if model_match:
-                job['MODEL'] = model_match.group(1).strip()
-                
-        if not job['COLOR']:
-            color_match = re.search(r'COLOU?R\s*:\s*([A-Za-z]+)', job_text, re.IGNORECASE)
-            if color_match:
-                job['COLOR'] = color_match.group(1).strip()
-                
-        if not job['REG NUMBER']:
-            reg_match = re.search(r'REG(?:ISTRATION)?\s*:?\s*([A-Z0-9]+)', job_text, re.IGNORECASE)
-            if reg_match:
-                reg_candidate = reg_match.group(1).strip()
-                if self.is_valid_uk_registration(reg_candidate):
-                    job['REG NUMBER'] = reg_candidate
-                else:
-                    job['REG NUMBER'] = ''
-        
-        if not job['VIN']:
-            vin_match = re.search(r'CHASSIS\s*:?\s*([A-Z0-9]+)', job_text, re.IGNORECASE)
-            if vin_match:
-                job['VIN'] = vin_match.group(1).strip()
-        
-        # Extract job number - specific pattern for "JOB NO KEY LOC BARCODE" format
-        job_no_match = re.search(r'JOB\s+NO(?:\s+KEY\s+LOC\s+BARCODE)?\s*\n(\d+)', job_text, re.IGNORECASE)
-        if job_no_match:
-            job['YOUR REF NO'] = job_no_match.group(1).strip()
-        else:
-            # Fallback to other patterns if the above doesn't match
-            job_no_patterns = [
-                r'JOB\s+NO[\s:.]+(\d+)',
-                r'YOUR_REF.*?\n(\d+)',
-                r'REF(?:ERENCE)?(?:\s+NO)?[\s:.]+(\d+)',
-                r'REFERENCE[\s:.]+(\d+)'
-            ]
-            
-            for pattern in job_no_patterns:
-                job_no_match = re.search(pattern, job_text, re.IGNORECASE)
-                if job_no_match:
-                    job['YOUR REF NO'] = job_no_match.group(1).strip()
-                    break
-        
-        # Extract value/price - specific pattern for the example format
-        value_match = re.search(r'VALUE\s*\n([\d.]+)', job_text, re.IGNORECASE)
-        if value_match:
-            # We don't store the price as requested
-            job['PRICE'] = ''
-        
-        return job
-
-    def is_valid_uk_registration(self, reg):
-        reg = reg.upper().replace(" ", "")
-        if reg.isdigit():
-            return False  # Never just numbers
-        patterns = [
-            r"^[A-Z]{2}[0-9]{2}[A-Z]{3}$",         # Current style: AB12CDE
-            r"^[A-Z]{1}[0-9]{1,3}[A-Z]{3}$",       # Prefix: A123BCD
-            r"^[A-Z]{3}[0-9]{1,3}[A-Z]{1}$",       # Suffix: ABC123A
-            r"^[A-Z]{3}[0-9]{4}$",                 # NI: BYZ3210
-            r"^[0-9]{1,4}[A-Z]{1,3}$",             # Dateless: 1–4 numbers + 1–3 letters
-            r"^[A-Z]{1,3}[0-9]{1,4}$",             # Dateless: 1–3 letters + 1–4 numbers
-        ]
-        return any(re.match(p, reg) for p in patterns)
-
 class EmailAutomation:
     """Email automation functionality integrated into the parser"""
     
@@ -727,23 +255,23 @@ class EmailAutomation:
         
     def authenticate_gmail(self):
         """Authenticate with Gmail API, robust error handling"""
-        print(f"DEBUG: Looking for credentials.json at: {CREDENTIALS_PATH}")
-        print(f"DEBUG: Looking for token.json at: {TOKEN_PATH}")
+        app_log.debug("Looking for credentials.json at: %s", CREDENTIALS_PATH)
+        app_log.debug("Looking for token.json at: %s", TOKEN_PATH)
         if not os.path.exists(CREDENTIALS_PATH):
-            print("DEBUG: credentials.json does not exist.")
+            app_log.error("credentials.json does not exist.")
             return False, f"credentials.json not found at {CREDENTIALS_PATH}"
         try:
             with open(CREDENTIALS_PATH, 'r') as f:
                 try:
                     json.load(f)
                 except json.JSONDecodeError:
-                    print("DEBUG: credentials.json is not valid JSON.")
+                    app_log.error("credentials.json is not valid JSON.")
                     return False, f"credentials.json is not valid JSON at {CREDENTIALS_PATH}"
         except PermissionError:
-            print("DEBUG: Permission denied when opening credentials.json.")
+            app_log.error("Permission denied when opening credentials.json.")
             return False, f"Permission denied for credentials.json at {CREDENTIALS_PATH}"
         except Exception as e:
-            print(f"DEBUG: Unexpected error opening credentials.json: {e}")
+            app_log.error("Unexpected error opening credentials.json: %s", e)
             return False, f"Unexpected error opening credentials.json: {e}"
         try:
             if os.path.exists(TOKEN_PATH):
@@ -757,10 +285,10 @@ class EmailAutomation:
                 with open(TOKEN_PATH, 'w') as token:
                     token.write(self.creds.to_json())
             self.service = build('gmail', 'v1', credentials=self.creds)
-            print("DEBUG: Gmail authentication successful!")
+            app_log.info("Gmail authentication successful!")
             return True, "Gmail authentication successful!"
         except Exception as e:
-            print(f"DEBUG: Gmail authentication failed: {e}")
+            app_log.error("Gmail authentication failed: %s", e)
             return False, f"Gmail authentication failed: {e}"
     
     def get_unread_emails(self, query: str = "is:unread"):
@@ -781,7 +309,7 @@ class EmailAutomation:
             
             return emails
         except HttpError as error:
-            log_debug(f"Error getting emails: {error}")
+            app_log.error("Error getting emails: %s", error)
             return []
     
     def parse_email_content(self, email_data):
@@ -815,7 +343,7 @@ class EmailAutomation:
             }
             
         except Exception as e:
-            log_debug(f"Error parsing email: {e}")
+            app_log.error("Error parsing email: %s", e)
             return {}
     
     def _get_email_body(self, payload):
@@ -900,7 +428,7 @@ class EmailAutomation:
             return file_path
             
         except Exception as e:
-            log_debug(f"Error downloading attachment: {e}")
+            app_log.error("Error downloading attachment: %s", e)
             return None
     
     def process_job(self, job_info):
@@ -928,83 +456,62 @@ class EmailAutomation:
                 return self._process_generic_job(job_info, file_paths)
                 
         except Exception as e:
-            log_debug(f"Error processing job: {e}")
+            app_log.error("Error processing job: %s", e)
             return None
     
     def _process_ac01_job(self, job_info, file_paths):
         """Process AC01 job type"""
-        # Read file content
-        with open(file_paths[0], 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Parse jobs using existing parser
         parser = JobParser(
             collection_date=job_info['collection_date'],
-            delivery_date=job_info['delivery_date']
+            delivery_date=job_info['delivery_date'],
+            cache=PARSE_CACHE
         )
-        jobs = parser.parse_jobs(content)
         
         # Save to CSV
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_filename = f"ac01_jobs_{timestamp}.csv"
         output_path = os.path.join('jobs', 'AC01', output_filename)
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Job Number', 'Collection Date', 'Delivery Date', 'From', 'To', 'Vehicle', 'Phone']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for job in jobs:
-                writer.writerow(job)
+        quarantined = []
+        # Stream jobs from the attachment straight into the CSV, one at a time
+        with open(file_paths[0], 'r', encoding='utf-8') as f:
+            write_jobs_csv(output_path, parser.iter_jobs(f, quarantine=quarantined))
+        log_quarantined('AC01', quarantined)
         
         return output_path
     
     def _process_bc04_job(self, job_info, file_paths):
         """Process BC04 job type"""
-        # Read file content
-        with open(file_paths[0], 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Parse jobs using existing parser
         parser = BC04Parser(
             collection_date=job_info['collection_date'],
-            delivery_date=job_info['delivery_date']
+            delivery_date=job_info['delivery_date'],
+            cache=PARSE_CACHE
         )
-        jobs = parser.parse_jobs(content)
         
         # Save to CSV
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_filename = f"bc04_jobs_{timestamp}.csv"
         output_path = os.path.join('jobs', 'BC04', output_filename)
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Job Number', 'Collection Date', 'Delivery Date', 'From', 'To', 'Vehicle', 'Phone']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for job in jobs:
-                writer.writerow(job)
+        quarantined = []
+        # Stream jobs from the attachment straight into the CSV, one at a time
+        with open(file_paths[0], 'r', encoding='utf-8') as f:
+            write_jobs_csv(output_path, parser.iter_jobs(f, quarantine=quarantined))
+        log_quarantined('BC04', quarantined)
         
         return output_path
     
     def _process_gr11_job(self, job_info, file_paths):
         """Process GR11 job type (Excel files)"""
-        # Read Excel file
-        df = pd.read_excel(file_paths[0])
-        
-        # Process Excel data (simplified - you may need to adapt this)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_filename = f"gr11_jobs_{timestamp}.csv"
         output_path = os.path.join('jobs', 'GR11', output_filename)
         
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Convert to CSV
-        df.to_csv(output_path, index=False)
+        # Stream the workbook through the GR11 transforms a chunk at a time,
+        # appending each chunk's jobs to the CSV as it is done
+        today = datetime.now().strftime("%d/%m/%Y")
+        previews = iter_gr_preview_frames(iter_sheet_chunks(file_paths[0]))
+        write_csv(output_path, frame_rows(gr_job_frame(preview, today) for preview in previews))
         
         return output_path
     
@@ -1029,7 +536,7 @@ class EmailAutomation:
     def send_result_email(self, recipient_email, result_file, job_info):
         """Send processed result back to the requester"""
         if not self.sender_email or not self.sender_password:
-            log_debug("Email credentials not configured")
+            app_log.error("Email credentials not configured")
             return False
             
         try:
@@ -1078,7 +585,7 @@ class EmailAutomation:
             return True
             
         except Exception as e:
-            log_debug(f"Error sending result email: {e}")
+            app_log.error("Error sending result email: %s", e)
             return False
     
     def mark_email_as_read(self, email_id):
@@ -1090,14 +597,14 @@ class EmailAutomation:
             self.service.users().messages().modify(
                 userId='me', id=email_id, body={'removeLabelIds': ['UNREAD']}).execute()
         except Exception as e:
-            log_debug(f"Error marking email as read: {e}")
+            app_log.error("Error marking email as read: %s", e)
     
     def process_pending_emails(self):
         """Main function to process all pending emails"""
         if not self.service:
             return
             
-        log_debug(f"Checking for new emails at {datetime.now()}")
+        app_log.info("Checking for new emails")
         
         # Get unread emails
         emails = self.get_unread_emails()
@@ -1110,7 +617,7 @@ class EmailAutomation:
                 if not job_info:
                     continue
                 
-                log_debug(f"Processing job from {job_info['from_email']} - Type: {job_info['job_type']}")
+                app_log.info("Processing job from %s - Type: %s", job_info['from_email'], job_info['job_type'])
                 
                 # Process the job
                 result_file = self.process_job(job_info)
@@ -1124,14 +631,14 @@ class EmailAutomation:
                     ):
                         # Mark email as read
                         self.mark_email_as_read(email_data['id'])
-                        log_debug(f"Successfully processed job from {job_info['from_email']}")
+                        app_log.info("Successfully processed job from %s", job_info['from_email'])
                     else:
-                        log_debug(f"Failed to send result to {job_info['from_email']}")
+                        app_log.error("Failed to send result to %s", job_info['from_email'])
                 else:
-                    log_debug(f"Failed to process job from {job_info['from_email']}")
+                    app_log.error("Failed to process job from %s", job_info['from_email'])
                     
             except Exception as e:
-                log_debug(f"Error processing email {email_data['id']}: {e}")
+                app_log.error("Error processing email %s: %s", email_data['id'], e)
     
     def start_automation(self, check_interval_minutes=5):
         """Start the automation in a separate thread"""
@@ -1185,6 +692,17 @@ class VehicleTransportApp:
         self.ac01_price_var = tk.StringVar()
         self.ac01_price_var.set("Total Price: £0.00")
         
+        # Background parsing of the AC01/BC04 text boxes while they are edited
+        self.ac01_live_parser = LiveParser('AC01', cache=PARSE_CACHE)
+        self.bc04_live_parser = LiveParser('BC04', cache=PARSE_CACHE)
+        self._live_parse_after = {}
+        self._live_parse_polling = set()
+        # Pending re-filters of the GR11/CW09 previews
+        self._preview_filter_after = {}
+        # Job type -> (save an Excel copy, split by customer ref, split for
+        # upload) variables of a GR11/CW09 tab
+        self.export_options = {}
+        
         # Set modern color scheme
         self.primary_color = "#4361EE"          # Blue accent color
         self.secondary_color = "#3A0CA3"        # Darker blue for hover
@@ -1511,6 +1029,9 @@ class VehicleTransportApp:
         # Bind text change to update job count
         self.text_input.bind("<KeyRelease>", self.update_job_count)
         
+        # Live preview of the parsed jobs
+        self.ac01_preview_tree = self.create_live_preview(ac01_frame)
+        
         # Price tracking section
         price_section = tk.Frame(ac01_frame, bg=self.card_bg)
         price_section.pack(fill=tk.X, pady=(5, 10))
@@ -1721,6 +1242,9 @@ class VehicleTransportApp:
         # Bind text change to update job count
         self.bc04_text_input.bind("<KeyRelease>", self.update_bc04_job_count)
         
+        # Live preview of the parsed jobs
+        self.bc04_preview_tree = self.create_live_preview(bc04_frame)
+        
         # Price tracking section
         price_section = tk.Frame(bc04_frame, bg=self.card_bg)
         price_section.pack(fill=tk.X, pady=(5, 10))
@@ -1886,6 +1410,10 @@ class VehicleTransportApp:
         )
         job_count_label.pack(side=tk.RIGHT)
         
+        # Filter box, matched against every preview column
+        self.gr_filter_var = tk.StringVar()
+        self.create_preview_filter(preview_header, self.gr_filter_var, "GR11")
+        
         # Preview area
         preview_container = ModernFrame(
             preview_section,
@@ -1932,8 +1460,10 @@ class VehicleTransportApp:
         # Pack the treeview
         self.job_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        # Configure the scrollbar
-        tree_scroll.config(command=self.job_tree.yview)
+        # The loaded jobs; the Treeview only shows the rows scrolled to
+        # (see job_table.py and virtual_tree.py)
+        self.gr_jobs = JobTable(GR_PREVIEW_COLUMNS)
+        self.gr_view = VirtualTreeview(self.job_tree, tree_scroll, self.gr_jobs)
         
         # Action section
         action_section = tk.Frame(gr11_frame, bg=self.card_bg)
@@ -1965,9 +1495,172 @@ class VehicleTransportApp:
             fg="white"
         )
         self.gr_process_button.pack(side=tk.RIGHT)
+        self.create_export_options(action_section, "GR11", by_ref=True)
         
         return gr11_frame
     
+    def browse_excel_file(self):
+        """Open file dialog to select Excel file"""
+        filetypes = [("Excel files", "*.xlsx *.xls")]
+        file_path = filedialog.askopenfilename(filetypes=filetypes)
+        
+        if file_path:
+            self.selected_file_var.set(file_path)
+            self.load_excel_data(file_path)
+    
+    def create_export_options(self, parent, job_type, by_ref=False):
+        """Export checkboxes for a GR11/CW09 tab, packed left of the process button"""
+        xlsx_var = tk.BooleanVar(value=False)
+        by_ref_var = tk.BooleanVar(value=False)
+        shard_var = tk.BooleanVar(value=False)
+        # On by default when JOB_COLUMNAR_FORMAT is set; needs pyarrow
+        columnar_var = tk.BooleanVar(value=bool(COLUMNAR_FORMAT) and COLUMNAR_AVAILABLE)
+        self.export_options[job_type] = (xlsx_var, by_ref_var, shard_var, columnar_var)
+        options = [("Split for upload", shard_var, True), ("Also save as Excel", xlsx_var, True),
+                   (f"Also save as {COLUMNAR_OPTION_FORMAT.capitalize()}", columnar_var, COLUMNAR_AVAILABLE)]
+        if by_ref:
+            # Applies to the workbook's sheets and to the upload shards
+            options.insert(0, ("Split by customer ref", by_ref_var, True))
+        for text, variable, available in options:
+            check = tk.Checkbutton(
+                parent,
+                text=text,
+                variable=variable,
+                state=tk.NORMAL if available else tk.DISABLED,
+                font=self.small_font,
+                fg=self.light_text,
+                bg=self.card_bg,
+                activebackground=self.card_bg
+            )
+            check.pack(side=tk.RIGHT, padx=(0, 10))
+
+    def export_save_options(self, job_type):
+        """save_to_csv keyword arguments for a tab's export checkboxes"""
+        if job_type not in self.export_options:
+            return {}
+        xlsx_var, by_ref_var, shard_var, columnar_var = self.export_options[job_type]
+        return {'xlsx': xlsx_var.get(), 'by_ref': by_ref_var.get(), 'shard': shard_var.get(),
+                'columnar_format': COLUMNAR_OPTION_FORMAT if columnar_var.get() else ''}
+
+    def create_preview_filter(self, parent, filter_var, job_type):
+        """Filter box for a GR11/CW09 preview, packed right of the job count"""
+        filter_entry = tk.Entry(
+            parent,
+            textvariable=filter_var,
+            font=self.small_font,
+            width=24,
+            relief=tk.SOLID,
+            bd=1
+        )
+        filter_entry.pack(side=tk.RIGHT, padx=10)
+        filter_label = tk.Label(
+            parent,
+            text="Filter:",
+            font=self.small_font,
+            fg=self.light_text,
+            bg=self.card_bg
+        )
+        filter_label.pack(side=tk.RIGHT)
+        filter_entry.bind("<KeyRelease>", lambda event: self.schedule_preview_filter(job_type))
+    
+    def _preview_widgets(self, job_type):
+        """(job table, view, filter variable, job count variable) of a GR11/CW09 preview"""
+        if job_type == "CW09":
+            return self.cw_jobs, self.cw_view, self.cw_filter_var, self.cw_job_count_var
+        return self.gr_jobs, self.gr_view, self.gr_filter_var, self.gr_job_count_var
+    
+    def schedule_preview_filter(self, job_type):
+        """Re-filter a preview once typing in its filter box pauses"""
+        after_id = self._preview_filter_after.get(job_type)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+        self._preview_filter_after[job_type] = self.root.after(
+            PREVIEW_FILTER_DELAY_MS, self._apply_preview_filter, job_type)
+    
+    def _apply_preview_filter(self, job_type):
+        self._preview_filter_after[job_type] = None
+        _, view, filter_var, _ = self._preview_widgets(job_type)
+        view.set_filter(filter_var.get())
+        self.update_preview_count(job_type)
+    
+    def update_preview_count(self, job_type):
+        """Job count of a GR11/CW09 preview, and how many pass the filter"""
+        table, view, _, count_var = self._preview_widgets(job_type)
+        job_count = len(table)
+        text = "1 job detected" if job_count == 1 else f"{job_count} jobs detected"
+        if view.filter_text:
+            text += f" ({len(view)} shown)"
+        count_var.set(text)
+    
+    def load_excel_data(self, file_path):
+        """Load data from Excel file and display in treeview"""
+        try:
+            # Clear existing jobs
+            self.gr_jobs.clear()
+            self.gr_view.clear()
+            
+            # Read the sheet a chunk at a time (see workbooks.py) and show
+            # each chunk as soon as it is ready
+            columns = None
+            job_count = 0
+            invalid_count = 0
+            customer_refs = {}
+            for chunk in iter_sheet_chunks(file_path):
+                if columns is None:
+                    # Check the required columns exist (case insensitive)
+                    columns, missing_columns = find_columns(chunk, GR_REQUIRED_COLUMNS)
+                    
+                    if missing_columns:
+                        messagebox.showerror("Error", f"Missing required columns: {', '.join(missing_columns)}")
+                        self.gr_job_count_var.set("0 jobs detected")
+                        return
+                    
+                    # Log the column names found in the file
+                    app_log.debug("Excel columns found: %s", dict(columns))
+                    
+                    # Log a sample of the data
+                    if app_log.isEnabledFor(DEBUG):
+                        for i, (_, row) in enumerate(chunk.head(5).iterrows()):
+                            app_log.debug("Row %d: %s - %s", i, row[columns['PDI Centre']], row[columns['Reg No']])
+                
+                # Check every registration in the chunk in one go and flag the odd ones
+                reg_col = columns['Reg No']
+                regs = chunk[reg_col][chunk[reg_col].notna() & (chunk[reg_col].astype(str).str.strip() != "")]
+                valid_regs, _ = validate_registrations(regs.astype(str))
+                invalid_regs = regs[~valid_regs]
+                for reg in invalid_regs:
+                    app_log.debug("Unrecognised registration format: %s", reg)
+                invalid_count += len(invalid_regs)
+                
+                # Blank registrations dropped, GR11/GR15, dates and makes worked
+                # out a column at a time (see greenhous.py)
+                preview = gr_preview_frame(chunk, columns)
+                for ref, count in preview['customer_ref'].value_counts().items():
+                    customer_refs[ref] = customer_refs.get(ref, 0) + count
+                
+                # Add the chunk to the model; the view only draws what's in sight
+                self.gr_jobs.append(preview)
+                self.gr_view.rows_added()
+                job_count += len(preview)
+                self.update_preview_count("GR11")
+                self.gr_status_var.set(f"Loading... {job_count} jobs so far")
+                self.root.update_idletasks()
+            # Apply any filter or sort to the whole sheet, once
+            self.gr_view.refresh()
+            self.update_preview_count("GR11")
+            app_log.info("Customer refs: %s", customer_refs)
+                
+            status = f"Loaded {job_count} jobs from file"
+            if invalid_count:
+                status += f" ({invalid_count} with unrecognised registrations)"
+            self.gr_status_var.set(status)
+            self.gr_status_label.config(fg=self.success_color)
+            
+        except Exception as e:
+            self.gr_status_var.set(f"Error loading file: {str(e)}")
+            self.gr_status_label.config(fg=self.error_color)
+            messagebox.showerror("Error", f"Failed to load Excel file: {str(e)}")
+    
     def create_coming_soon_tab(self, job_type):
         """Create a 'Coming Soon' tab content for future job types"""
         frame = tk.Frame(self.tab_content, bg=self.card_bg)
@@ -2020,44 +1713,115 @@ class VehicleTransportApp:
         
     def calculate_delivery_date(self, collection_date):
         """Calculate delivery date as 3 business days from collection date."""
-        # Get UK holidays
-        uk_holidays = holidays.UK()
-        
-        # Start with collection date
-        current_date = collection_date
-        business_days = 0
-        
-        # Keep adding days until we have 3 business days
-        while business_days < 3:
-            current_date += timedelta(days=1)
-            # Skip weekends and holidays
-            if current_date.weekday() < 5 and current_date not in uk_holidays:
-                business_days += 1
-                
-        return current_date
+        return add_business_days(collection_date, AC01_DELIVERY_DAYS)
     
     def update_delivery_date(self, event=None):
         """Update delivery date when collection date changes"""
         collection = self.collection_date.get_date()
         delivery = self.calculate_delivery_date(collection)
         self.delivery_date.set_date(delivery)
+        self.schedule_live_parse("AC01")
     
     def update_job_count(self, event=None):
-        """Count the number of jobs in the text input and update the counter label"""
-        text = self.text_input.get("1.0", tk.END)
-        
-        # Count jobs by counting "FROM" sections
-        job_count = text.count("\nFROM\n")
-        
-        # Add one more if the text starts with "FROM"
-        if text.lstrip().startswith("FROM"):
-            job_count += 1
-        
-        # Update the counter
-        if job_count == 1:
-            self.job_count_var.set("1 job detected")
+        """Re-parse the AC01 text in the background once typing pauses"""
+        self.schedule_live_parse("AC01")
+
+    def create_live_preview(self, parent):
+        """Small job-by-job preview under a text box, filled by the live parse"""
+        preview_frame = tk.Frame(parent, bg=self.card_bg)
+        preview_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        preview_scroll = tk.Scrollbar(preview_frame)
+        preview_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        columns = ("job", "reg", "collection_postcode", "delivery_postcode", "missing")
+        tree = ttk.Treeview(preview_frame, columns=columns, show="headings", height=5,
+                            yscrollcommand=preview_scroll.set)
+        tree.heading("job", text="JOB")
+        tree.heading("reg", text="REG NUMBER")
+        tree.heading("collection_postcode", text="COLLECTION POSTCODE")
+        tree.heading("delivery_postcode", text="DELIVERY POSTCODE")
+        tree.heading("missing", text="MISSING")
+        tree.column("job", width=50)
+        tree.column("reg", width=100)
+        tree.column("collection_postcode", width=140)
+        tree.column("delivery_postcode", width=140)
+        tree.column("missing", width=300)
+        tree.tag_configure("missing", foreground=self.warning_color)
+        tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        preview_scroll.config(command=tree.yview)
+        return tree
+
+    def _live_parse_widgets(self, job_type):
+        """(text box, live parser, job count variable, preview) of a text tab"""
+        if job_type == "BC04":
+            return self.bc04_text_input, self.bc04_live_parser, self.bc04_job_count_var, self.bc04_preview_tree
+        return self.text_input, self.ac01_live_parser, self.job_count_var, self.ac01_preview_tree
+
+    def _live_parse_dates(self, job_type):
+        if job_type == "BC04":
+            collection, delivery = self.bc04_collection_date, self.bc04_delivery_date
         else:
-            self.job_count_var.set(f"{job_count} jobs detected")
+            collection, delivery = self.collection_date, self.delivery_date
+        return collection.get_date().strftime("%d/%m/%Y"), delivery.get_date().strftime("%d/%m/%Y")
+
+    def schedule_live_parse(self, job_type):
+        """(Re)start the quiet-time timer for a text tab's background parse"""
+        after_id = self._live_parse_after.get(job_type)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+        self._live_parse_after[job_type] = self.root.after(LIVE_PARSE_DELAY_MS, self._start_live_parse, job_type)
+
+    def _start_live_parse(self, job_type):
+        self._live_parse_after[job_type] = None
+        text_input, live_parser, _, _ = self._live_parse_widgets(job_type)
+        try:
+            collection_date, delivery_date = self._live_parse_dates(job_type)
+        except Exception as e:
+            app_log.debug("Live parse skipped, no dates: %s", e)
+            return
+        live_parser.submit(text_input.get("1.0", tk.END), collection_date, delivery_date)
+        if job_type not in self._live_parse_polling:
+            self._live_parse_polling.add(job_type)
+            self._poll_live_parse(job_type)
+
+    def _poll_live_parse(self, job_type):
+        _, live_parser, _, _ = self._live_parse_widgets(job_type)
+        if live_parser.busy:
+            self.root.after(LIVE_PARSE_POLL_MS, self._poll_live_parse, job_type)
+            return
+        self._live_parse_polling.discard(job_type)
+        self.show_live_parse(job_type, live_parser.latest())
+
+    def show_live_parse(self, job_type, live):
+        """Show a finished live parse in the tab's job count and preview"""
+        if live is None:
+            return
+        _, _, job_count_var, tree = self._live_parse_widgets(job_type)
+        job_count = len(live.jobs)
+        summary = "1 job detected" if job_count == 1 else f"{job_count} jobs detected"
+        incomplete = sum(1 for preview in live.previews if preview.missing)
+        if incomplete:
+            summary += f", {incomplete} with missing fields"
+        if live.quarantined:
+            summary += f", {len(live.quarantined)} quarantined"
+        job_count_var.set(summary)
+
+        # Rows are keyed by job number, so after a small edit only the rows
+        # that changed are touched
+        shown = tree.get_children()
+        for preview in live.previews:
+            iid = str(preview.number)
+            values = (preview.number, preview.reg, preview.collection_postcode, preview.delivery_postcode,
+                      ", ".join(preview.missing))
+            tags = ("missing",) if preview.missing else ()
+            if preview.number <= len(shown):
+                if tuple(str(value) for value in tree.item(iid, "values")) != tuple(str(value) for value in values):
+                    tree.item(iid, values=values, tags=tags)
+            else:
+                tree.insert("", tk.END, iid=iid, values=values, tags=tags)
+        if len(shown) > len(live.previews):
+            tree.delete(*shown[len(live.previews):])
     
     def process_jobs(self):
         try:
@@ -2073,15 +1837,22 @@ class VehicleTransportApp:
             collection_date = self.collection_date.get_date().strftime("%d/%m/%Y")
             delivery_date = self.delivery_date.get_date().strftime("%d/%m/%Y")
             
-            # Parse the jobs
-            parser = JobParser(collection_date, delivery_date)
-            jobs = parser.parse_jobs(text)
-
-            # Debug: Log each job's REG NUMBER
-            for i, job in enumerate(jobs, 1):
-                reg_val = job.get('REG NUMBER')
-                print(f"Job {i} REG NUMBER: '{reg_val}'")
-                log_debug(f"Job {i} REG NUMBER: '{reg_val}'")
+            # Use the live parse if it is of this exact text and dates,
+            # otherwise parse now. Large pastes are spread over every core,
+            # small ones stay serial.
+            # Jobs over the parser's size/time limits are left out and logged.
+            live = self.ac01_live_parser.result_for(text, collection_date, delivery_date)
+            if live is not None:
+                jobs, quarantined = live
+            else:
+                parser = JobParser(collection_date, delivery_date, cache=PARSE_CACHE)
+                quarantined = []
+                jobs = list(parser.iter_jobs(text, workers=None, quarantine=quarantined))
+            if app_log.isEnabledFor(DEBUG):
+                for i, job in enumerate(jobs, 1):
+                    app_log.debug("Job %d REG NUMBER: %r", i, job.get('REG NUMBER'))
+            log_quarantined(self.current_tab, quarantined)
+            app_log.debug("Parse cache: %s", PARSE_CACHE.stats())
 
             if not jobs:
                 self.status_var.set("No valid jobs found in the input text")
@@ -2133,15 +1904,19 @@ class VehicleTransportApp:
                             price = float(price_str)
                             batch_total += price
                         except (ValueError, TypeError):
-                            log_debug(f"Could not parse price: {job.get('PRICE', 'N/A')}")
+                            app_log.warning("Could not parse price: %s", job.get('PRICE', 'N/A'))
                 
                 # Update the total price if this is AC01
                 if job_type == "AC01":
                     self.total_ac01_price += batch_total
                     self.ac01_price_var.set(f"Total Price: £{self.total_ac01_price:.2f}")
                 
-                self.status_var.set(f"Successfully processed {len(jobs)} jobs")
-                self.status_label.config(fg=self.success_color)
+                if quarantined:
+                    self.status_var.set(f"Processed {len(jobs)} jobs, {len(quarantined)} quarantined (see debug log)")
+                    self.status_label.config(fg=self.warning_color)
+                else:
+                    self.status_var.set(f"Successfully processed {len(jobs)} jobs")
+                    self.status_label.config(fg=self.success_color)
                 
                 # Include price in success message
                 if batch_total > 0:
@@ -2159,395 +1934,108 @@ class VehicleTransportApp:
             self.status_label.config(fg=self.error_color)
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-    def save_to_csv(self, jobs, filename, job_type):
+    def jobs_output_path(self, job_type, filename):
+        """Where save_to_csv writes filename: jobs/<job type>/ in the
+        workspace root, one level up from this script."""
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        workspace_root = os.path.dirname(current_dir)
+        return os.path.join(workspace_root, 'jobs', job_type, filename)
+
+    def save_to_csv(self, jobs, filename, job_type, xlsx=False, by_ref=False, shard=False,
+                    columnar_format=COLUMNAR_FORMAT):
+        """Save jobs to jobs/<job type>/filename, with an Excel workbook of
+        them beside it if xlsx and a Parquet/Arrow copy in columnar_format
+        ('' for none). With shard the CSV is split into files the carrier
+        portal accepts, plus a manifest (see sharded_export.py). by_ref
+        gives each customer ref its own workbook sheet and shards.
+
+        Returns the exports.ExportResult, None if there were no jobs."""
         if not jobs:
-            return
+            return None
 
         try:
-            # Clear debug log before saving
-            log_debug("\n--- START SAVING JOBS TO CSV ---")
-            
-            # Get the current script directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            log_debug(f"Current directory: {current_dir}")
-            
-            # Go up one level to get the workspace root directory
-            workspace_root = os.path.dirname(current_dir)
-            log_debug(f"Workspace root: {workspace_root}")
-            
-            # Create main 'jobs' directory if it doesn't exist
-            output_dir = os.path.join(workspace_root, 'jobs')
-            os.makedirs(output_dir, exist_ok=True)
-            log_debug(f"Main jobs directory: {output_dir}")
-            
-            # Create job type specific directory if it doesn't exist
-            job_type_dir = os.path.join(output_dir, job_type)
-            os.makedirs(job_type_dir, exist_ok=True)
-            log_debug(f"Job type directory: {job_type_dir}")
-            
-            # Full path for the output file
-            output_path = os.path.join(job_type_dir, filename)
-            log_debug(f"Output file path: {output_path}")
-            
-            # Debug: Count original job types
-            gr11_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR11')
-            gr15_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR15')
-            log_debug(f"Job counts before saving - GR11: {gr11_count}, GR15: {gr15_count}")
-            
-            # Log all customer references before saving
-            log_debug("Customer references before saving:")
-            for i, job in enumerate(jobs):
-                log_debug(f"Job {i} - Reg: {job.get('REG NUMBER', '')}, Customer Ref: {job.get('CUSTOMER REF', '')}")
+            output_path = self.jobs_output_path(job_type, filename)
             
             # IMPORTANT: For Greenhous jobs NEVER override the customer reference
             # For other job types, set all jobs to the same customer ref
             if job_type != 'GR11' and not job_type.startswith('GR'):
-                # Set all jobs to the same customer ref for non-Greenhous jobs
                 for job in jobs:
                     job['CUSTOMER REF'] = job_type
             
-            # Debug: Check final job types
-            gr11_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR11')
-            gr15_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR15')
-            log_debug(f"After customer ref setup - GR11: {gr11_count}, GR15: {gr15_count}")
-            
-            # Check if the output file already exists
-            if os.path.exists(output_path):
-                log_debug(f"Warning: Output file already exists, will try to overwrite: {output_path}")
-                # Check if we can write to it
-                try:
-                    with open(output_path, 'a') as f:
-                        pass  # Just testing if we can open it for append
-                except PermissionError:
-                    log_debug(f"Permission denied when trying to open existing file: {output_path}")
-                    raise PermissionError(f"The file {filename} is open in another program. Please close it and try again.")
-            
-            # Test folder permissions
-            test_file = os.path.join(job_type_dir, "_test_write_permission.tmp")
-            try:
-                with open(test_file, 'w') as f:
-                    f.write("test")
-                os.remove(test_file)
-                log_debug(f"Write permission test successful on directory: {job_type_dir}")
-            except Exception as e:
-                log_debug(f"Failed write permission test: {str(e)}")
-                raise PermissionError(f"Cannot write to the output directory ({job_type_dir}). Please check your permissions.")
-            
-            # Try to save the file
-            log_debug(f"Attempting to write CSV to: {output_path}")
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'REG NUMBER',
-                    'VIN',
-                    'MAKE',
-                    'MODEL',
-                    'COLLECTION DATE',
-                    'YOUR REF NO',
-                    'COLLECTION ADDR1',
-                    'COLLECTION ADDR2',
-                    'COLLECTION ADDR3',
-                    'COLLECTION ADDR4',
-                    'COLLECTION POSTCODE',
-                    'COLLECTION CONTACT NAME',
-                    'COLLECTION PHONE',
-                    'DELIVERY DATE',
-                    'DELIVERY ADDR1',
-                    'DELIVERY ADDR2',
-                    'DELIVERY ADDR3',
-                    'DELIVERY ADDR4',
-                    'DELIVERY POSTCODE',
-                    'DELIVERY CONTACT NAME',
-                    'DELIVERY CONTACT PHONE',
-                    'SPECIAL INSTRUCTIONS',
-                    'PRICE',
-                    'CUSTOMER REF',
-                    'TRANSPORT TYPE'
-                ]
-
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                log_debug("Writing to CSV file:")
-                for job in jobs:
-                    # Create a new dict with only the fields we want
-                    row = {field: job.get(field, '') for field in fieldnames}
-                    # Debug: Check individual job customer reference
-                    log_debug(f"Writing job {row['REG NUMBER']} with customer ref: {row['CUSTOMER REF']}")
-                    writer.writerow(row)
-                
-            log_debug(f"CSV file saved to: {output_path}")
-            log_debug("--- END SAVING JOBS TO CSV ---")
+            ref_counts = {}
+            for job in jobs:
+                ref = job.get('CUSTOMER REF', '')
+                ref_counts[ref] = ref_counts.get(ref, 0) + 1
+            app_log.info("Saving %d jobs to %s, by customer ref: %s", len(jobs), output_path, ref_counts)
+            
+            # Written to a temporary file and renamed into place (see
+            # csv_export.py), with the Parquet/Arrow copy and the workbook
+            # beside it if asked for (see exports.py); a file open in
+            # another program or a folder we can't write to fails here with
+            # PermissionError
+            shards = ShardLimits(split_field='CUSTOMER REF' if by_ref else None) if shard else None
+            export = write_exports(output_path, job_rows(jobs), columnar_format=columnar_format, xlsx=xlsx,
+                                   sheet_per_ref=by_ref, shards=shards)
+            csv_path = output_path
+            if export.manifest_path:
+                # The manifest lists the shards; it is what the upload works from
+                output_path = export.manifest_path
+                filename = os.path.basename(output_path)
+                app_log.info("CSV shards saved, manifest: %s", output_path)
+            else:
+                app_log.info("CSV file saved to: %s", output_path)
+            if export.columnar_path:
+                app_log.info("Columnar copy saved to: %s", export.columnar_path)
+            if export.xlsx_path:
+                app_log.info("Excel copy saved to: %s", export.xlsx_path)
             
             self.status_var.set(f"File saved: {filename}")
             self.last_saved_file = output_path
             self.file_link_var.set(f"View file: {filename}")
             self.file_link_button.pack(side=tk.LEFT, padx=10)
-            print("File link button packed and visible")
-            messagebox.showinfo("Success", f"File saved successfully at:\n{output_path}")
+            message = "Files saved successfully:\n" + "\n".join(describe_export(csv_path, export))
+            messagebox.showinfo("Success", message)
+            return export
 
         except PermissionError as pe:
-            log_debug(f"Permission error during save: {str(pe)}")
+            app_log.error("Permission error during save: %s", pe)
             error_msg = f"Permission denied. Please ensure:\n1. No other program has the file open\n2. You have permission to write to the folder: {os.path.dirname(output_path) if 'output_path' in locals() else 'unknown'}\n3. Close Excel or any CSV viewers before trying again."
             messagebox.showerror("Permission Error", error_msg)
             raise pe
         except Exception as e:
-            log_debug(f"Error during save: {str(e)}")
+            app_log.error("Error during save: %s", e)
             messagebox.showerror("Error", f"An error occurred while saving the file:\n{str(e)}")
             raise e
     
     def process_gr_jobs(self):
         """Process the GR11/GR15 jobs from the Excel data"""
         try:
-            # Get all items from treeview
-            items = self.job_tree.get_children()
-            
-            if not items:
+            if not len(self.gr_jobs):
                 messagebox.showerror("Error", "No jobs to process. Please load an Excel file first.")
                 return
             
-            # Collect job data
-            jobs = []
-            for item in items:
-                try:
-                    values = self.job_tree.item(item, "values")
-                    
-                    # Check if we have the minimum required data
-                    if not values[0]:  # Reg No
-                        continue
-                    
-                    # Get the customer ref and PDI Centre values
-                    # values[1] is the customer ref from the preview (GR11 or GR15)
-                    customer_ref = values[1] if len(values) > 1 and values[1] else "GR11"
-                    
-                    # values[8] is the PDI Centre column
-                    pdi_centre = values[8] if len(values) > 8 and values[8] else ""
-                    
-                    # Debug: Print the PDI Centre value
-                    print(f"Processing job - Customer Ref: '{customer_ref}', PDI Centre: '{pdi_centre}'")
-                    log_debug(f"Processing job - Customer Ref: '{customer_ref}', PDI Centre: '{pdi_centre}'")
-                    
-                    # Collection address details
-                    collection_addr1 = ""
-                    collection_addr2 = ""
-                    collection_addr3 = ""
-                    collection_addr4 = ""
-                    collection_postcode = ""
-                    
-                    # Use the customer reference already set in the preview 
-                    # This ensures consistency with what's shown in the UI
-                    
-                    # Set address based on the customer reference
-                    if customer_ref == "GR15":
-                        collection_addr1 = "Greenhous Upper Heyford"
-                        collection_addr2 = "Heyford Park, Bicester"
-                        collection_addr3 = "Bicester"
-                        collection_addr4 = "UPPER HEYFORD"
-                        collection_postcode = "OX25 5HA"
-                        print(f"  => Using Upper Heyford address")
-                        log_debug(f"  => Using Upper Heyford address")
-                    else:
-                        # Default to High Ercall (GR11)
-                        collection_addr1 = "Greenhous High Ercall"
-                        collection_addr2 = "Greenhous Village Osbaston"
-                        collection_addr3 = "High Ercall"
-                        collection_addr4 = ""
-                        collection_postcode = "TF6 6RA"
-                        print(f"  => Using High Ercall address")
-                        log_debug(f"  => Using High Ercall address")
-                    
-                    # Create job dictionary
-                    job = {
-                        'REG NUMBER': values[0],
-                        'VIN': values[2] if len(values) > 2 and values[2] else "",  # Chassis
-                        'MAKE': values[3] if len(values) > 3 and values[3] else "TRANSIT",  # Make
-                        'MODEL': values[4] if len(values) > 4 and values[4] else "VAN",  # Model
-                        'COLOR': "",
-                        'COLLECTION DATE': values[5] if len(values) > 5 and values[5] else datetime.now().strftime("%d/%m/%Y"),  # Collection date
-                        'YOUR REF NO': values[0],  # Use reg number as reference
-                        'COLLECTION ADDR1': collection_addr1,
-                        'COLLECTION ADDR2': collection_addr2,
-                        'COLLECTION ADDR3': collection_addr3,
-                        'COLLECTION ADDR4': collection_addr4,
-                        'COLLECTION POSTCODE': collection_postcode,
-                        'COLLECTION CONTACT NAME': "",
-                        'COLLECTION PHONE': "",
-                        'DELIVERY DATE': values[5] if len(values) > 5 and values[5] else datetime.now().strftime("%d/%m/%Y"),  # Same as collection date
-                        'DELIVERY ADDR1': "",
-                        'DELIVERY ADDR2': "",
-                        'DELIVERY ADDR3': "",
-                        'DELIVERY ADDR4': "",
-                        'DELIVERY POSTCODE': "",
-                        'DELIVERY CONTACT NAME': "",
-                        'DELIVERY CONTACT PHONE': "",
-                        'SPECIAL INSTRUCTIONS': f"VIN: {values[2] if len(values) > 2 and values[2] else 'Unknown'}",
-                        'PRICE': "",
-                        'CUSTOMER REF': customer_ref,
-                        'TRANSPORT TYPE': ""
-                    }
-                    
-                    # Parse delivery address
-                    if len(values) > 7 and values[7]:
-                        delivery_address = values[7]  # Correct index for delivery address
-                        
-                        # Pre-process common patterns that should be kept together
-                        # Examples: "FLEX E REN 84-90", "FLEX E RE WEST LON"
-                        patterns_to_fix = [
-                            (r'(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)[\s,]+(\d+[\-\d]*)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(WEST)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ST)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(UNIT)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(MARCH)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(IVATT)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(LANDGATI)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ASCOT)', r'\1 \2'),
-                            # New patterns to keep road numbers with road names
-                            (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:Road|Street|Avenue|Lane|Drive|Close|Way|ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY))', r'\1 \2'),
-                            # Handle specific cases like 84-90 BRADES ROAD
-                            (r'(\d+[\-\d]*)\s*,\s*(BRADES[\s]*ROAD)', r'\1 \2'),
-                            # More general pattern for any number + street pattern that got split
-                            (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:\s(?:Rd|St|Ave|Ln|Dr|Cl|RD|ST|AVE|LN|DR|CL)))', r'\1 \2')
-                        ]
-                        
-                        # Apply each pattern fix
-                        processed_address = delivery_address
-                        for pattern, replacement in patterns_to_fix:
-                            processed_address = re.sub(pattern, replacement, processed_address, flags=re.IGNORECASE)
-                        
-                        # Log any changes made during pre-processing
-                        if processed_address != delivery_address:
-                            log_debug(f"Pre-processed address: '{delivery_address}' -> '{processed_address}'")
-                            delivery_address = processed_address
-                        
-                        # Try to extract postcode from address (UK format)
-                        postcode_pattern = r'([A-Z]{1,2}[0-9][0-9A-Z]?\s*[0-9][A-Z]{2})'
-                        postcode_match = re.search(postcode_pattern, delivery_address, re.IGNORECASE)
-                        
-                        # Clean the postcode if found
-                        extracted_postcode = ""
-                        if postcode_match:
-                            extracted_postcode = postcode_match.group(1).upper().strip()
-                            # Clean up spacing in the postcode
-                            if len(extracted_postcode) > 4 and ' ' not in extracted_postcode:
-                                # Add space in the correct position for UK postcodes (before last 3 chars)
-                                extracted_postcode = extracted_postcode[:-3] + ' ' + extracted_postcode[-3:]
-                            job['DELIVERY POSTCODE'] = extracted_postcode
-                        
-                        # Remove the postcode from the address for cleaner parsing
-                        if extracted_postcode:
-                            clean_address = delivery_address.replace(postcode_match.group(0), "")
-                        else:
-                            clean_address = delivery_address
-                        
-                        # Enhanced address parsing to keep road numbers with street names
-                        # First split by commas
-                        address_parts = [part.strip() for part in clean_address.split(',') if part.strip()]
-                        
-                        # First pass: Check for patterns like "FLEX-E-RE 84-90" being split across parts
-                        # or combine prefix with following parts
-                        combined_parts = []
-                        i = 0
-                        while i < len(address_parts):
-                            current_part = address_parts[i]
-                            
-                            # Special patterns to check for
-                            flex_prefix_pattern = r'^(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)$'
-                            
-                            # Check if this part ends with a prefix that should be combined with the next part
-                            if i < len(address_parts) - 1 and re.match(flex_prefix_pattern, current_part, re.IGNORECASE):
-                                # Look ahead to see if we need to combine more parts (prefix + number + road name)
-                                if i < len(address_parts) - 2 and re.match(r'^\d+[\-\d]*$', address_parts[i+1]) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+2], re.IGNORECASE):
-                                    # We have a pattern like: [FLEX-E-RE], [84-90], [BRADES ROAD]
-                                    combined_parts.append(f"{current_part} {address_parts[i+1]} {address_parts[i+2]}")
-                                    i += 3  # Skip all three parts
-                                else:
-                                    # Just combine with next part
-                                    combined_parts.append(f"{current_part} {address_parts[i+1]}")
-                                    i += 2  # Skip both parts
-                            # Check for standalone number that should be combined with street name
-                            elif i < len(address_parts) - 1 and re.match(r'^\d+[\-\d]*$', current_part) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+1], re.IGNORECASE):
-                                # We have a pattern like: [84-90], [BRADES ROAD]
-                                combined_parts.append(f"{current_part} {address_parts[i+1]}")
-                                i += 2  # Skip both parts
-                            else:
-                                combined_parts.append(current_part)
-                                i += 1
-                        
-                        # Replace original parts with combined parts
-                        address_parts = combined_parts
-                        
-                        # Log the address parts after combining
-                        log_debug(f"Address parts after combining prefixes and road numbers: {address_parts}")
-                        
-                        # Initialize address fields
-                        addr1 = ""
-                        addr2 = ""
-                        addr3 = ""
-                        addr4 = ""
-                        
-                        # Process address parts based on their content and position
-                        if len(address_parts) > 0:
-                            addr1 = address_parts[0]  # First part is always ADDR1 (usually business name)
-                        
-                        if len(address_parts) > 1:
-                            # Check if the second part looks like a road/street with numbers
-                            road_pattern = r'^\d+[\-\d]*\s+[A-Za-z\s]+'  # Matches patterns like "84-90 BRADES ROAD"
-                            if len(address_parts) > 2 and (re.match(road_pattern, address_parts[1]) or 
-                                                          re.search(r'\b(Road|Street|Avenue|Lane|Drive|Close)\b', address_parts[1], re.IGNORECASE)):
-                                # This is a street address, keep it in ADDR2
-                                addr2 = address_parts[1]
-                                
-                                # The rest goes into ADDR3 and ADDR4
-                                if len(address_parts) > 3:
-                                    addr3 = address_parts[2]
-                                    addr4 = address_parts[3]
-                                elif len(address_parts) > 2:
-                                    addr3 = address_parts[2]
-                            else:
-                                # Standard processing
-                                if len(address_parts) > 2:
-                                    addr2 = address_parts[1]
-                                    addr3 = address_parts[2]
-                                    if len(address_parts) > 3:
-                                        addr4 = ' '.join(address_parts[3:])
-                                else:
-                                    addr2 = address_parts[1]
-                        
-                        # Special handling for when ADDR4 is empty but we have a town in ADDR3
-                        if not addr4 and addr3 and len(addr3.split()) <= 2:
-                            addr4 = addr3
-                            addr3 = ""
-                        
-                        # Set the address fields
-                        job['DELIVERY ADDR1'] = addr1
-                        job['DELIVERY ADDR2'] = addr2
-                        job['DELIVERY ADDR3'] = addr3
-                        job['DELIVERY ADDR4'] = addr4
-                    
-                    jobs.append(job)
-                except Exception as item_error:
-                    # Log individual item parsing errors but continue with others
-                    print(f"Error processing item: {str(item_error)}")
-                    continue
+            # Build every job from the model at once (see greenhous.gr_job_frame):
+            # collection address by customer ref, delivery address split into
+            # ADDR1-4 and postcode, each distinct address only once
+            job_frame = gr_job_frame(self.gr_jobs.frame, datetime.now().strftime("%d/%m/%Y"))
+            jobs = [JobRecord.from_values(values)
+                    for values in job_frame.itertuples(index=False, name=None)]
             
             if not jobs:
                 messagebox.showerror("Error", "No valid jobs to process.")
                 return
             
-            # Count jobs by type for reporting purposes
-            gr11_count = sum(1 for job in jobs if job['CUSTOMER REF'] == 'GR11')
-            gr15_count = sum(1 for job in jobs if job['CUSTOMER REF'] == 'GR15')
-            
             # Generate a single CSV file for all jobs
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"greenhous_jobs_{timestamp}.csv"
             
             # Save to the GR11 folder for consistency
-            self.save_to_csv(jobs, filename, 'GR11')
+            export = self.save_to_csv(jobs, filename, 'GR11', **self.export_save_options('GR11'))
             
             # Success message
             total_jobs = len(jobs)
             
-            self.gr_status_var.set(f"Loaded {job_count} jobs from file")
+            self.gr_status_var.set(f"Processed {total_jobs} jobs")
             self.gr_status_label.config(fg=self.success_color)
             
             # More detailed success message with counts of each job type
@@ -2563,1057 +2051,8 @@ class VehicleTransportApp:
             for ref, count in job_types.items():
                 message += f"- {count} {ref} jobs\n"
                 
-            message += f"\nAll jobs saved to: jobs/GR11/{filename}"
-                
-            messagebox.showinfo("Success", message)
-            
-        except Exception as e:
-            self.gr_status_var.set(f"Error occurred: {str(e)}")
-            self.gr_status_label.config(fg=self.error_color)
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            
-    def browse_excel_file(self):
-        """Open file dialog to select Excel file"""
-        filetypes = [("Excel files", "*.xlsx *.xls")]
-        file_path = filedialog.askopenfilename(filetypes=filetypes)
-        
-        if file_path:
-            self.selected_file_var.set(file_path)
-            self.load_excel_data(file_path)
-    
-    def load_excel_data(self, file_path):
-        """Load data from Excel file and display in treeview"""
-        try:
-            # Clear existing items
-            for item in self.job_tree.get_children():
-                self.job_tree.delete(item)
-            
-            # Load Excel file
-            df = pd.read_excel(file_path)
-            
-            # Check if required columns exist
-            required_columns = ['Reg No', 'PDI Centre', 'Model', 'Chassis', 'Delivery Due Date', 'Delivery Address']
-            
-            # Check column names (case insensitive)
-            actual_columns = list(df.columns)
-            found_columns = []
-            
-            for req_col in required_columns:
-                found = False
-                for act_col in actual_columns:
-                    if req_col.lower() == act_col.lower():
-                        found_columns.append(act_col)
-                        found = True
-                        break
-                if not found:
-                    found_columns.append(None)
-            
-            # Use the found column names or provide feedback if any are missing
-            missing_columns = [req_col for i, req_col in enumerate(required_columns) if found_columns[i] is None]
-            
-            if missing_columns:
-                messagebox.showerror("Error", f"Missing required columns: {', '.join(missing_columns)}")
-                self.gr_job_count_var.set("0 jobs detected")
-                return
-            
-            # Get the actual column names from the file
-            reg_col = found_columns[0]
-            pdi_col = found_columns[1]
-            model_col = found_columns[2]
-            chassis_col = found_columns[3]
-            date_col = found_columns[4]
-            address_col = found_columns[5]
-            
-            # Debug: Print found column names
-            print(f"Found columns:")
-            print(f"  Reg No: {reg_col}")
-            print(f"  PDI Centre: {pdi_col}")
-            print(f"  Model: {model_col}")
-            print(f"  Chassis: {chassis_col}")
-            print(f"  Delivery Due Date: {date_col}")
-            print(f"  Delivery Address: {address_col}")
-            
-            # Log to debug file
-            log_debug("Excel columns found:")
-            log_debug(f"  Reg No: {reg_col}")
-            log_debug(f"  PDI Centre: {pdi_col}")
-            log_debug(f"  Model: {model_col}")
-            log_debug(f"  Chassis: {chassis_col}")
-            log_debug(f"  Delivery Due Date: {date_col}")
-            log_debug(f"  Delivery Address: {address_col}")
-            log_debug("\nExcel data preview:")
-            
-            # Log a sample of the data
-            for i, (_, row) in enumerate(df.head(5).iterrows()):
-                log_debug(f"Row {i}: {row[pdi_col]} - {row[reg_col]}")
-                
-            # Add data to treeview
-            job_count = 0
-            for _, row in df.iterrows():
-                # Skip rows with empty registration numbers
-                if pd.isna(row[reg_col]) or str(row[reg_col]).strip() == "":
-                    continue
-                
-                # Format the date if it exists
-                delivery_date = ""
-                if not pd.isna(row[date_col]):
-                    if isinstance(row[date_col], str):
-                        delivery_date = row[date_col]
-                    else:
-                        try:
-                            delivery_date = row[date_col].strftime("%d/%m/%Y")
-                        except:
-                            delivery_date = str(row[date_col])
-                
-                # Process the data to match the CSV output format
-                pdi_centre = str(row[pdi_col]) if not pd.isna(row[pdi_col]) else ""
-                
-                # Debug: Print PDI Centre values
-                print(f"PDI Centre: '{pdi_centre}'")
-                log_debug(f"PDI Centre detected: '{pdi_centre}' for reg {row[reg_col]}")
-                
-                # Determine customer reference - improved detection logic
-                customer_ref = "GR11"  # Default
-                
-                # First look for "Upper" Heyford in the PDI Centre column
-                if "UPPER" in pdi_centre.upper():
-                    customer_ref = "GR15"
-                    log_debug(f"  -> Detected as GR15 (UPPER keyword)")
-                # Then check for Heyford
-                elif "HEYFORD" in pdi_centre.upper():
-                    customer_ref = "GR15"
-                    log_debug(f"  -> Detected as GR15 (HEYFORD keyword)")
-                else:
-                    log_debug(f"  -> Detected as GR11 (default)")
-                
-                # Set collection address based on customer_ref
-                if customer_ref == "GR15":
-                    collection_addr = "Greenhous Upper Heyford, Heyford Park, Bicester, OX25 5HA"
-                else:
-                    collection_addr = "Greenhous High Ercall, Greenhous Village Osbaston, TF6 6RA"
-                
-                # Try to extract Make from Model
-                make = ""
-                model = str(row[model_col]) if not pd.isna(row[model_col]) else ""
-                
-                if model:
-                    # Common car makes to check
-                    makes = ["FORD", "VAUXHALL", "VOLKSWAGEN", "VW", "BMW", "MERCEDES", "AUDI", 
-                            "TOYOTA", "HONDA", "NISSAN", "HYUNDAI", "KIA", "SKODA", "SEAT", 
-                            "RENAULT", "PEUGEOT", "CITROEN", "FIAT", "MAZDA", "VOLVO"]
-                    
-                    for m in makes:
-                        if m.lower() in model.lower():
-                            make = m
-                            # Remove make from model if it's at the beginning
-                            if model.lower().startswith(m.lower()):
-                                model = model[len(m):].strip()
-                            break
-                
-                # Get delivery address
-                delivery_addr = str(row[address_col]) if not pd.isna(row[address_col]) else ""
-                
-                # Add to treeview with the processed data
-                self.job_tree.insert("", tk.END, values=(
-                    str(row[reg_col]),
-                    customer_ref,
-                    str(row[chassis_col]) if not pd.isna(row[chassis_col]) else "",
-                    make,
-                    model,
-                    delivery_date,
-                    collection_addr,
-                    delivery_addr,
-                    pdi_centre
-                ))
-                job_count += 1
-            
-            # Update job count
-            if job_count == 1:
-                self.gr_job_count_var.set("1 job detected")
-            else:
-                self.gr_job_count_var.set(f"{job_count} jobs detected")
-                
-            self.gr_status_var.set(f"Loaded {job_count} jobs from file")
-            self.gr_status_label.config(fg=self.success_color)
-            
-        except Exception as e:
-            self.gr_status_var.set(f"Error loading file: {str(e)}")
-            self.gr_status_label.config(fg=self.error_color)
-            messagebox.showerror("Error", f"Failed to load Excel file: {str(e)}")
-    
-    def process_gr_jobs(self):
-        """Process the GR11/GR15 jobs from the Excel data"""
-        try:
-            # Get all items from treeview
-            items = self.job_tree.get_children()
-            
-            if not items:
-                messagebox.showerror("Error", "No jobs to process. Please load an Excel file first.")
-                return
-            
-            # Collect job data
-            jobs = []
-            for item in items:
-                try:
-                    values = self.job_tree.item(item, "values")
-                    
-                    # Check if we have the minimum required data
-                    if not values[0]:  # Reg No
-                        continue
-                    
-                    # Get the customer ref and PDI Centre values
-                    # values[1] is the customer ref from the preview (GR11 or GR15)
-                    customer_ref = values[1] if len(values) > 1 and values[1] else "GR11"
-                    
-                    # values[8] is the PDI Centre column
-                    pdi_centre = values[8] if len(values) > 8 and values[8] else ""
-                    
-                    # Debug: Print the PDI Centre value
-                    print(f"Processing job - Customer Ref: '{customer_ref}', PDI Centre: '{pdi_centre}'")
-                    log_debug(f"Processing job - Customer Ref: '{customer_ref}', PDI Centre: '{pdi_centre}'")
-                    
-                    # Collection address details
-                    collection_addr1 = ""
-                    collection_addr2 = ""
-                    collection_addr3 = ""
-                    collection_addr4 = ""
-                    collection_postcode = ""
-                    
-                    # Use the customer reference already set in the preview 
-                    # This ensures consistency with what's shown in the UI
-                    
-                    # Set address based on the customer reference
-                    if customer_ref == "GR15":
-                        collection_addr1 = "Greenhous Upper Heyford"
-                        collection_addr2 = "Heyford Park, Bicester"
-                        collection_addr3 = "Bicester"
-                        collection_addr4 = "UPPER HEYFORD"
-                        collection_postcode = "OX25 5HA"
-                        print(f"  => Using Upper Heyford address")
-                        log_debug(f"  => Using Upper Heyford address")
-                    else:
-                        # Default to High Ercall (GR11)
-                        collection_addr1 = "Greenhous High Ercall"
-                        collection_addr2 = "Greenhous Village Osbaston"
-                        collection_addr3 = "High Ercall"
-                        collection_addr4 = ""
-                        collection_postcode = "TF6 6RA"
-                        print(f"  => Using High Ercall address")
-                        log_debug(f"  => Using High Ercall address")
-                    
-                    # Create job dictionary
-                    job = {
-                        'REG NUMBER': values[0],
-                        'VIN': values[2] if len(values) > 2 and values[2] else "",  # Chassis
-                        'MAKE': values[3] if len(values) > 3 and values[3] else "TRANSIT",  # Make
-                        'MODEL': values[4] if len(values) > 4 and values[4] else "VAN",  # Model
-                        'COLOR': "",
-                        'COLLECTION DATE': values[5] if len(values) > 5 and values[5] else datetime.now().strftime("%d/%m/%Y"),  # Collection date
-                        'YOUR REF NO': values[0],  # Use reg number as reference
-                        'COLLECTION ADDR1': collection_addr1,
-                        'COLLECTION ADDR2': collection_addr2,
-                        'COLLECTION ADDR3': collection_addr3,
-                        'COLLECTION ADDR4': collection_addr4,
-                        'COLLECTION POSTCODE': collection_postcode,
-                        'COLLECTION CONTACT NAME': "",
-                        'COLLECTION PHONE': "",
-                        'DELIVERY DATE': values[5] if len(values) > 5 and values[5] else datetime.now().strftime("%d/%m/%Y"),  # Same as collection date
-                        'DELIVERY ADDR1': "",
-                        'DELIVERY ADDR2': "",
-                        'DELIVERY ADDR3': "",
-                        'DELIVERY ADDR4': "",
-                        'DELIVERY POSTCODE': "",
-                        'DELIVERY CONTACT NAME': "",
-                        'DELIVERY CONTACT PHONE': "",
-                        'SPECIAL INSTRUCTIONS': f"VIN: {values[2] if len(values) > 2 and values[2] else 'Unknown'}",
-                        'PRICE': "",
-                        'CUSTOMER REF': customer_ref,
-                        'TRANSPORT TYPE': ""
-                    }
-                    
-                    # Parse delivery address
-                    if len(values) > 7 and values[7]:
-                        delivery_address = values[7]  # Correct index for delivery address
-                        
-                        # Pre-process common patterns that should be kept together
-                        # Examples: "FLEX E REN 84-90", "FLEX E RE WEST LON"
-                        patterns_to_fix = [
-                            (r'(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)[\s,]+(\d+[\-\d]*)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(WEST)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ST)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(UNIT)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(MARCH)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(IVATT)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(LANDGATI)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ASCOT)', r'\1 \2'),
-                            # New patterns to keep road numbers with road names
-                            (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:Road|Street|Avenue|Lane|Drive|Close|Way|ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY))', r'\1 \2'),
-                            # Handle specific cases like 84-90 BRADES ROAD
-                            (r'(\d+[\-\d]*)\s*,\s*(BRADES[\s]*ROAD)', r'\1 \2'),
-                            # More general pattern for any number + street pattern that got split
-                            (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:\s(?:Rd|St|Ave|Ln|Dr|Cl|RD|ST|AVE|LN|DR|CL)))', r'\1 \2')
-                        ]
-                        
-                        # Apply each pattern fix
-                        processed_address = delivery_address
-                        for pattern, replacement in patterns_to_fix:
-                            processed_address = re.sub(pattern, replacement, processed_address, flags=re.IGNORECASE)
-                        
-                        # Log any changes made during pre-processing
-                        if processed_address != delivery_address:
-                            log_debug(f"Pre-processed address: '{delivery_address}' -> '{processed_address}'")
-                            delivery_address = processed_address
-                        
-                        # Try to extract postcode from address (UK format)
-                        postcode_pattern = r'([A-Z]{1,2}[0-9][0-9A-Z]?\s*[0-9][A-Z]{2})'
-                        postcode_match = re.search(postcode_pattern, delivery_address, re.IGNORECASE)
-                        
-                        # Clean the postcode if found
-                        extracted_postcode = ""
-                        if postcode_match:
-                            extracted_postcode = postcode_match.group(1).upper().strip()
-                            # Clean up spacing in the postcode
-                            if len(extracted_postcode) > 4 and ' ' not in extracted_postcode:
-                                # Add space in the correct position for UK postcodes (before last 3 chars)
-                                extracted_postcode = extracted_postcode[:-3] + ' ' + extracted_postcode[-3:]
-                            job['DELIVERY POSTCODE'] = extracted_postcode
-                        
-                        # Remove the postcode from the address for cleaner parsing
-                        if extracted_postcode:
-                            clean_address = delivery_address.replace(postcode_match.group(0), "")
-                        else:
-                            clean_address = delivery_address
-                        
-                        # Enhanced address parsing to keep road numbers with street names
-                        # First split by commas
-                        address_parts = [part.strip() for part in clean_address.split(',') if part.strip()]
-                        
-                        # First pass: Check for patterns like "FLEX-E-RE 84-90" being split across parts
-                        # or combine prefix with following parts
-                        combined_parts = []
-                        i = 0
-                        while i < len(address_parts):
-                            current_part = address_parts[i]
-                            
-                            # Special patterns to check for
-                            flex_prefix_pattern = r'^(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)$'
-                            
-                            # Check if this part ends with a prefix that should be combined with the next part
-                            if i < len(address_parts) - 1 and re.match(flex_prefix_pattern, current_part, re.IGNORECASE):
-                                # Look ahead to see if we need to combine more parts (prefix + number + road name)
-                                if i < len(address_parts) - 2 and re.match(r'^\d+[\-\d]*$', address_parts[i+1]) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+2], re.IGNORECASE):
-                                    # We have a pattern like: [FLEX-E-RE], [84-90], [BRADES ROAD]
-                                    combined_parts.append(f"{current_part} {address_parts[i+1]} {address_parts[i+2]}")
-                                    i += 3  # Skip all three parts
-                                else:
-                                    # Just combine with next part
-                                    combined_parts.append(f"{current_part} {address_parts[i+1]}")
-                                    i += 2  # Skip both parts
-                            # Check for standalone number that should be combined with street name
-                            elif i < len(address_parts) - 1 and re.match(r'^\d+[\-\d]*$', current_part) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+1], re.IGNORECASE):
-                                # We have a pattern like: [84-90], [BRADES ROAD]
-                                combined_parts.append(f"{current_part} {address_parts[i+1]}")
-                                i += 2  # Skip both parts
-                            else:
-                                combined_parts.append(current_part)
-                                i += 1
-                        
-                        # Replace original parts with combined parts
-                        address_parts = combined_parts
-                        
-                        # Log the address parts after combining
-                        log_debug(f"Address parts after combining prefixes and road numbers: {address_parts}")
-                        
-                        # Initialize address fields
-                        addr1 = ""
-                        addr2 = ""
-                        addr3 = ""
-                        addr4 = ""
-                        
-                        # Process address parts based on their content and position
-                        if len(address_parts) > 0:
-                            addr1 = address_parts[0]  # First part is always ADDR1 (usually business name)
-                        
-                        if len(address_parts) > 1:
-                            # Check if the second part looks like a road/street with numbers
-                            road_pattern = r'^\d+[\-\d]*\s+[A-Za-z\s]+'  # Matches patterns like "84-90 BRADES ROAD"
-                            if len(address_parts) > 2 and (re.match(road_pattern, address_parts[1]) or 
-                                                          re.search(r'\b(Road|Street|Avenue|Lane|Drive|Close)\b', address_parts[1], re.IGNORECASE)):
-                                # This is a street address, keep it in ADDR2
-                                addr2 = address_parts[1]
-                                
-                                # The rest goes into ADDR3 and ADDR4
-                                if len(address_parts) > 3:
-                                    addr3 = address_parts[2]
-                                    addr4 = address_parts[3]
-                                elif len(address_parts) > 2:
-                                    addr3 = address_parts[2]
-                            else:
-                                # Standard processing
-                                if len(address_parts) > 2:
-                                    addr2 = address_parts[1]
-                                    addr3 = address_parts[2]
-                                    if len(address_parts) > 3:
-                                        addr4 = ' '.join(address_parts[3:])
-                                else:
-                                    addr2 = address_parts[1]
-                        
-                        # Special handling for when ADDR4 is empty but we have a town in ADDR3
-                        if not addr4 and addr3 and len(addr3.split()) <= 2:
-                            addr4 = addr3
-                            addr3 = ""
-                        
-                        # Set the address fields
-                        job['DELIVERY ADDR1'] = addr1
-                        job['DELIVERY ADDR2'] = addr2
-                        job['DELIVERY ADDR3'] = addr3
-                        job['DELIVERY ADDR4'] = addr4
-                    
-                    jobs.append(job)
-                except Exception as item_error:
-                    # Log individual item parsing errors but continue with others
-                    print(f"Error processing item: {str(item_error)}")
-                    continue
-            
-            if not jobs:
-                messagebox.showerror("Error", "No valid jobs to process.")
-                return
-            
-            # Count jobs by type for reporting purposes
-            gr11_count = sum(1 for job in jobs if job['CUSTOMER REF'] == 'GR11')
-            gr15_count = sum(1 for job in jobs if job['CUSTOMER REF'] == 'GR15')
-            
-            # Generate a single CSV file for all jobs
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"greenhous_jobs_{timestamp}.csv"
-            
-            # Save to the GR11 folder for consistency
-            self.save_to_csv(jobs, filename, 'GR11')
-            
-            # Success message
-            total_jobs = len(jobs)
-            
-            self.gr_status_var.set(f"Loaded {job_count} jobs from file")
-            self.gr_status_label.config(fg=self.success_color)
-            
-            # More detailed success message with counts of each job type
-            message = f"Processed {total_jobs} Greenhous jobs in total:\n"
-            
-            # Count by job type
-            job_types = {}
-            for job in jobs:
-                customer_ref = job.get('CUSTOMER REF', 'Unknown')
-                job_types[customer_ref] = job_types.get(customer_ref, 0) + 1
-            
-            # Add counts to message
-            for ref, count in job_types.items():
-                message += f"- {count} {ref} jobs\n"
-                
-            message += f"\nAll jobs saved to: jobs/GR11/{filename}"
-                
-            messagebox.showinfo("Success", message)
-            
-        except Exception as e:
-            self.gr_status_var.set(f"Error occurred: {str(e)}")
-            self.gr_status_label.config(fg=self.error_color)
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-            
-    def create_coming_soon_tab(self, job_type):
-        """Create a 'Coming Soon' tab content for future job types"""
-        frame = tk.Frame(self.tab_content, bg=self.card_bg)
-        
-        # Center the coming soon content
-        coming_soon_frame = tk.Frame(frame, bg=self.card_bg)
-        coming_soon_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-        
-        # Icon for coming soon
-        icon_canvas = tk.Canvas(coming_soon_frame, width=80, height=80, 
-                             bg=self.card_bg, highlightthickness=0)
-        icon_canvas.pack(pady=20)
-        
-        # Draw clock or construction icon
-        icon_canvas.create_oval(10, 10, 70, 70, fill="#F5F7FA", outline=self.primary_color, width=2)
-        # Clock hands
-        icon_canvas.create_line(40, 40, 40, 20, fill=self.primary_color, width=2)
-        icon_canvas.create_line(40, 40, 55, 50, fill=self.primary_color, width=2)
-        
-        # Coming soon text
-        title = tk.Label(
-            coming_soon_frame,
-            text=f"{job_type} Transport Processing",
-            font=self.header_font,
-            fg=self.text_color,
-            bg=self.card_bg
-        )
-        title.pack(pady=10)
-        
-        message = tk.Label(
-            coming_soon_frame,
-            text="Coming Soon",
-            font=('Segoe UI', 16, 'bold'),
-            fg=self.primary_color,
-            bg=self.card_bg
-        )
-        message.pack(pady=20)
-        
-        description = tk.Label(
-            coming_soon_frame,
-            text=f"Support for {job_type} transport jobs is currently under development.\nCheck back soon for updates.",
-            font=self.normal_font,
-            fg=self.light_text,
-            bg=self.card_bg,
-            justify=tk.CENTER
-        )
-        description.pack()
-        
-        return frame
-        
-    def calculate_delivery_date(self, collection_date):
-        """Calculate delivery date as 3 business days from collection date."""
-        # Get UK holidays
-        uk_holidays = holidays.UK()
-        
-        # Start with collection date
-        current_date = collection_date
-        business_days = 0
-        
-        # Keep adding days until we have 3 business days
-        while business_days < 3:
-            current_date += timedelta(days=1)
-            # Skip weekends and holidays
-            if current_date.weekday() < 5 and current_date not in uk_holidays:
-                business_days += 1
-                
-        return current_date
-    
-    def update_delivery_date(self, event=None):
-        """Update delivery date when collection date changes"""
-        collection = self.collection_date.get_date()
-        delivery = self.calculate_delivery_date(collection)
-        self.delivery_date.set_date(delivery)
-    
-    def update_job_count(self, event=None):
-        """Count the number of jobs in the text input and update the counter label"""
-        text = self.text_input.get("1.0", tk.END)
-        
-        # Count jobs by counting "FROM" sections
-        job_count = text.count("\nFROM\n")
-        
-        # Add one more if the text starts with "FROM"
-        if text.lstrip().startswith("FROM"):
-            job_count += 1
-        
-        # Update the counter
-        if job_count == 1:
-            self.job_count_var.set("1 job detected")
-        else:
-            self.job_count_var.set(f"{job_count} jobs detected")
-    
-    def process_jobs(self):
-        try:
-            # Update status
-            self.status_var.set("Processing jobs...")
-            self.status_label.config(fg=self.primary_color)
-            self.root.update_idletasks()
-            
-            # Get the input text
-            text = self.text_input.get("1.0", tk.END)
-            
-            # Get dates directly from the date pickers
-            collection_date = self.collection_date.get_date().strftime("%d/%m/%Y")
-            delivery_date = self.delivery_date.get_date().strftime("%d/%m/%Y")
-            
-            # Parse the jobs
-            parser = JobParser(collection_date, delivery_date)
-            jobs = parser.parse_jobs(text)
-
-            # Debug: Log each job's REG NUMBER
-            for i, job in enumerate(jobs, 1):
-                reg_val = job.get('REG NUMBER')
-                print(f"Job {i} REG NUMBER: '{reg_val}'")
-                log_debug(f"Job {i} REG NUMBER: '{reg_val}'")
-
-            if not jobs:
-                self.status_var.set("No valid jobs found in the input text")
-                self.status_label.config(fg=self.warning_color)
-                messagebox.showerror("Error", "No valid jobs found in the input text")
-                return
-
-            # Count jobs and registrations (robust)
-            job_count = len(jobs)
-            reg_count = sum(1 for job in jobs if isinstance(job.get('REG NUMBER'), str) and job.get('REG NUMBER').strip())
-
-            # Update the job count label to show both
-            if job_count == 1:
-                self.job_count_var.set(f"1 job detected, {reg_count} registrations detected")
-            else:
-                self.job_count_var.set(f"{job_count} jobs detected, {reg_count} registrations detected")
-            
-            # For AC01 jobs, validate registrations
-            if self.current_tab == "AC01":
-                missing_regs = []
-                for i, job in enumerate(jobs, 1):
-                    if not job.get('REG NUMBER') or job['REG NUMBER'].strip() == '':
-                        missing_regs.append(f"Job #{i}")
-                
-                if missing_regs:
-                    missing_msg = f"The following jobs are missing registration numbers:\n{', '.join(missing_regs)}"
-                    self.status_var.set("Warning: Some jobs missing registration numbers")
-                    self.status_label.config(fg=self.warning_color)
-                    messagebox.showwarning("Missing Registrations", missing_msg)
-            
-            # Get the current job type (tab)
-            job_type = self.current_tab
-            
-            # Generate CSV file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{job_type.lower()}_jobs_{timestamp}.csv"
-            
-            try:
-                self.save_to_csv(jobs, filename, job_type)
-                
-                # Calculate total price for this batch of jobs
-                batch_total = 0.0
-                for job in jobs:
-                    if 'PRICE' in job and job['PRICE']:
-                        try:
-                            # Handle various price formats
-                            price_str = job['PRICE'].strip()
-                            price_str = price_str.replace('£', '').replace(',', '')
-                            price = float(price_str)
-                            batch_total += price
-                        except (ValueError, TypeError):
-                            log_debug(f"Could not parse price: {job.get('PRICE', 'N/A')}")
-                
-                # Update the total price if this is AC01
-                if job_type == "AC01":
-                    self.total_ac01_price += batch_total
-                    self.ac01_price_var.set(f"Total Price: £{self.total_ac01_price:.2f}")
-                
-                self.status_var.set(f"Successfully processed {len(jobs)} jobs")
-                self.status_label.config(fg=self.success_color)
-                
-                # Include price in success message
-                if batch_total > 0:
-                    messagebox.showinfo("Success", f"Processed {len(jobs)} {job_type} jobs\nBatch Total: £{batch_total:.2f}\nRunning Total: £{self.total_ac01_price:.2f}")
-                else:
-                    messagebox.showinfo("Success", f"Processed {len(jobs)} {job_type} jobs")
-                
-            except Exception as e:
-                self.status_var.set("Error: Failed to save CSV file")
-                self.status_label.config(fg=self.error_color)
-                messagebox.showerror("Error", f"Failed to save CSV file: {str(e)}")
-            
-        except Exception as e:
-            self.status_var.set("Error occurred during processing")
-            self.status_label.config(fg=self.error_color)
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
-
-    def save_to_csv(self, jobs, filename, job_type):
-        if not jobs:
-            return
-
-        try:
-            # Clear debug log before saving
-            log_debug("\n--- START SAVING JOBS TO CSV ---")
-            
-            # Get the current script directory
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            log_debug(f"Current directory: {current_dir}")
-            
-            # Go up one level to get the workspace root directory
-            workspace_root = os.path.dirname(current_dir)
-            log_debug(f"Workspace root: {workspace_root}")
-            
-            # Create main 'jobs' directory if it doesn't exist
-            output_dir = os.path.join(workspace_root, 'jobs')
-            os.makedirs(output_dir, exist_ok=True)
-            log_debug(f"Main jobs directory: {output_dir}")
-            
-            # Create job type specific directory if it doesn't exist
-            job_type_dir = os.path.join(output_dir, job_type)
-            os.makedirs(job_type_dir, exist_ok=True)
-            log_debug(f"Job type directory: {job_type_dir}")
-            
-            # Full path for the output file
-            output_path = os.path.join(job_type_dir, filename)
-            log_debug(f"Output file path: {output_path}")
-            
-            # Debug: Count original job types
-            gr11_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR11')
-            gr15_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR15')
-            log_debug(f"Job counts before saving - GR11: {gr11_count}, GR15: {gr15_count}")
-            
-            # Log all customer references before saving
-            log_debug("Customer references before saving:")
-            for i, job in enumerate(jobs):
-                log_debug(f"Job {i} - Reg: {job.get('REG NUMBER', '')}, Customer Ref: {job.get('CUSTOMER REF', '')}")
-            
-            # IMPORTANT: For Greenhous jobs NEVER override the customer reference
-            # For other job types, set all jobs to the same customer ref
-            if job_type != 'GR11' and not job_type.startswith('GR'):
-                # Set all jobs to the same customer ref for non-Greenhous jobs
-                for job in jobs:
-                    job['CUSTOMER REF'] = job_type
-            
-            # Debug: Check final job types
-            gr11_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR11')
-            gr15_count = sum(1 for job in jobs if job.get('CUSTOMER REF', '') == 'GR15')
-            log_debug(f"After customer ref setup - GR11: {gr11_count}, GR15: {gr15_count}")
-            
-            # Check if the output file already exists
-            if os.path.exists(output_path):
-                log_debug(f"Warning: Output file already exists, will try to overwrite: {output_path}")
-                # Check if we can write to it
-                try:
-                    with open(output_path, 'a') as f:
-                        pass  # Just testing if we can open it for append
-                except PermissionError:
-                    log_debug(f"Permission denied when trying to open existing file: {output_path}")
-                    raise PermissionError(f"The file {filename} is open in another program. Please close it and try again.")
-            
-            # Test folder permissions
-            test_file = os.path.join(job_type_dir, "_test_write_permission.tmp")
-            try:
-                with open(test_file, 'w') as f:
-                    f.write("test")
-                os.remove(test_file)
-                log_debug(f"Write permission test successful on directory: {job_type_dir}")
-            except Exception as e:
-                log_debug(f"Failed write permission test: {str(e)}")
-                raise PermissionError(f"Cannot write to the output directory ({job_type_dir}). Please check your permissions.")
-            
-            # Try to save the file
-            log_debug(f"Attempting to write CSV to: {output_path}")
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'REG NUMBER',
-                    'VIN',
-                    'MAKE',
-                    'MODEL',
-                    'COLLECTION DATE',
-                    'YOUR REF NO',
-                    'COLLECTION ADDR1',
-                    'COLLECTION ADDR2',
-                    'COLLECTION ADDR3',
-                    'COLLECTION ADDR4',
-                    'COLLECTION POSTCODE',
-                    'COLLECTION CONTACT NAME',
-                    'COLLECTION PHONE',
-                    'DELIVERY DATE',
-                    'DELIVERY ADDR1',
-                    'DELIVERY ADDR2',
-                    'DELIVERY ADDR3',
-                    'DELIVERY ADDR4',
-                    'DELIVERY POSTCODE',
-                    'DELIVERY CONTACT NAME',
-                    'DELIVERY CONTACT PHONE',
-                    'SPECIAL INSTRUCTIONS',
-                    'PRICE',
-                    'CUSTOMER REF',
-                    'TRANSPORT TYPE'
-                ]
-
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                log_debug("Writing to CSV file:")
-                for job in jobs:
-                    # Create a new dict with only the fields we want
-                    row = {field: job.get(field, '') for field in fieldnames}
-                    # Debug: Check individual job customer reference
-                    log_debug(f"Writing job {row['REG NUMBER']} with customer ref: {row['CUSTOMER REF']}")
-                    writer.writerow(row)
-                
-            log_debug(f"CSV file saved to: {output_path}")
-            log_debug("--- END SAVING JOBS TO CSV ---")
-            
-            self.status_var.set(f"File saved: {filename}")
-            self.last_saved_file = output_path
-            self.file_link_var.set(f"View file: {filename}")
-            self.file_link_button.pack(side=tk.LEFT, padx=10)
-            print("File link button packed and visible")
-            messagebox.showinfo("Success", f"File saved successfully at:\n{output_path}")
-
-        except PermissionError as pe:
-            log_debug(f"Permission error during save: {str(pe)}")
-            error_msg = f"Permission denied. Please ensure:\n1. No other program has the file open\n2. You have permission to write to the folder: {os.path.dirname(output_path) if 'output_path' in locals() else 'unknown'}\n3. Close Excel or any CSV viewers before trying again."
-            messagebox.showerror("Permission Error", error_msg)
-            raise pe
-        except Exception as e:
-            log_debug(f"Error during save: {str(e)}")
-            messagebox.showerror("Error", f"An error occurred while saving the file:\n{str(e)}")
-            raise e
-    
-    def process_gr_jobs(self):
-        """Process the GR11/GR15 jobs from the Excel data"""
-        try:
-            # Get all items from treeview
-            items = self.job_tree.get_children()
-            
-            if not items:
-                messagebox.showerror("Error", "No jobs to process. Please load an Excel file first.")
-                return
-            
-            # Collect job data
-            jobs = []
-            for item in items:
-                try:
-                    values = self.job_tree.item(item, "values")
-                    
-                    # Check if we have the minimum required data
-                    if not values[0]:  # Reg No
-                        continue
-                    
-                    # Get the customer ref and PDI Centre values
-                    # values[1] is the customer ref from the preview (GR11 or GR15)
-                    customer_ref = values[1] if len(values) > 1 and values[1] else "GR11"
-                    
-                    # values[8] is the PDI Centre column
-                    pdi_centre = values[8] if len(values) > 8 and values[8] else ""
-                    
-                    # Debug: Print the PDI Centre value
-                    print(f"Processing job - Customer Ref: '{customer_ref}', PDI Centre: '{pdi_centre}'")
-                    log_debug(f"Processing job - Customer Ref: '{customer_ref}', PDI Centre: '{pdi_centre}'")
-                    
-                    # Collection address details
-                    collection_addr1 = ""
-                    collection_addr2 = ""
-                    collection_addr3 = ""
-                    collection_addr4 = ""
-                    collection_postcode = ""
-                    
-                    # Use the customer reference already set in the preview 
-                    # This ensures consistency with what's shown in the UI
-                    
-                    # Set address based on the customer reference
-                    if customer_ref == "GR15":
-                        collection_addr1 = "Greenhous Upper Heyford"
-                        collection_addr2 = "Heyford Park, Bicester"
-                        collection_addr3 = "Bicester"
-                        collection_addr4 = "UPPER HEYFORD"
-                        collection_postcode = "OX25 5HA"
-                        print(f"  => Using Upper Heyford address")
-                        log_debug(f"  => Using Upper Heyford address")
-                    else:
-                        # Default to High Ercall (GR11)
-                        collection_addr1 = "Greenhous High Ercall"
-                        collection_addr2 = "Greenhous Village Osbaston"
-                        collection_addr3 = "High Ercall"
-                        collection_addr4 = ""
-                        collection_postcode = "TF6 6RA"
-                        print(f"  => Using High Ercall address")
-                        log_debug(f"  => Using High Ercall address")
-                    
-                    # Create job dictionary
-                    job = {
-                        'REG NUMBER': values[0],
-                        'VIN': values[2] if len(values) > 2 and values[2] else "",  # Chassis
-                        'MAKE': values[3] if len(values) > 3 and values[3] else "TRANSIT",  # Make
-                        'MODEL': values[4] if len(values) > 4 and values[4] else "VAN",  # Model
-                        'COLOR': "",
-                        'COLLECTION DATE': values[5] if len(values) > 5 and values[5] else datetime.now().strftime("%d/%m/%Y"),  # Collection date
-                        'YOUR REF NO': values[0],  # Use reg number as reference
-                        'COLLECTION ADDR1': collection_addr1,
-                        'COLLECTION ADDR2': collection_addr2,
-                        'COLLECTION ADDR3': collection_addr3,
-                        'COLLECTION ADDR4': collection_addr4,
-                        'COLLECTION POSTCODE': collection_postcode,
-                        'COLLECTION CONTACT NAME': "",
-                        'COLLECTION PHONE': "",
-                        'DELIVERY DATE': values[5] if len(values) > 5 and values[5] else datetime.now().strftime("%d/%m/%Y"),  # Same as collection date
-                        'DELIVERY ADDR1': "",
-                        'DELIVERY ADDR2': "",
-                        'DELIVERY ADDR3': "",
-                        'DELIVERY ADDR4': "",
-                        'DELIVERY POSTCODE': "",
-                        'DELIVERY CONTACT NAME': "",
-                        'DELIVERY CONTACT PHONE': "",
-                        'SPECIAL INSTRUCTIONS': f"VIN: {values[2] if len(values) > 2 and values[2] else 'Unknown'}",
-                        'PRICE': "",
-                        'CUSTOMER REF': customer_ref,
-                        'TRANSPORT TYPE': ""
-                    }
-                    
-                    # Parse delivery address
-                    if len(values) > 7 and values[7]:
-                        delivery_address = values[7]  # Correct index for delivery address
-                        
-                        # Pre-process common patterns that should be kept together
-                        # Examples: "FLEX E REN 84-90", "FLEX E RE WEST LON"
-                        patterns_to_fix = [
-                            (r'(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)[\s,]+(\d+[\-\d]*)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(WEST)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ST)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(UNIT)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(MARCH)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(IVATT)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(LANDGATI)', r'\1 \2'),
-                            (r'(FLEX[\-\s]E[\-\s]RE)[\s,]+(ASCOT)', r'\1 \2'),
-                            # New patterns to keep road numbers with road names
-                            (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:Road|Street|Avenue|Lane|Drive|Close|Way|ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY))', r'\1 \2'),
-                            # Handle specific cases like 84-90 BRADES ROAD
-                            (r'(\d+[\-\d]*)\s*,\s*(BRADES[\s]*ROAD)', r'\1 \2'),
-                            # More general pattern for any number + street pattern that got split
-                            (r'(\d+[\-\d]*)\s*,\s*([A-Za-z\s]+(?:\s(?:Rd|St|Ave|Ln|Dr|Cl|RD|ST|AVE|LN|DR|CL)))', r'\1 \2')
-                        ]
-                        
-                        # Apply each pattern fix
-                        processed_address = delivery_address
-                        for pattern, replacement in patterns_to_fix:
-                            processed_address = re.sub(pattern, replacement, processed_address, flags=re.IGNORECASE)
-                        
-                        # Log any changes made during pre-processing
-                        if processed_address != delivery_address:
-                            log_debug(f"Pre-processed address: '{delivery_address}' -> '{processed_address}'")
-                            delivery_address = processed_address
-                        
-                        # Try to extract postcode from address (UK format)
-                        postcode_pattern = r'([A-Z]{1,2}[0-9][0-9A-Z]?\s*[0-9][A-Z]{2})'
-                        postcode_match = re.search(postcode_pattern, delivery_address, re.IGNORECASE)
-                        
-                        # Clean the postcode if found
-                        extracted_postcode = ""
-                        if postcode_match:
-                            extracted_postcode = postcode_match.group(1).upper().strip()
-                            # Clean up spacing in the postcode
-                            if len(extracted_postcode) > 4 and ' ' not in extracted_postcode:
-                                # Add space in the correct position for UK postcodes (before last 3 chars)
-                                extracted_postcode = extracted_postcode[:-3] + ' ' + extracted_postcode[-3:]
-                            job['DELIVERY POSTCODE'] = extracted_postcode
-                        
-                        # Remove the postcode from the address for cleaner parsing
-                        if extracted_postcode:
-                            clean_address = delivery_address.replace(postcode_match.group(0), "")
-                        else:
-                            clean_address = delivery_address
-                        
-                        # Enhanced address parsing to keep road numbers with street names
-                        # First split by commas
-                        address_parts = [part.strip() for part in clean_address.split(',') if part.strip()]
-                        
-                        # First pass: Check for patterns like "FLEX-E-RE 84-90" being split across parts
-                        # or combine prefix with following parts
-                        combined_parts = []
-                        i = 0
-                        while i < len(address_parts):
-                            current_part = address_parts[i]
-                            
-                            # Special patterns to check for
-                            flex_prefix_pattern = r'^(FLEX[\-\s]E[\-\s]RE|FLEX[\-\s]RENT|FLEX[\-\s]E[\-\s]REN|FLEX[\-\s]E[\-\s]RE[\-\s]ST|ENTERPRI[\-\s]ROSS)$'
-                            
-                            # Check if this part ends with a prefix that should be combined with the next part
-                            if i < len(address_parts) - 1 and re.match(flex_prefix_pattern, current_part, re.IGNORECASE):
-                                # Look ahead to see if we need to combine more parts (prefix + number + road name)
-                                if i < len(address_parts) - 2 and re.match(r'^\d+[\-\d]*$', address_parts[i+1]) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+2], re.IGNORECASE):
-                                    # We have a pattern like: [FLEX-E-RE], [84-90], [BRADES ROAD]
-                                    combined_parts.append(f"{current_part} {address_parts[i+1]} {address_parts[i+2]}")
-                                    i += 3  # Skip all three parts
-                                else:
-                                    # Just combine with next part
-                                    combined_parts.append(f"{current_part} {address_parts[i+1]}")
-                                    i += 2  # Skip both parts
-                            # Check for standalone number that should be combined with street name
-                            elif i < len(address_parts) - 1 and re.match(r'^\d+[\-\d]*$', current_part) and re.match(r'^[A-Za-z\s]+(?:ROAD|STREET|AVENUE|LANE|DRIVE|CLOSE|WAY|Road|Street|Avenue|Lane|Drive|Close|Way)$', address_parts[i+1], re.IGNORECASE):
-                                # We have a pattern like: [84-90], [BRADES ROAD]
-                                combined_parts.append(f"{current_part} {address_parts[i+1]}")
-                                i += 2  # Skip both parts
-                            else:
-                                combined_parts.append(current_part)
-                                i += 1
-                        
-                        # Replace original parts with combined parts
-                        address_parts = combined_parts
-                        
-                        # Log the address parts after combining
-                        log_debug(f"Address parts after combining prefixes and road numbers: {address_parts}")
-                        
-                        # Initialize address fields
-                        addr1 = ""
-                        addr2 = ""
-                        addr3 = ""
-                        addr4 = ""
-                        
-                        # Process address parts based on their content and position
-                        if len(address_parts) > 0:
-                            addr1 = address_parts[0]  # First part is always ADDR1 (usually business name)
-                        
-                        if len(address_parts) > 1:
-                            # Check if the second part looks like a road/street with numbers
-                            road_pattern = r'^\d+[\-\d]*\s+[A-Za-z\s]+'  # Matches patterns like "84-90 BRADES ROAD"
-                            if len(address_parts) > 2 and (re.match(road_pattern, address_parts[1]) or 
-                                                          re.search(r'\b(Road|Street|Avenue|Lane|Drive|Close)\b', address_parts[1], re.IGNORECASE)):
-                                # This is a street address, keep it in ADDR2
-                                addr2 = address_parts[1]
-                                
-                                # The rest goes into ADDR3 and ADDR4
-                                if len(address_parts) > 3:
-                                    addr3 = address_parts[2]
-                                    addr4 = address_parts[3]
-                                elif len(address_parts) > 2:
-                                    addr3 = address_parts[2]
-                            else:
-                                # Standard processing
-                                if len(address_parts) > 2:
-                                    addr2 = address_parts[1]
-                                    addr3 = address_parts[2]
-                                    if len(address_parts) > 3:
-                                        addr4 = ' '.join(address_parts[3:])
-                                else:
-                                    addr2 = address_parts[1]
-                        
-                        # Special handling for when ADDR4 is empty but we have a town in ADDR3
-                        if not addr4 and addr3 and len(addr3.split()) <= 2:
-                            addr4 = addr3
-                            addr3 = ""
-                        
-                        # Set the address fields
-                        job['DELIVERY ADDR1'] = addr1
-                        job['DELIVERY ADDR2'] = addr2
-                        job['DELIVERY ADDR3'] = addr3
-                        job['DELIVERY ADDR4'] = addr4
-                    
-                    jobs.append(job)
-                except Exception as item_error:
-                    # Log individual item parsing errors but continue with others
-                    print(f"Error processing item: {str(item_error)}")
-                    continue
-            
-            if not jobs:
-                messagebox.showerror("Error", "No valid jobs to process.")
-                return
-            
-            # Count jobs by type for reporting purposes
-            gr11_count = sum(1 for job in jobs if job['CUSTOMER REF'] == 'GR11')
-            gr15_count = sum(1 for job in jobs if job['CUSTOMER REF'] == 'GR15')
-            
-            # Generate a single CSV file for all jobs
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"greenhous_jobs_{timestamp}.csv"
-            
-            # Save to the GR11 folder for consistency
-            self.save_to_csv(jobs, filename, 'GR11')
-            
-            # Success message
-            total_jobs = len(jobs)
-            
-            self.gr_status_var.set(f"Loaded {job_count} jobs from file")
-            self.gr_status_label.config(fg=self.success_color)
-            
-            # More detailed success message with counts of each job type
-            message = f"Processed {total_jobs} Greenhous jobs in total:\n"
-            
-            # Count by job type
-            job_types = {}
-            for job in jobs:
-                customer_ref = job.get('CUSTOMER REF', 'Unknown')
-                job_types[customer_ref] = job_types.get(customer_ref, 0) + 1
-            
-            # Add counts to message
-            for ref, count in job_types.items():
-                message += f"- {count} {ref} jobs\n"
-                
-            message += f"\nAll jobs saved to: jobs/GR11/{filename}"
+            # Where they went: the CSV, or its shards' manifest, and any copies
+            message += "\nSaved to:\n" + "\n".join(describe_export(self.jobs_output_path('GR11', filename), export))
                 
             messagebox.showinfo("Success", message)
             
@@ -3623,14 +2062,13 @@ class VehicleTransportApp:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
             
     def open_last_saved_file(self, event=None):
-        print("open_last_saved_file called")
         import subprocess
         import os
-        print(f"Trying to open: {self.last_saved_file}")
+        app_log.debug("Trying to open: %s", self.last_saved_file)
         if self.last_saved_file and os.path.exists(self.last_saved_file):
             subprocess.Popen(['explorer', f'/select,{self.last_saved_file}'])
         else:
-            print("File does not exist or path is not set.")
+            app_log.warning("File does not exist or path is not set.")
 
     def create_cw08_09_tab(self):
         """Create the CW08/09 tab content for Excel file processing"""
@@ -3701,6 +2139,8 @@ class VehicleTransportApp:
             bg=self.card_bg
         )
         job_count_label.pack(side=tk.RIGHT)
+        self.cw_filter_var = tk.StringVar()
+        self.create_preview_filter(preview_header, self.cw_filter_var, "CW09")
         preview_container = ModernFrame(
             preview_section,
             bordercolor=self.border_color,
@@ -3720,7 +2160,10 @@ class VehicleTransportApp:
             self.cw_job_tree.heading(col, text=col.replace('_', ' ').upper())
             self.cw_job_tree.column(col, width=100)
         self.cw_job_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        tree_scroll.config(command=self.cw_job_tree.yview)
+        # The loaded jobs (see cw09.cw_job_frame); the Treeview only shows
+        # the rows scrolled to
+        self.cw_jobs = JobTable(JOB_FIELDS)
+        self.cw_view = VirtualTreeview(self.cw_job_tree, tree_scroll, self.cw_jobs, CW_TREE_FIELDS)
         action_section = tk.Frame(cw_frame, bg=self.card_bg)
         action_section.pack(fill=tk.X, pady=10)
         self.cw_status_var = tk.StringVar()
@@ -3746,6 +2189,7 @@ class VehicleTransportApp:
             fg="white"
         )
         self.cw_process_button.pack(side=tk.RIGHT)
+        self.create_export_options(action_section, "CW09")
         return cw_frame
 
     def browse_cw_excel_file(self):
@@ -3756,59 +2200,35 @@ class VehicleTransportApp:
             self.load_cw_excel_data(file_path)
 
     def load_cw_excel_data(self, file_path):
-        import pandas as pd
-        import os
         try:
-            for item in self.cw_job_tree.get_children():
-                self.cw_job_tree.delete(item)
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext == '.csv':
-                df = pd.read_csv(file_path)
-            else:
-                df = pd.read_excel(file_path)
+            self.cw_jobs.clear()
+            self.cw_view.clear()
+            # Read the sheet a chunk at a time (see workbooks.py) and show
+            # each chunk as soon as it is ready
+            invalid_regs = []
             job_count = 0
-            for _, row in df.iterrows():
-                # Replace nan with empty string
-                row = row.fillna("") if hasattr(row, 'fillna') else row
-                # Slide delivery address fields and put contact name in addr1 and delivery contact name
-                delivery_contact_name = row.get('Delivery Contact Name', '')
-                delivery_addr1 = delivery_contact_name
-                delivery_addr2 = row.get('Delivery Address1', '')
-                delivery_addr3 = row.get('Delivery Address2', '')
-                delivery_addr4 = row.get('Delivery Address3', '')
-                delivery_contact_phone = row.get('Delivery Contact Phone', '')
-                # Insert into treeview, add delivery contact name as last column for later use
-                values = [
-                    row.get('Reg', ''),
-                    row.get('VIN', ''),
-                    row.get('Make', ''),
-                    row.get('Model', ''),
-                    row.get('Collection Date', ''),
-                    row.get('Your Ref No', ''),
-                    row.get('Collection Address1', ''),
-                    row.get('Collection Address2', ''),
-                    row.get('Collection Address3', ''),
-                    row.get('Collection Address4', ''),
-                    row.get('Collection Postcode', ''),
-                    delivery_addr1,
-                    delivery_addr2,
-                    delivery_addr3,
-                    delivery_addr4,
-                    row.get('Delivery Postcode', ''),
-                    row.get('SpecialInstructions', ''),
-                    row.get('Price', ''),
-                    delivery_contact_phone,
-                    delivery_contact_name  # for delivery contact name field
-                ]
-                # Replace any 'nan' string values with ''
-                values = [v if (v != 'nan' and str(v).lower() != 'nan') else '' for v in values]
-                self.cw_job_tree.insert("", tk.END, values=values)
-                job_count += 1
-            if job_count == 1:
-                self.cw_job_count_var.set("1 job detected")
-            else:
-                self.cw_job_count_var.set(f"{job_count} jobs detected")
-            self.cw_status_var.set(f"Loaded {job_count} jobs from file")
+            for chunk in iter_sheet_chunks(file_path):
+                # The finished jobs for the whole chunk, a column at a time
+                jobs = cw_job_frame(chunk)
+                self.cw_jobs.append(jobs)
+                # Flag registrations that don't look like UK plates
+                regs = jobs['REG NUMBER'][jobs['REG NUMBER'] != '']
+                valid_regs, _ = validate_registrations(regs)
+                for reg in regs[~valid_regs]:
+                    app_log.debug("Unrecognised registration format: %s", reg)
+                    invalid_regs.append(reg)
+                self.cw_view.rows_added()
+                job_count += len(jobs)
+                self.update_preview_count("CW09")
+                self.cw_status_var.set(f"Loading... {job_count} jobs so far")
+                self.root.update_idletasks()
+            # Apply any filter or sort to the whole sheet, once
+            self.cw_view.refresh()
+            self.update_preview_count("CW09")
+            status = f"Loaded {job_count} jobs from file"
+            if invalid_regs:
+                status += f" ({len(invalid_regs)} with unrecognised registrations)"
+            self.cw_status_var.set(status)
             self.cw_status_label.config(fg=self.success_color)
         except Exception as e:
             self.cw_status_var.set(f"Error loading file: {str(e)}")
@@ -3816,43 +2236,14 @@ class VehicleTransportApp:
             messagebox.showerror("Error", f"Failed to load Excel file: {str(e)}")
 
     def process_cw_jobs(self):
-        items = self.cw_job_tree.get_children()
-        if not items:
+        if not len(self.cw_jobs):
             messagebox.showerror("Error", "No jobs to process. Please load an Excel file first.")
             return
-        jobs = []
-        for item in items:
-            values = list(self.cw_job_tree.item(item, "values"))
-            # Replace any 'nan' string values with ''
-            values = [v if (v != 'nan' and str(v).lower() != 'nan') else '' for v in values]
-            jobs.append({
-                'REG NUMBER': values[0],
-                'VIN': values[1],
-                'MAKE': values[2],
-                'MODEL': values[3],
-                'COLLECTION DATE': values[4],
-                'YOUR REF NO': values[5],
-                'COLLECTION ADDR1': values[6],
-                'COLLECTION ADDR2': values[7],
-                'COLLECTION ADDR3': values[8],
-                'COLLECTION ADDR4': values[9],
-                'COLLECTION POSTCODE': values[10],
-                'DELIVERY ADDR1': values[11],  # Delivery Contact Name
-                'DELIVERY ADDR2': values[12],  # Delivery Address1
-                'DELIVERY ADDR3': values[13],  # Delivery Address2
-                'DELIVERY ADDR4': values[14],  # Delivery Address3
-                'DELIVERY POSTCODE': values[15],
-                'SPECIAL INSTRUCTIONS': values[16],
-                'PRICE': values[17],
-                'DELIVERY CONTACT PHONE': values[18],
-                'DELIVERY CONTACT NAME': values[19],
-                'CUSTOMER REF': 'CW09',
-                'TRANSPORT TYPE': ''
-            })
+        jobs = self.cw_jobs.records()
         from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"cw09_jobs_{timestamp}.csv"
-        self.save_to_csv(jobs, filename, 'CW09')
+        self.save_to_csv(jobs, filename, 'CW09', **self.export_save_options('CW09'))
         self.cw_status_var.set(f"Successfully processed {len(jobs)} jobs")
         self.cw_status_label.config(fg=self.success_color)
 
@@ -3867,19 +2258,11 @@ class VehicleTransportApp:
         collection_date = self.bc04_collection_date.get_date()
         delivery_date = self.calculate_delivery_date(collection_date)
         self.bc04_delivery_date.set_date(delivery_date)
+        self.schedule_live_parse("BC04")
 
     def update_bc04_job_count(self, event=None):
-        """Update BC04 job count as user types"""
-        try:
-            text = self.bc04_text_input.get("1.0", tk.END)
-            # Count "Job Sheet" occurrences to estimate job count
-            job_count = len(re.findall(r'Job Sheet', text, re.IGNORECASE))
-            if job_count == 1:
-                self.bc04_job_count_var.set("1 job detected")
-            else:
-                self.bc04_job_count_var.set(f"{job_count} jobs detected")
-        except:
-            self.bc04_job_count_var.set("0 jobs detected")
+        """Re-parse the BC04 text in the background once typing pauses"""
+        self.schedule_live_parse("BC04")
 
     def process_bc04_jobs(self):
         """Process BC04 jobs using the BC04Parser"""
@@ -3896,9 +2279,17 @@ class VehicleTransportApp:
             collection_date = self.bc04_collection_date.get_date().strftime("%d/%m/%Y")
             delivery_date = self.bc04_delivery_date.get_date().strftime("%d/%m/%Y")
             
-            # Parse the jobs using BC04Parser
-            parser = BC04Parser(collection_date, delivery_date)
-            jobs = parser.parse_jobs(text)
+            # Parse the jobs using BC04Parser, unless the live parse already
+            # has this exact text and dates
+            live = self.bc04_live_parser.result_for(text, collection_date, delivery_date)
+            if live is not None:
+                jobs, quarantined = live
+            else:
+                parser = BC04Parser(collection_date, delivery_date, cache=PARSE_CACHE)
+                jobs = parser.parse_jobs(text, workers=None)
+                quarantined = parser.quarantined
+            log_quarantined("BC04", quarantined)
+            app_log.debug("Parse cache: %s", PARSE_CACHE.stats())
             
             if not jobs:
                 self.bc04_status_var.set("No valid BC04 jobs found in the input text")
@@ -3931,7 +2322,7 @@ class VehicleTransportApp:
                             price = float(price_str)
                             batch_total += price
                         except (ValueError, TypeError):
-                            log_debug(f"Could not parse BC04 price: {job.get('PRICE', 'N/A')}")
+                            app_log.warning("Could not parse BC04 price: %s", job.get('PRICE', 'N/A'))
                 
                 # Update the total price for BC04
                 if not hasattr(self, 'total_bc04_price'):
@@ -3942,8 +2333,12 @@ class VehicleTransportApp:
                 self.total_bc04_price += batch_total
                 self.bc04_price_var.set(f"Total Price: £{self.total_bc04_price:.2f}")
                 
-                self.bc04_status_var.set(f"Successfully processed {len(jobs)} BC04 jobs")
-                self.bc04_status_label.config(fg=self.success_color)
+                if quarantined:
+                    self.bc04_status_var.set(f"Processed {len(jobs)} BC04 jobs, {len(quarantined)} quarantined (see debug log)")
+                    self.bc04_status_label.config(fg=self.warning_color)
+                else:
+                    self.bc04_status_var.set(f"Successfully processed {len(jobs)} BC04 jobs")
+                    self.bc04_status_label.config(fg=self.success_color)
                 
                 # Include price in success message
                 if batch_total > 0:
@@ -3973,18 +2368,7 @@ class VehicleTransportApp:
         messagebox.showinfo("Price Reset", "The BC04 total price counter has been reset to £0.00")
 
     def is_valid_uk_registration(self, reg):
-        reg = reg.upper().replace(" ", "")
-        if reg.isdigit():
-            return False  # Never just numbers
-        patterns = [
-            r"^[A-Z]{2}[0-9]{2}[A-Z]{3}$",         # Current style: AB12CDE
-            r"^[A-Z]{1}[0-9]{1,3}[A-Z]{3}$",       # Prefix: A123BCD
-            r"^[A-Z]{3}[0-9]{1,3}[A-Z]{1}$",       # Suffix: ABC123A
-            r"^[A-Z]{3}[0-9]{4}$",                 # NI: BYZ3210
-            r"^[0-9]{1,4}[A-Z]{1,3}$",             # Dateless: 1–4 numbers + 1–3 letters
-            r"^[A-Z]{1,3}[0-9]{1,4}$",             # Dateless: 1–3 letters + 1–4 numbers
-        ]
-        return any(re.match(p, reg) for p in patterns)
+        return is_valid_uk_registration(reg)
 
     def parse_single_job(self, job_text):
         job = {}
@@ -4005,7 +2389,7 @@ class VehicleTransportApp:
         #         job['REG NUMBER'] = reg_match.group(1).strip()
         # Should become:
         if not job['REG NUMBER']:
-            reg_match = re.search(r'REG(?:ISTRATION)?\s*:?\s*([A-Z0-9]+)', job_text, re.IGNORECASE)
+            reg_match = REG_FIELD_RE.search(job_text)
             if reg_match:
                 reg_candidate = reg_match.group(1).strip()
                 if self.is_valid_uk_registration(reg_candidate):
@@ -4013,226 +2397,16 @@ class VehicleTransportApp:
                 else:
                     job['REG NUMBER'] = ''
 
-class BC04Parser:
-    def __init__(self, collection_date, delivery_date=None):
-        self.jobs = []
-        self.collection_date = collection_date
-        self.delivery_date = delivery_date if delivery_date else collection_date
-        self.bc04_special_instructions = (
-            "MUST GET A FULL NAME AND SIGNATURE ON COLLECTION CALL OFFICE AND Non Conformance Motability on 0121 788 6940 option 1 IF THEY REFUSE ** - PHOTO'S MUST BE CLEAR PLEASE. COLL AND DEL 09:00-17:00 ONLY"
-        )
-    def calculate_delivery_date(self, collection_date):
-        """Calculate delivery date based on collection date (next business day)"""
-        try:
-            # Import holidays here to avoid issues if not available
-            import holidays
-            uk_holidays = holidays.UnitedKingdom()
-        except ImportError:
-            # Fallback if holidays package is not available
-            class DummyHolidays:
-                def __init__(self, *args, **kwargs):
-                    pass
-                def __contains__(self, date):
-                    return False
-            uk_holidays = DummyHolidays()
-        
-        # Start with the collection date
-        delivery = collection_date
-        
-        # Add one day
-        delivery += timedelta(days=1)
-        
-        # Skip weekends and holidays
-        while delivery.weekday() >= 5 or delivery in uk_holidays:  # 5=Saturday, 6=Sunday
-            delivery += timedelta(days=1)
-        
-        return delivery
-    
-    def clean_phone_number(self, phone):
-        """Clean and format phone number"""
-        if not phone:
-            return ''
-        
-        # Remove common prefixes and clean
-        phone = phone.strip()
-        phone = re.sub(r'^(Tel|Phone|T|Telephone)[\s:.]*', '', phone, flags=re.IGNORECASE)
-        phone = re.sub(r'[^\d+\s()-]', '', phone)  # Keep only digits, +, spaces, parentheses, hyphens
-        phone = re.sub(r'\s+', ' ', phone).strip()  # Normalize spaces
-        
-        return phone
-    
-    def is_postcode(self, line):
-        """Check if a line contains a UK postcode and return it if found"""
-        # More flexible UK postcode regex that handles common variations
-        postcode_pattern = r'\b([A-Z]{1,2}\d{1,2}[A-Z]?\s*\d[A-Z]{2})\b'
-        match = re.search(postcode_pattern, line.upper())
-        if match:
-            postcode = match.group(1)
-            # Ensure proper spacing in postcode
-            postcode = re.sub(r'([A-Z]\d+[A-Z]?)(\d[A-Z]{2})', r'\1 \2', postcode)
-            return postcode
-        return None
-    
-    def parse_jobs(self, text):
-        """Parse BC04 jobs from text input"""
-        self.jobs = []
-        
-        # Split by "Job Sheet" sections
-        job_sections = re.split(r'Job Sheet\s*\n', text)
-        
-        # Remove empty sections
-        job_sections = [section.strip() for section in job_sections if section.strip()]
-        
-        for section in job_sections:
-            if section.strip():
-                job = self.parse_single_job(section)
-                if job and job.get('REG NUMBER'):  # Only add if we found a registration
-                    self.jobs.append(job)
-        
-        return self.jobs
-    
-    def parse_single_job(self, job_text):
-        job = {}
-        # Initialize all fields
-        job['REG NUMBER'] = ''
-        job['VIN'] = ''
-        job['MAKE'] = ''
-        job['MODEL'] = ''
-        job['COLOR'] = ''
-        job['COLLECTION DATE'] = self.collection_date
-        job['YOUR REF NO'] = ''
-        job['COLLECTION ADDR1'] = ''
-        job['COLLECTION ADDR2'] = ''
-        job['COLLECTION ADDR3'] = ''
-        job['COLLECTION ADDR4'] = ''
-        job['COLLECTION POSTCODE'] = ''
-        job['COLLECTION CONTACT NAME'] = ''
-        job['COLLECTION PHONE'] = ''
-        job['DELIVERY DATE'] = self.delivery_date
-        job['DELIVERY ADDR1'] = ''
-        job['DELIVERY ADDR2'] = ''
-        job['DELIVERY ADDR3'] = ''
-        job['DELIVERY ADDR4'] = ''
-        job['DELIVERY POSTCODE'] = ''
-        job['DELIVERY CONTACT NAME'] = ''
-        job['DELIVERY CONTACT PHONE'] = ''
-        job['SPECIAL INSTRUCTIONS'] = self.bc04_special_instructions
-        job['PRICE'] = ''
-        job['CUSTOMER REF'] = 'BC04'
-        job['TRANSPORT TYPE'] = ''
-
-        # Extract job number and vehicle registration
-        job_number_match = re.search(r'Job Number.*?(\d+/\d+)', job_text, re.DOTALL)
-        if job_number_match:
-            job['YOUR REF NO'] = job_number_match.group(1)
-        # Robust registration extraction (UK reg: 2 letters, 2 digits, 3 letters)
-        reg_match = re.search(r'([A-Z]{2}\d{2}[A-Z]{3})', job_text)
-        if reg_match:
-            job['REG NUMBER'] = reg_match.group(1)
-        # VIN extraction (12+ digits, after reg)
-        vin_match = re.search(rf'{job["REG NUMBER"]}\s+(\d{{9,}})', job_text) if job['REG NUMBER'] else None
-        if vin_match:
-            job['VIN'] = vin_match.group(1)
-        # --- MAKE and MODEL are always blank for BC04 ---
-        job['MAKE'] = ''
-        job['MODEL'] = ''
-        # Price extraction
-        price_matches = re.findall(r'£?\s*(\d+\.\d{2})', job_text)
-        if len(price_matches) >= 2:
-            job['PRICE'] = price_matches[1]
-        elif price_matches:
-            job['PRICE'] = price_matches[0]
-
-        # --- Improved Address Extraction for BC04 ---
-        lines = [line.strip() for line in job_text.split('\n')]
-        addr_start = None
-        reg_line_idx = None
-        reg_pattern = r'^[A-Z]{2}\d{2}[A-Z]{3}\s+\d{9,}'
-        for i, line in enumerate(lines):
-            if line.strip().lower().startswith('special instructions'):
-                addr_start = i + 1
-            if re.match(reg_pattern, line.strip()):
-                reg_line_idx = i
-                break
-        if addr_start is not None and reg_line_idx is not None and addr_start < reg_line_idx:
-            address_lines = [l for l in lines[addr_start:reg_line_idx] if l.strip()]
-            postcode_indices = [i for i, l in enumerate(address_lines) if self.is_postcode(l)]
-            if len(postcode_indices) == 2:
-                split_idx = postcode_indices[0] + 1
-            else:
-                split_idx = len(address_lines) // 2
-            collection_lines = address_lines[:split_idx]
-            delivery_lines = address_lines[split_idx:]
-            # Assign collection address (ADDR1-3, ADDR4=town, POSTCODE)
-            if collection_lines:
-                c_postcode_idx = None
-                for idx, l in enumerate(collection_lines):
-                    if self.is_postcode(l):
-                        c_postcode_idx = idx
-                        break
-                if c_postcode_idx is not None and c_postcode_idx > 0:
-                    c_addr = collection_lines[:c_postcode_idx]
-                    c_town = c_addr[-1] if len(c_addr) >= 1 else ''
-                    for i in range(3):
-                        job[f'COLLECTION ADDR{i+1}'] = c_addr[i] if i < len(c_addr)-1 else ''
-                    job['COLLECTION ADDR4'] = c_town
-                    job['COLLECTION POSTCODE'] = collection_lines[c_postcode_idx]
-                else:
-                    for idx, val in enumerate(collection_lines):
-                        if idx < 4:
-                            job[f'COLLECTION ADDR{idx+1}'] = val
-            # Assign delivery address (ADDR1-3, ADDR4=town, POSTCODE)
-            if delivery_lines:
-                d_postcode_idx = None
-                for idx, l in enumerate(delivery_lines):
-                    if self.is_postcode(l):
-                        d_postcode_idx = idx
-                        break
-                if d_postcode_idx is not None and d_postcode_idx > 0:
-                    d_addr = delivery_lines[:d_postcode_idx]
-                    d_town = d_addr[-1] if len(d_addr) >= 1 else ''
-                    for i in range(3):
-                        job[f'DELIVERY ADDR{i+1}'] = d_addr[i] if i < len(d_addr)-1 else ''
-                    job['DELIVERY ADDR4'] = d_town
-                    job['DELIVERY POSTCODE'] = delivery_lines[d_postcode_idx]
-                else:
-                    for idx, val in enumerate(delivery_lines):
-                        if idx < 4:
-                            job[f'DELIVERY ADDR{idx+1}'] = val
-        # --- Phone Extraction and Dynamic Date Extraction ---
-        # Find the line with two phone numbers before the date lines
-        phone_line = ''
-        found_dates = False
-        for i, line in enumerate(lines):
-            # Look for two phone numbers (8+ digits) separated by space or tab
-            phones = re.findall(r'\d{8,}', line)
-            if len(phones) >= 2:
-                # Check if the next line is a date (dd/mm/yyyy)
-                if i+1 < len(lines) and re.match(r'\d{2}/\d{2}/\d{4}', lines[i+1]):
-                    job['COLLECTION PHONE'] = phones[0]
-                    job['DELIVERY CONTACT PHONE'] = phones[1]
-                    # Now extract the first two dates after this line
-                    date_matches = []
-                    for l in lines[i+1:i+5]:
-                        date_matches += re.findall(r'\d{2}/\d{2}/\d{4}', l)
-                        if len(date_matches) >= 2:
-                            break
-                    if len(date_matches) >= 2:
-                        job['COLLECTION DATE'] = date_matches[0]
-                        job['DELIVERY DATE'] = date_matches[1]
-                    found_dates = True
-                    break
-        # If not found, fallback to default dates
-        if not found_dates:
-            job['COLLECTION DATE'] = self.collection_date
-            job['DELIVERY DATE'] = self.delivery_date
-        return job
 
 # Always look for credentials.json in the same directory as this script
 CREDENTIALS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'credentials.json')
 TOKEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'token.json')
 
 if __name__ == "__main__":
+    # Lets the parser's process pool start workers from a frozen Windows build
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     try:
         # Import needed for Pillow if it exists (for better visuals)
         try:
@@ -4241,21 +2415,6 @@ if __name__ == "__main__":
         except ImportError:
             has_pillow = False
         
-        # Check for the holidays package which might be missing
-        try:
-            import holidays
-        except ImportError:
-            # Simple fallback for holidays
-            class DummyHolidays:
-                def __init__(self, *args, **kwargs):
-                    pass
-                def __contains__(self, date):
-                    return False
-            # Monkey patch the holidays module
-            import sys
-            sys.modules['holidays'] = type('', (), {'UK': DummyHolidays})
-            import holidays
-        
         root = tk.Tk()
         app = VehicleTransportApp(root)
         root.mainloop()
@@ -0,0 +1,231 @@
+"""Virtual list mode for the GR11 and CW09 job previews.
+
+A Treeview with one item per row takes minutes to build for a 100k-row
+workbook, and most of those items are never scrolled to. VirtualTreeview
+keeps just enough items to fill the widget (plus VIRTUAL_TREE_BUFFER) and
+fills them with whichever rows of the JobTable are in view, so showing or
+scrolling a sheet of any size costs the same few dozen item updates.
+
+The scrollbar, mouse wheel and arrow/page keys move the window over the
+table instead of scrolling the widget. Filtering and sorting (click a
+heading) are done on the table's DataFrame and only change which rows the
+window shows, in which order.
+"""
+import tkinter as tk
+from tkinter import font as tkfont
+from tkinter import ttk
+
+import numpy as np
+
+# Items kept past the last fully visible row, so a resize or a partly shown
+# row never leaves a gap
+VIRTUAL_TREE_BUFFER = 3
+# Used when the theme doesn't say how tall a Treeview row is
+DEFAULT_ROW_HEIGHT = 20
+# Quiet time after the last key press in a filter box before it is applied
+PREVIEW_FILTER_DELAY_MS = 300
+
+SORT_MARKERS = {False: " ▲", True: " ▼"}
+
+
+class VirtualTreeview:
+    """Shows a window of a JobTable's rows in an existing Treeview.
+
+    columns are the table columns behind the Treeview's columns, in the
+    same order. The view takes over the scrollbar and the Treeview's
+    scrolling bindings. Call rows_added() as rows are appended to the table
+    while a sheet loads, and refresh() once it has finished.
+    """
+
+    def __init__(self, tree, scrollbar, table, columns=None, buffer=VIRTUAL_TREE_BUFFER):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.table = table
+        self.columns = tuple(columns or table.columns)
+        self.buffer = buffer
+        self.filter_text = ""
+        self.sort_column = None
+        self.sort_descending = False
+        # Table row numbers in display order, after filtering and sorting
+        self._order = np.arange(0)
+        self._top = 0
+        self._visible = 1
+        self._selected = set()
+        # Item -> table row number of what it currently shows
+        self._item_rows = {}
+        self._headings = {column: tree.heading(column, 'text') for column in tree['columns']}
+
+        scrollbar.config(command=self._on_scrollbar)
+        tree.config(yscrollcommand='')
+        for column, table_column in zip(tree['columns'], self.columns):
+            tree.heading(column, command=lambda column=table_column: self.sort_by(column))
+        tree.bind('<Configure>', self._on_configure)
+        # Each handler returns 'break' so the Treeview's own bindings don't
+        # scroll the items themselves
+        tree.bind('<MouseWheel>', lambda event: self._scroll_event(-3 if event.delta > 0 else 3))
+        tree.bind('<Button-4>', lambda event: self._scroll_event(-3))
+        tree.bind('<Button-5>', lambda event: self._scroll_event(3))
+        tree.bind('<Prior>', lambda event: self._scroll_event(-self._visible))
+        tree.bind('<Next>', lambda event: self._scroll_event(self._visible))
+        tree.bind('<Home>', lambda event: self._scroll_event(-len(self._order)))
+        tree.bind('<End>', lambda event: self._scroll_event(len(self._order)))
+        tree.bind('<Up>', lambda event: self._move_focus(-1))
+        tree.bind('<Down>', lambda event: self._move_focus(1))
+        tree.bind('<<TreeviewSelect>>', self._on_select)
+
+    def __len__(self):
+        """Rows shown after filtering."""
+        return len(self._order)
+
+    def refresh(self):
+        """Recompute the rows to show from the table and redraw the window."""
+        if not self.filter_text and self.sort_column is None:
+            # Every row in table order; nothing to read from the table
+            self._order = np.arange(len(self.table))
+            self.scroll_to(self._top)
+            return
+        frame = self.table.frame
+        rows = np.arange(len(frame))
+        if self.filter_text:
+            needle = self.filter_text.lower()
+            mask = np.zeros(len(frame), dtype=bool)
+            for column in self.columns:
+                text = frame[column].astype(str).str.lower()
+                mask |= text.str.contains(needle, regex=False).to_numpy(dtype=bool)
+            rows = rows[mask]
+        if self.sort_column is not None:
+            keys = frame[self.sort_column].iloc[rows].astype(str)
+            rows = keys.sort_values(ascending=not self.sort_descending, kind='stable').index.to_numpy()
+        self._order = rows
+        if self._selected:
+            self._selected &= set(rows.tolist())
+        self.scroll_to(self._top)
+
+    def rows_added(self):
+        """Show rows just appended to the table.
+
+        Without a filter or sort they simply go on the end of the rows
+        shown. With one, redoing it over the whole table for every chunk of
+        a load would be quadratic, so the new rows wait for the refresh()
+        at the end of the load.
+        """
+        if self.filter_text or self.sort_column is not None:
+            return
+        self._order = np.concatenate((self._order, np.arange(len(self._order), len(self.table))))
+        self.scroll_to(self._top)
+
+    def clear(self):
+        """Back to the top with nothing selected; call after table.clear()."""
+        self._top = 0
+        self._selected = set()
+        self.refresh()
+
+    def set_filter(self, text):
+        """Only show rows with text (ignoring case) in one of the columns."""
+        self.filter_text = text.strip()
+        self._top = 0
+        self.refresh()
+
+    def sort_by(self, column):
+        """Sort on a table column; sorting on it again reverses the order."""
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column, self.sort_descending = column, False
+        self._top = 0
+        for tree_column, table_column in zip(self.tree['columns'], self.columns):
+            text = self._headings[tree_column]
+            if table_column == column:
+                text += SORT_MARKERS[self.sort_descending]
+            self.tree.heading(tree_column, text=text)
+        self.refresh()
+
+    def selection(self):
+        """Table row numbers of the selected rows, in table order."""
+        return sorted(self._selected)
+
+    def scroll(self, rows):
+        self.scroll_to(self._top + rows)
+
+    def scroll_to(self, top):
+        """Show the rows from display position top on."""
+        self._top = max(0, min(top, len(self._order) - self._visible))
+        self._render()
+
+    def _render(self):
+        rows = self._order[self._top:self._top + self._visible + self.buffer]
+        items = self.tree.get_children()
+        # Recycle the items already there, only adding or dropping the
+        # difference when the window size changes
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+            items = items[:len(rows)]
+        for _ in range(len(rows) - len(items)):
+            self.tree.insert('', tk.END)
+        items = self.tree.get_children()
+        values = self.table.take(rows, self.columns) if len(rows) else ()
+        selected = []
+        self._item_rows = {}
+        for item, row, row_values in zip(items, rows.tolist(), values):
+            self.tree.item(item, values=row_values)
+            self._item_rows[item] = row
+            if row in self._selected:
+                selected.append(item)
+        self.tree.selection_set(selected)
+        self.tree.yview_moveto(0)
+        total = len(self._order)
+        if total:
+            self.scrollbar.set(self._top / total, min(1.0, (self._top + self._visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_select(self, event=None):
+        self._selected.difference_update(self._item_rows.values())
+        self._selected.update(self._item_rows[item] for item in self.tree.selection() if item in self._item_rows)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self._order)))
+        elif unit == 'pages':
+            self.scroll(int(amount) * self._visible)
+        else:
+            self.scroll(int(amount))
+
+    def _scroll_event(self, rows):
+        self.scroll(rows)
+        return 'break'
+
+    def _move_focus(self, step):
+        items = self.tree.get_children()
+        focus = self.tree.focus()
+        position = items.index(focus) if focus in items else 0
+        position += step
+        if position < 0:
+            self.scroll(-1)
+            position = 0
+        elif position >= min(self._visible, len(items)):
+            self.scroll(1)
+            position = min(self._visible, len(items)) - 1
+        items = self.tree.get_children()
+        if items:
+            item = items[max(0, position)]
+            self.tree.focus(item)
+            self.tree.selection_set(item)
+        return 'break'
+
+    def _row_height(self):
+        height = ttk.Style().lookup('Treeview', 'rowheight')
+        try:
+            return int(height)
+        except (TypeError, ValueError):
+            try:
+                return tkfont.nametofont('TkDefaultFont').metrics('linespace') + 4
+            except tk.TclError:
+                return DEFAULT_ROW_HEIGHT
+
+    def _on_configure(self, event):
+        # One row's worth of the height goes to the headings
+        visible = max(1, event.height // self._row_height() - 1)
+        if visible != self._visible:
+            self._visible = visible
+            self.scroll_to(self._top)
@@ -0,0 +1,122 @@
+"""Streaming reader for GR11/CW09 workbooks and CSVs.
+
+pd.read_excel() builds the whole sheet, and the openpyxl workbook behind it,
+before the first row can be shown; a season's worth of Greenhous deliveries
+runs to hundreds of megabytes that way. iter_sheet_chunks() opens .xlsx
+files read-only and hands out the rows of the first sheet as DataFrames of
+at most chunk_rows rows, so memory is bounded by the chunk size and the
+first chunk can be on screen (or in the output file) while the rest of the
+sheet is still being read.
+
+Every chunk has the same columns, taken from the header row, and object
+dtype: a cell keeps its own type instead of being upcast with the rest of
+its column, so a numeric chassis or ref no is written the same way whether
+or not some other row of the sheet is blank. Blank cells are None (NaN for
+CSVs). As with pd.read_excel(), whole-number floats become ints and blank
+rows after the last row with data are dropped.
+"""
+import os
+
+import pandas as pd
+
+# Rows per chunk: large enough for the column transforms to pay off, small
+# enough that the first rows appear straight away
+WORKBOOK_CHUNK_ROWS = 2000
+
+# Extensions openpyxl can stream; older .xls files are read whole by pandas
+STREAMED_EXTENSIONS = ('.xlsx', '.xlsm')
+
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+
+def _header(row):
+    """Column names from a header row: unnamed cells are "Unnamed: i" and
+    repeated names get ".1", ".2"... as pd.read_excel() names them."""
+    row = list(row)
+    while row and row[-1] is None:
+        row.pop()
+    columns = []
+    seen = {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _cell(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _iter_xlsx_chunks(source, chunk_rows):
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = _header(next(rows, ()))
+        width = len(columns)
+        chunk = []
+        yielded = False
+        # Blank rows are held back until a row with data follows them
+        blank_rows = 0
+        for row in rows:
+            if all(value is None or value == "" for value in row):
+                blank_rows += 1
+                continue
+            for _ in range(blank_rows):
+                chunk.append([None] * width)
+            blank_rows = 0
+            values = [_cell(value) for value in row[:width]]
+            if len(values) < width:
+                values.extend([None] * (width - len(values)))
+            chunk.append(values)
+            while len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk[:chunk_rows], columns=columns, dtype=object)
+                chunk = chunk[chunk_rows:]
+                yielded = True
+        if chunk or not yielded:
+            yield pd.DataFrame(chunk, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _iter_csv_chunks(source, chunk_rows):
+    yielded = False
+    try:
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=object):
+            yielded = True
+            yield chunk.reset_index(drop=True)
+    except pd.errors.EmptyDataError:
+        pass
+    if not yielded:
+        yield pd.DataFrame()
+
+
+def iter_sheet_chunks(source, chunk_rows=WORKBOOK_CHUNK_ROWS, filename=None):
+    """DataFrames of up to chunk_rows rows from the first sheet of source.
+
+    source is a path or a binary file object; filename gives the extension
+    when it's a file object (an upload, say). .csv files are read in chunks
+    by pandas, .xlsx/.xlsm files row by row through read-only openpyxl, and
+    anything else is read whole by pd.read_excel() and then cut into chunks.
+    At least one chunk is always yielded, so the columns are known even for
+    a sheet with only a header.
+    """
+    name = filename if filename is not None else source if isinstance(source, str) else ''
+    ext = os.path.splitext(name)[1].lower()
+    if ext == '.csv':
+        return _iter_csv_chunks(source, chunk_rows)
+    if ext in STREAMED_EXTENSIONS and OPENPYXL_AVAILABLE:
+        return _iter_xlsx_chunks(source, chunk_rows)
+    df = pd.read_excel(source)
+    return (df.iloc[start:start + chunk_rows].reset_index(drop=True)
+            for start in range(0, max(len(df), 1), chunk_rows))
@@ -0,0 +1,209 @@
+"""Streaming XLSX export of GR11/CW09 jobs for customers who want Excel.
+
+Building the workbook in pandas or a normal openpyxl Workbook keeps every
+cell in memory until it is saved. JobWorkbookWriter uses openpyxl's
+write-only mode instead: each row is written out to a temporary file per
+sheet as it is added, so memory stays flat however many jobs there are, and
+on close openpyxl zips the sheets into the workbook.
+
+Every sheet has the same fixed layout: a frozen header row of the CSV field
+names, fixed column widths (XLSX_COLUMN_WIDTHS), COLLECTION DATE and
+DELIVERY DATE as real dates shown dd/mm/yyyy and PRICE as a number to two
+places (a value that doesn't parse as one stays text, as in the CSV).
+Control characters, which can't be stored in a workbook, are dropped. With
+sheet_field set, the jobs are split into one sheet per value of that field,
+e.g. GR11 and GR15 by CUSTOMER REF.
+"""
+import re
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+from csv_export import atomic_file
+from job_record import CSV_FIELDNAMES, parse_job_date, parse_job_price
+
+# Title of the one sheet of an export that isn't split by a field
+XLSX_SHEET_TITLE = 'Jobs'
+# Title of the sheet for jobs with the split field blank
+XLSX_BLANK_SHEET_TITLE = 'No ref'
+
+XLSX_DATE_FIELDS = ('COLLECTION DATE', 'DELIVERY DATE')
+XLSX_PRICE_FIELD = 'PRICE'
+XLSX_DATE_FORMAT = 'dd/mm/yyyy'
+XLSX_PRICE_FORMAT = '#,##0.00'
+
+# Column widths in characters; every other column is XLSX_DEFAULT_WIDTH
+XLSX_DEFAULT_WIDTH = 14
+XLSX_COLUMN_WIDTHS = {
+    'VIN': 20,
+    'MODEL': 20,
+    'COLLECTION ADDR1': 30,
+    'COLLECTION ADDR2': 24,
+    'COLLECTION ADDR3': 24,
+    'COLLECTION ADDR4': 24,
+    'COLLECTION CONTACT NAME': 22,
+    'DELIVERY ADDR1': 30,
+    'DELIVERY ADDR2': 24,
+    'DELIVERY ADDR3': 24,
+    'DELIVERY ADDR4': 24,
+    'DELIVERY CONTACT NAME': 22,
+    'DELIVERY CONTACT PHONE': 18,
+    'SPECIAL INSTRUCTIONS': 40,
+}
+
+# Excel's limits on sheet titles
+_SHEET_TITLE_LENGTH = 31
+_SHEET_TITLE_INVALID = re.compile(r'[\[\]:*?/\\]')
+_HEADER_FONT = Font(bold=True)
+
+
+def sheet_title(value, taken=()):
+    """A valid sheet title for value, not the same (ignoring case) as any
+    in taken."""
+    title = _SHEET_TITLE_INVALID.sub('_', _text(value)).strip().strip("'")[:_SHEET_TITLE_LENGTH]
+    title = title or XLSX_BLANK_SHEET_TITLE
+    taken = {name.lower() for name in taken}
+    candidate = title
+    n = 1
+    while candidate.lower() in taken:
+        n += 1
+        suffix = f" ({n})"
+        candidate = title[:_SHEET_TITLE_LENGTH - len(suffix)] + suffix
+    return candidate
+
+
+def _text(value):
+    return ILLEGAL_CHARACTERS_RE.sub('', value)
+
+
+class JobWorkbookWriter:
+    """Streams job rows into an .xlsx workbook.
+
+    fields is the layout of the incoming row tuples (CSV_FIELDNAMES, or
+    JOB_FIELDS for the web app's AC01 CSVs); the workbook has the
+    CSV_FIELDNAMES columns. sheet_field ('CUSTOMER REF', say) splits the
+    rows into one sheet per value of that field, in title order. Use it as
+    a context manager: the workbook is written to path when the block exits
+    cleanly, and nothing is if it raises.
+    """
+
+    def __init__(self, path, fields=CSV_FIELDNAMES, sheet_field=None):
+        positions = {field: i for i, field in enumerate(fields)}
+        missing = [field for field in CSV_FIELDNAMES if field not in positions]
+        if missing:
+            raise ValueError(f"Rows have no {', '.join(missing)} field")
+        self.path = path
+        self.count = 0
+        self._positions = [positions[field] for field in CSV_FIELDNAMES]
+        self._sheet_position = positions[sheet_field] if sheet_field else None
+        self._kinds = [
+            'date' if field in XLSX_DATE_FIELDS else 'price' if field == XLSX_PRICE_FIELD else 'text'
+            for field in CSV_FIELDNAMES
+        ]
+        self._workbook = Workbook(write_only=True)
+        # Split field value -> its sheet
+        self._sheets = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def write_rows(self, rows):
+        """Add row tuples to the workbook."""
+        for _ in self.tee(rows):
+            pass
+
+    def tee(self, rows):
+        """Yield rows unchanged, adding each to the workbook on the way
+        past, e.g. write_csv(path, writer.tee(rows))."""
+        sheets = self._sheets
+        sheet_position = self._sheet_position
+        columns = tuple(zip(self._positions, self._kinds))
+        for row in rows:
+            key = row[sheet_position] if sheet_position is not None else None
+            sheet = sheets.get(key)
+            if sheet is None:
+                sheet = self._add_sheet(key)
+            cells = []
+            for position, kind in columns:
+                value = row[position]
+                if value is None or value == '':
+                    cells.append(None)
+                    continue
+                if type(value) is not str:
+                    value = str(value)
+                if kind == 'date':
+                    day = parse_job_date(value)
+                    if day is not None:
+                        cells.append(self._cell(sheet, day, XLSX_DATE_FORMAT))
+                        continue
+                elif kind == 'price':
+                    price = parse_job_price(value)
+                    if price is not None:
+                        cells.append(self._cell(sheet, price, XLSX_PRICE_FORMAT))
+                        continue
+                cells.append(_text(value))
+            sheet.append(cells)
+            self.count += 1
+            yield row
+
+    def close(self):
+        """Write the workbook to path; returns the number of rows written."""
+        if not self._sheets:
+            self._add_sheet(None)
+        workbook = self._workbook
+        for i, sheet in enumerate(sorted(self._sheets.values(), key=lambda sheet: sheet.title.lower())):
+            workbook.move_sheet(sheet.title, i - workbook.index(sheet))
+        with atomic_file(self.path, 'wb') as f:
+            workbook.save(f)
+        self._sheets = {}
+        return self.count
+
+    def abort(self):
+        """Drop what has been written; path is left as it was."""
+        for sheet in self._sheets.values():
+            # openpyxl only removes a sheet's temporary file on save (or at exit)
+            sheet.close()
+            sheet._writer.cleanup()
+        self._sheets = {}
+
+    @staticmethod
+    def _cell(sheet, value, number_format):
+        cell = WriteOnlyCell(sheet, value)
+        cell.number_format = number_format
+        return cell
+
+    def _add_sheet(self, key):
+        if self._sheet_position is None:
+            title = XLSX_SHEET_TITLE
+        else:
+            title = sheet_title('' if key is None else str(key), [sheet.title for sheet in self._sheets.values()])
+        sheet = self._sheets[key] = self._workbook.create_sheet(title)
+        # Layout has to be set before the first row is written
+        sheet.freeze_panes = 'A2'
+        for i, field in enumerate(CSV_FIELDNAMES, 1):
+            sheet.column_dimensions[get_column_letter(i)].width = XLSX_COLUMN_WIDTHS.get(field, XLSX_DEFAULT_WIDTH)
+        header = []
+        for field in CSV_FIELDNAMES:
+            cell = WriteOnlyCell(sheet, field)
+            cell.font = _HEADER_FONT
+            header.append(cell)
+        sheet.append(header)
+        return sheet
+
+
+def write_xlsx(path, rows, fields=CSV_FIELDNAMES, sheet_field=None):
+    """Write row tuples of fields to an .xlsx workbook at path, atomically
+    (see JobWorkbookWriter); returns the number of rows written."""
+    with JobWorkbookWriter(path, fields, sheet_field) as writer:
+        writer.write_rows(rows)
+    return writer.count
@@ -0,0 +1,94 @@
+"""The business-day calendar: the ordinal index and its vectorised form."""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from business_days import BusinessCalendar, add_business_days, add_business_days_array
+from greenhous import offset_dates
+
+# Christmas Day, Boxing Day (a Saturday, so not a weekday holiday) and the
+# substitute day after it
+HOLIDAYS = [date(2027, 12, 25), date(2027, 12, 26), date(2027, 12, 27), date(2027, 12, 28)]
+
+
+def fixed_holidays(first_year, last_year):
+    return [day for day in HOLIDAYS if first_year <= day.year <= last_year]
+
+
+@pytest.fixture
+def calendar():
+    return BusinessCalendar(2027, 2027, holiday_source=fixed_holidays)
+
+
+def test_weekends_and_holidays_are_skipped(calendar):
+    # Friday -> Monday
+    assert calendar.add_business_days(date(2027, 12, 3), 1) == date(2027, 12, 6)
+    # Thursday 23rd -> Friday 24th -> (holidays to Tuesday 28th) -> Wednesday 29th
+    assert calendar.add_business_days(date(2027, 12, 23), 2) == date(2027, 12, 29)
+    # The day itself never counts, even on a weekend
+    assert calendar.add_business_days(date(2027, 12, 4), 1) == date(2027, 12, 6)
+    assert not calendar.is_business_day(date(2027, 12, 27))
+    assert calendar.is_business_day(date(2027, 12, 29))
+
+
+def test_datetime_keeps_its_time(calendar):
+    assert calendar.add_business_days(datetime(2027, 12, 3, 14, 30), 1) == datetime(2027, 12, 6, 14, 30)
+
+
+def test_dates_outside_the_range_grow_it(calendar):
+    assert calendar.add_business_days(date(2029, 6, 1), 1) == date(2029, 6, 4)
+    assert calendar.first_year == 2027 and calendar.last_year >= 2029
+
+
+def test_count_must_be_positive(calendar):
+    with pytest.raises(ValueError):
+        calendar.add_business_days(date(2027, 1, 4), 0)
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 5, 30])
+def test_array_matches_scalar_for_every_day(calendar, count):
+    days = [date(2027, 1, 1) + timedelta(days=n) for n in range(365)]
+    shifted = calendar.add_business_days_array(days, count)
+    assert [day.item() for day in shifted] == [calendar.add_business_days(day, count) for day in days]
+
+
+def test_array_on_the_uk_calendar_matches_scalar():
+    days = pd.Series(pd.date_range(date.today() - timedelta(days=400), periods=800), index=range(10, 810))
+    shifted = add_business_days_array(days, 3)
+    assert list(shifted.index) == list(days.index)
+    assert [day.date() for day in shifted] == [add_business_days(day.date(), 3) for day in days]
+
+
+def test_array_keeps_nat(calendar):
+    shifted = calendar.add_business_days_array(np.array(['2027-12-03', 'NaT'], dtype='datetime64[D]'), 1)
+    assert shifted[0] == np.datetime64('2027-12-06')
+    assert np.isnat(shifted[1])
+
+
+def test_gr_due_dates_offset_as_a_column():
+    dates = pd.Series(['24/12/2025', 'TBC', '', '27/12/2025', '24/12/2025'], index=[4, 5, 6, 7, 8])
+    expected = [add_business_days(datetime.strptime(text, '%d/%m/%Y'), 1).strftime('%d/%m/%Y')
+                if '/' in text else text for text in dates]
+    result = offset_dates(dates, 1)
+    assert result.tolist() == expected
+    assert list(result.index) == list(dates.index)
+
+
+def walk(day, count, holidays):
+    """add_business_days the way the parsers used to do it, a day at a time."""
+    while count:
+        day += timedelta(days=1)
+        if day.weekday() < 5 and day not in holidays:
+            count -= 1
+    return day
+
+
+@pytest.mark.parametrize('count', [1, 3, 10])
+def test_index_matches_day_by_day_walk(calendar, count):
+    holidays = set(HOLIDAYS)
+    for n in range(365):
+        day = date(2027, 1, 1) + timedelta(days=n)
+        assert calendar.is_business_day(day) == (day.weekday() < 5 and day not in holidays)
+        assert calendar.add_business_days(day, count) == walk(day, count, holidays)
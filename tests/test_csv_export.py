@@ -0,0 +1,77 @@
+"""Atomic job CSVs."""
+import csv
+import os
+import stat
+
+import pandas as pd
+import pytest
+
+from csv_export import DEFAULT_FILE_MODE, atomic_file, frame_rows, job_rows, write_csv, write_jobs_csv
+from job_record import CSV_FIELDNAMES, JOB_DEFAULTS, JobRecord
+
+
+def make_job(**values):
+    job = dict(JOB_DEFAULTS)
+    job.update({field.replace('_', ' '): value for field, value in values.items()})
+    return job
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def test_jobs_csv_matches_dictwriter(tmp_path):
+    jobs = [JobRecord(make_job(REG_NUMBER='AB12CDE', COLOR='Blue', SPECIAL_INSTRUCTIONS='Call, then "wait"\nGate 2')),
+            make_job(REG_NUMBER='CD34EFG', PRICE='95.50')]
+    path = tmp_path / 'jobs.csv'
+    assert write_jobs_csv(path, jobs) == 2
+    expected = tmp_path / 'expected.csv'
+    with open(expected, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(dict(job) for job in jobs)
+    assert path.read_bytes() == expected.read_bytes()
+
+
+def test_rows_in_field_order():
+    job = make_job(REG_NUMBER='AB12CDE', PRICE='120.00')
+    fields = ['PRICE', 'REG NUMBER']
+    assert list(job_rows([JobRecord(job), job], fields)) == [('120.00', 'AB12CDE')] * 2
+
+
+def test_frame_rows():
+    frame = pd.DataFrame([make_job(REG_NUMBER='AB12CDE')])
+    assert list(frame_rows([frame, frame], ['REG NUMBER', 'VIN'])) == [('AB12CDE', '')] * 2
+
+
+def test_failed_write_leaves_the_old_file(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    path.write_text('old\n')
+
+    def rows():
+        yield ('AB12CDE',)
+        raise RuntimeError('parse failed')
+
+    with pytest.raises(RuntimeError):
+        write_csv(path, rows(), ['REG NUMBER'])
+    assert path.read_text() == 'old\n'
+    assert os.listdir(tmp_path) == ['jobs.csv']
+
+
+def test_replacing_keeps_the_permissions(tmp_path):
+    path = tmp_path / 'jobs.csv'
+    write_csv(path, [('AB12CDE',)], ['REG NUMBER'])
+    assert stat.S_IMODE(os.stat(path).st_mode) == DEFAULT_FILE_MODE
+    os.chmod(path, 0o600)
+    assert write_csv(path, [('CD34EFG',), ('EF56GHI',)], ['REG NUMBER']) == 2
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert read_rows(path) == [['REG NUMBER'], ['CD34EFG'], ['EF56GHI']]
+
+
+def test_atomic_file_creates_the_directory(tmp_path):
+    path = tmp_path / 'jobs' / 'AC01' / 'jobs.bin'
+    with atomic_file(path, 'wb') as f:
+        f.write(b'data')
+        assert not path.exists()
+    assert path.read_bytes() == b'data'
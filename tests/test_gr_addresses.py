@@ -0,0 +1,37 @@
+"""Greenhous delivery-address splitting against the golden set.
+
+benchmarks/gr_address_golden.json pins how each address is split into
+ADDR1-4 and a postcode (written from the per-row split process_gr_jobs used
+to run), so a speedup can't change how addresses are assigned.
+"""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from greenhous import DELIVERY_ADDRESS_FIELDS, DeliveryAddressSplitter
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks',
+                           'gr_address_golden.json')
+
+with open(GOLDEN_PATH, encoding='utf-8') as f:
+    GOLDEN = json.load(f)
+
+
+@pytest.mark.parametrize('address, expected', GOLDEN, ids=[repr(address) for address, _ in GOLDEN])
+def test_split_matches_golden(address, expected):
+    assert list(DeliveryAddressSplitter().split(address)) == expected
+
+
+def test_split_column_matches_golden():
+    # Every address twice, out of order, plus a missing cell, so the memo
+    # and the factorized lookup are both exercised
+    addresses = [address for address, _ in GOLDEN]
+    column = pd.Series(addresses + addresses[::-1] + [None], index=range(100, 100 + 2 * len(addresses) + 1))
+    expected = [split for _, split in GOLDEN]
+    expected = expected + expected[::-1] + [["", "", "", "", ""]]
+    result = DeliveryAddressSplitter().split_column(column)
+    assert list(result.columns) == list(DELIVERY_ADDRESS_FIELDS)
+    assert list(result.index) == list(column.index)
+    assert [list(row) for row in result.itertuples(index=False, name=None)] == expected
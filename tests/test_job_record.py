@@ -0,0 +1,114 @@
+"""JobRecord behaves like the dict of 26 fields it replaced; job dates and prices."""
+import csv
+import io
+import pickle
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from job_record import (CSV_FIELDNAMES, JOB_DEFAULTS, JOB_FIELDS, JobRecord, parse_job_date, parse_job_price,
+                        values_getter)
+
+
+def make_job(**values):
+    job = dict(JOB_DEFAULTS)
+    job.update({field.replace('_', ' '): value for field, value in values.items()})
+    return job
+
+
+def test_reads_like_the_dict():
+    fields = make_job(REG_NUMBER='AB12CDE', COLLECTION_DATE='01/02/2027', PRICE='120.00')
+    job = JobRecord(fields)
+    assert dict(job) == fields
+    assert list(job) == list(JOB_FIELDS)
+    assert len(job) == len(JOB_FIELDS)
+    assert job['REG NUMBER'] == 'AB12CDE'
+    assert job.get('VIN') == ''
+    assert job.get('NOT A FIELD', 'x') == 'x'
+    assert 'PRICE' in job and 'NOT A FIELD' not in job
+    assert job == fields
+
+
+def test_missing_fields_default_to_empty():
+    assert dict(JobRecord({'MAKE': 'FORD'})) == make_job(MAKE='FORD')
+    assert dict(JobRecord()) == JOB_DEFAULTS
+
+
+def test_fields_are_fixed():
+    job = JobRecord()
+    job['MODEL'] = 'Focus'
+    assert job['MODEL'] == 'Focus'
+    with pytest.raises(KeyError):
+        job['NOT A FIELD'] = 'x'
+    with pytest.raises(KeyError):
+        job['NOT A FIELD']
+    with pytest.raises(KeyError):
+        JobRecord({'NOT A FIELD': 'x'})
+    with pytest.raises(TypeError):
+        del job['MODEL']
+
+
+def test_repeated_values_are_shared():
+    # Built from separate strings, as read back from a sheet or the Treeview
+    first = JobRecord({'CUSTOMER REF': ''.join(['GR', '11']), 'REG NUMBER': ''.join(['AB12', 'CDE'])})
+    second = JobRecord({'CUSTOMER REF': ''.join(['GR', '1', '1'])})
+    assert first['CUSTOMER REF'] is second['CUSTOMER REF']
+    second['CUSTOMER REF'] = ''.join(['GR', '15'])
+    assert second['CUSTOMER REF'] is JobRecord.from_values([''.join(['GR', '15'])] * len(JOB_FIELDS))['CUSTOMER REF']
+    # Per-job values aren't
+    assert first['REG NUMBER'] is not JobRecord({'REG NUMBER': ''.join(['AB1', '2CDE'])})['REG NUMBER']
+
+
+def test_values_copy_and_pickle():
+    job = JobRecord(make_job(REG_NUMBER='AB12CDE', TRANSPORT_TYPE='Trade Plate'))
+    values = job.values_tuple()
+    assert values == tuple(job[field] for field in JOB_FIELDS)
+    assert JobRecord.from_values(values) == job
+    copy = job.copy()
+    copy['REG NUMBER'] = 'CD34EFG'
+    assert job['REG NUMBER'] == 'AB12CDE'
+    assert pickle.loads(pickle.dumps(job)) == job
+
+
+def test_values_getter():
+    job = JobRecord(make_job(REG_NUMBER='AB12CDE', PRICE='120.00'))
+    assert values_getter(CSV_FIELDNAMES)(job) == tuple(job[field] for field in CSV_FIELDNAMES)
+    assert values_getter(['PRICE'])(job) == ('120.00',)
+
+
+def test_dictwriter():
+    job = JobRecord(make_job(REG_NUMBER='AB12CDE', COLOR='Blue'))
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDNAMES, extrasaction='ignore')
+    writer.writerow(job)
+    assert out.getvalue().startswith('AB12CDE,')
+    assert 'Blue' not in out.getvalue()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('06/01/2025', date(2025, 1, 6)),
+    (' 31/12/2027 ', date(2027, 12, 31)),
+    # CW09 sheets give ISO dates, sometimes with a time
+    ('2025-01-06', date(2025, 1, 6)),
+    ('2025-01-06 00:00:00', date(2025, 1, 6)),
+    ('31/02/2025', None),
+    ('TBC', None),
+    ('', None),
+])
+def test_parse_job_date(text, expected):
+    assert parse_job_date(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('120', Decimal('120.00')),
+    ('£1,250.5', Decimal('1250.50')),
+    (' 95.555 ', Decimal('95.56')),
+    ('99999999.99', Decimal('99999999.99')),
+    ('100000000', None),
+    ('NaN', None),
+    ('TBC', None),
+    ('', None),
+])
+def test_parse_job_price(text, expected):
+    assert parse_job_price(text) == expected
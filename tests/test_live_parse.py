@@ -0,0 +1,110 @@
+"""Background parsing of the AC01/BC04 tabs."""
+import time
+
+import pytest
+
+import live_parse
+from bench_parsers import make_ac01_text, make_bc04_text
+from job_parser_core import MAX_JOB_CHARS, BC04Parser, JobParser
+from live_parse import LiveParser, preview_job
+
+DATES = ("01/01/2025", "06/01/2025")
+
+
+def wait(live, timeout=30):
+    deadline = time.monotonic() + timeout
+    while live.busy:
+        assert time.monotonic() < deadline, "live parse didn't finish"
+        time.sleep(0.01)
+    return live.latest()
+
+
+@pytest.fixture
+def parsed_blocks(monkeypatch):
+    """The job texts the live parser sends to the parser, in order."""
+    blocks = []
+    parse_job_text = live_parse.parse_job_text
+
+    def counting(parser, index, block):
+        blocks.append(block)
+        return parse_job_text(parser, index, block)
+
+    monkeypatch.setattr(live_parse, 'parse_job_text', counting)
+    return blocks
+
+
+@pytest.mark.parametrize('job_type, parser_class, text', [
+    ('AC01', JobParser, make_ac01_text(30)),
+    ('BC04', BC04Parser, make_bc04_text(30)),
+])
+def test_matches_a_full_parse(job_type, parser_class, text):
+    live = LiveParser(job_type)
+    assert live.latest() is None
+    live.submit(text, *DATES)
+    result = wait(live)
+    expected = parser_class(*DATES).parse_jobs(text)
+    assert result.text == text and (result.collection_date, result.delivery_date) == DATES
+    assert result.jobs == expected
+    assert result.previews == [preview_job(number, job) for number, job in enumerate(expected, 1)]
+    assert result.quarantined == []
+
+
+def test_result_for_the_same_text_only():
+    text = make_ac01_text(5)
+    live = LiveParser('AC01')
+    live.submit(text, *DATES)
+    wait(live)
+    jobs, quarantined = live.result_for(text, *DATES)
+    assert jobs == live.latest().jobs and quarantined == []
+    # Copies, so exporting can't change the parse
+    jobs[0]['REG NUMBER'] = 'CHANGED'
+    assert live.latest().jobs[0]['REG NUMBER'] != 'CHANGED'
+    assert live.result_for(text + "\n", *DATES) is None
+    assert live.result_for(text, "02/01/2025", DATES[1]) is None
+
+
+def test_only_changed_blocks_are_parsed_again(parsed_blocks):
+    text = make_ac01_text(20)
+    live = LiveParser('AC01')
+    live.submit(text, *DATES)
+    wait(live)
+    first = len(parsed_blocks)
+    assert first >= 20
+
+    edited = text.replace("Please call ahead", "Please call ahead twice", 1)
+    assert edited != text
+    live.submit(edited, *DATES)
+    result = wait(live)
+    assert len(parsed_blocks) == first + 1
+    assert result.jobs == JobParser(*DATES).parse_jobs(edited)
+
+    # New dates make every block a new job
+    live.submit(edited, "02/01/2025", DATES[1])
+    wait(live)
+    assert len(parsed_blocks) == 2 * first + 1
+
+
+def test_newest_text_wins():
+    texts = [make_ac01_text(200, seed=seed) for seed in (1, 2, 3)]
+    live = LiveParser('AC01')
+    for text in texts:
+        live.submit(text, *DATES)
+    result = wait(live)
+    assert result.text == texts[-1]
+    assert result.jobs == JobParser(*DATES).parse_jobs(texts[-1])
+
+
+def test_oversize_job_is_quarantined():
+    job = "FROM\nDepot\nB1 1AA\nTO\nCustomer\nLS11 5TT\nMAKE MODEL COLOUR REGISTRATION CHASSIS\nFORD FOCUS Blue AB12CDE X\n"
+    huge = "FROM\n" + "x\n" * (MAX_JOB_CHARS // 2 + 1) + "TO\nY\n"
+    live = LiveParser('AC01')
+    live.submit(job + "\n" + huge + "\n" + job, *DATES)
+    result = wait(live)
+    assert len(result.jobs) == 2
+    assert [problem.index for problem in result.quarantined] == [1]
+
+
+def test_preview_lists_missing_fields():
+    preview = preview_job(3, {'REG NUMBER': 'AB12CDE', 'COLLECTION ADDR1': 'Depot', 'DELIVERY POSTCODE': ' '})
+    assert preview.number == 3 and preview.reg == 'AB12CDE'
+    assert preview.missing == ('collection postcode', 'delivery address', 'delivery postcode')
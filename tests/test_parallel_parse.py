@@ -0,0 +1,34 @@
+"""Parsing on a process pool, with the app log in use.
+
+Pool workers are forked from a process whose log may have a writer thread
+and queued records; a worker must never wait on that log, and the jobs must
+come out as the serial parse gives them.
+"""
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+SCRIPT = '''
+from debug_log import app_log
+from job_parser_core import JobParser
+
+job = ("FROM\\nDepot\\nB1 1AA\\nTO\\nCustomer\\nLS11 5TT\\n"
+       "MAKE MODEL COLOUR REGISTRATION CHASSIS\\nFORD FOCUS Blue AB%02dCDE X\\n")
+text = "\\n".join(job % (i % 100) for i in range(4000))
+app_log.info("hello")
+for time_budget in (None, 0):
+    parser = JobParser("01/01/2025", time_budget=time_budget)
+    serial = [dict(job) for job in parser.iter_jobs(text)]
+    app_log.warning("parsing on a pool")
+    parallel = [dict(job) for job in parser.iter_jobs(text, workers=2, chunk_size=500, min_jobs=100)]
+    assert len(serial) == 4000, len(serial)
+    assert parallel == serial
+'''
+
+
+def test_parallel_parse_after_logging():
+    # In a subprocess, so a hang fails the test instead of the whole run
+    result = subprocess.run([sys.executable, '-c', SCRIPT], cwd=SRC, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
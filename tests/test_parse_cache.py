@@ -0,0 +1,101 @@
+"""The parse cache: what its keys depend on, its tiers and its use by the parsers."""
+import importlib.util
+import os
+import shutil
+
+import parse_cache
+from bench_parsers import make_ac01_text
+from job_parser_core import JobParser
+from job_record import JobRecord
+from parse_cache import RULE_MODULES, ParseCache, rules_fingerprint
+
+SRC_DIR = os.path.dirname(os.path.abspath(parse_cache.__file__))
+
+
+def load_copy(directory):
+    """parse_cache loaded from a copy of the sources in directory."""
+    for name in ('parse_cache',) + RULE_MODULES:
+        shutil.copy(os.path.join(SRC_DIR, name + '.py'), directory)
+    spec = importlib.util.spec_from_file_location('parse_cache_copy', os.path.join(directory, 'parse_cache.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_editing_a_rule_module_changes_the_fingerprint(tmp_path):
+    copy = load_copy(tmp_path)
+    assert copy.rules_fingerprint() == rules_fingerprint()
+    for name in RULE_MODULES:
+        path = tmp_path / (name + '.py')
+        source = path.read_bytes()
+        path.write_bytes(source + b'\n# edited\n')
+        assert copy.rules_fingerprint() != rules_fingerprint()
+        path.write_bytes(source)
+    assert copy.rules_fingerprint() == rules_fingerprint()
+
+
+def test_key_covers_parser_dates_text_and_rules():
+    cache = ParseCache()
+    key = cache.key('JobParser', '01/01/2025', '06/01/2025', 'FROM\nDepot')
+    assert key == ParseCache().key('JobParser', '01/01/2025', '06/01/2025', 'FROM\nDepot')
+    assert len({
+        key,
+        cache.key('BC04Parser', '01/01/2025', '06/01/2025', 'FROM\nDepot'),
+        cache.key('JobParser', '02/01/2025', '06/01/2025', 'FROM\nDepot'),
+        cache.key('JobParser', '01/01/2025', '07/01/2025', 'FROM\nDepot'),
+        cache.key('JobParser', '01/01/2025', '06/01/2025', 'FROM\nDepot '),
+        # The separators keep the parts apart
+        cache.key('JobParser', '01/01/2025', '06/01/2025\x1fFROM', '\nDepot'),
+    }) == 6
+    cache.fingerprint = 'other rules'
+    assert cache.key('JobParser', '01/01/2025', '06/01/2025', 'FROM\nDepot') != key
+
+
+def test_get_hands_out_copies():
+    cache = ParseCache()
+    job = JobRecord({'REG NUMBER': 'AB12CDE'})
+    cache.put('job', job)
+    cache.put('not a job', None)
+    found, first = cache.get('job')
+    assert found and first == job
+    first['REG NUMBER'] = 'CD34EFG'
+    assert cache.get('job') == (True, job)
+    assert cache.get('not a job') == (True, None)
+    assert cache.get('missing') == (False, None)
+    assert cache.stats() == {'hits': 3, 'disk_hits': 0, 'misses': 1, 'entries': 2}
+
+
+def test_memory_tier_is_bounded():
+    cache = ParseCache(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, None)
+    assert not cache.get('a')[0]
+    assert cache.get('b')[0] and cache.get('c')[0]
+
+
+def test_disk_tier(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    job = JobRecord({'REG NUMBER': 'AB12CDE'})
+    cache = ParseCache(path=path)
+    cache.put('job', job)
+    cache.flush()
+    reopened = ParseCache(path=path)
+    assert reopened.get('job') == (True, job)
+    assert reopened.stats()['disk_hits'] == 1
+    reopened.invalidate()
+    assert ParseCache(path=path).get('job') == (False, None)
+
+
+def test_parser_with_cache_matches_uncached():
+    text = make_ac01_text(40)
+    expected = JobParser("01/01/2025", "06/01/2025").parse_jobs(text)
+    cache = ParseCache()
+    first = JobParser("01/01/2025", "06/01/2025", cache=cache).parse_jobs(text)
+    misses = cache.stats()['misses']
+    again = JobParser("01/01/2025", "06/01/2025", cache=cache).parse_jobs(text)
+    assert first == expected and again == expected
+    assert cache.stats()['misses'] == misses
+    # Other dates are other keys
+    moved = JobParser("02/01/2025", "06/01/2025", cache=cache).parse_jobs(text)
+    assert cache.stats()['misses'] == 2 * misses
+    assert moved == JobParser("02/01/2025", "06/01/2025").parse_jobs(text)
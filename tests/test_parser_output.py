@@ -0,0 +1,91 @@
+"""Parser output against the code each speedup replaced.
+
+tests/parser_golden.json holds generated AC01 and BC04 pastes (see
+bench_parsers.py) and the jobs the original JobParser and BC04Parser, as
+they were in vehicle_transport_parser.py, made of them. The Greenhous and
+CW09 loaders are checked against the row-by-row loops their benchmarks keep
+(bench_greenhous.legacy_rows, bench_cw09.legacy_jobs), and the streamed
+workbook reader against reading the whole sheet.
+"""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from bench_cw09 import legacy_jobs, make_sheet as make_cw09_sheet
+from bench_greenhous import legacy_rows, make_sheet as make_gr_sheet
+from cw09 import cw_job_frame
+from greenhous import GR_REQUIRED_COLUMNS, find_columns, gr_preview_frame, iter_gr_preview_frames
+from job_parser_core import BC04Parser, JobParser
+from job_record import JOB_FIELDS
+from phones import normalize_phone
+from workbooks import iter_sheet_chunks
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_golden.json')
+
+with open(GOLDEN_PATH, encoding='utf-8') as f:
+    GOLDEN = json.load(f)
+
+PARSERS = {
+    'AC01': lambda: JobParser("01/01/2025", "06/01/2025"),
+    'BC04': lambda: BC04Parser("01/01/2025", "02/01/2025"),
+}
+
+# BC04 phones were copied through as raw digit runs until every job type
+# went through phones.normalize_phone()
+NORMALIZED_PHONES = {'BC04': ('COLLECTION PHONE', 'DELIVERY CONTACT PHONE')}
+
+
+def expected_jobs(case):
+    jobs = [dict(zip(GOLDEN['fields'], values)) for values in case['jobs']]
+    for job in jobs:
+        for field in NORMALIZED_PHONES.get(case['parser'], ()):
+            job[field] = normalize_phone(job[field])
+    return jobs
+
+
+def test_golden_fields():
+    assert GOLDEN['fields'] == list(JOB_FIELDS)
+
+
+@pytest.mark.parametrize('case', GOLDEN['cases'], ids=[case['name'] for case in GOLDEN['cases']])
+def test_text_parser_matches_golden(case):
+    jobs = PARSERS[case['parser']]().parse_jobs(case['text'])
+    assert [dict(job) for job in jobs] == expected_jobs(case)
+
+
+@pytest.mark.parametrize('datetimes', [False, True], ids=['mixed dates', 'datetime64 dates'])
+def test_gr_preview_matches_row_loop(datetimes):
+    df = make_gr_sheet(500)
+    if datetimes:
+        # A sheet whose due dates are all real dates loads as datetime64
+        df = df.assign(**{'Delivery Due Date': pd.to_datetime(
+            df['Delivery Due Date'].where(df['Delivery Due Date'] != "TBC"))})
+    columns, missing = find_columns(df, GR_REQUIRED_COLUMNS)
+    assert not missing
+    rows = list(gr_preview_frame(df, columns).itertuples(index=False, name=None))
+    assert rows == legacy_rows(df, columns)
+
+
+def test_cw09_jobs_match_row_loop():
+    df = make_cw09_sheet(500)
+    jobs = list(cw_job_frame(df)[list(JOB_FIELDS)].itertuples(index=False, name=None))
+    assert jobs == legacy_jobs(df)
+
+
+@pytest.mark.parametrize('extension', ['.xlsx', '.csv'])
+def test_streamed_sheet_matches_whole_sheet(tmp_path, extension):
+    df = make_gr_sheet(500)
+    path = str(tmp_path / ('sheet' + extension))
+    if extension == '.csv':
+        df.to_csv(path, index=False)
+        whole = pd.read_csv(path)
+    else:
+        df.to_excel(path, index=False)
+        whole = pd.read_excel(path)
+    columns, _ = find_columns(whole, GR_REQUIRED_COLUMNS)
+    expected = list(gr_preview_frame(whole, columns).itertuples(index=False, name=None))
+    rows = [row for preview in iter_gr_preview_frames(iter_sheet_chunks(path, chunk_rows=64))
+            for row in preview.itertuples(index=False, name=None)]
+    assert rows == expected
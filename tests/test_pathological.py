@@ -0,0 +1,73 @@
+"""Worst-case input checks for the AC01 and BC04 text parsers.
+
+The hostile pastes are bench_pathological.CORPUS. Each must parse at
+MAX_JOB_CHARS well inside MAX_SECONDS, a bound loose enough for any machine
+but far below what anything quadratic takes at that size (the benchmark
+measures how the time grows), and still find what it holds. A job over
+MAX_JOB_CHARS must be quarantined without losing the jobs around it. The
+time budget only warns, so a slow job is still returned.
+"""
+import time
+
+import pytest
+
+import job_parser_core
+from bench_pathological import CORPUS, VEHICLE_HEADER, build
+from job_parser_core import BC04Parser, JobParser
+
+# About 0.1s here for the slowest case; quadratic scans take minutes
+MAX_SECONDS = 5
+
+# What some of the cases must still parse to, however long they are
+EXPECTED = {
+    "ac01 blank lines": {'REG NUMBER': 'AB12CDE', 'MAKE': 'FORD', 'MODEL': 'FOCUS', 'COLOR': 'Blue'},
+    "ac01 huge comments": {'REG NUMBER': 'AB12CDE', 'MAKE': 'FORD', 'MODEL': 'FOCUS'},
+    "ac01 many tel lines": {'COLLECTION PHONE': '1217886940', 'DELIVERY ADDR1': 'x'},
+    "ac01 many address lines": {'DELIVERY POSTCODE': 'B1 1AA', 'COLLECTION ADDR1': 'Depot'},
+    "ac01 repeated model": {'MODEL': 'A'},
+    "bc04 repeated job number": {'REG NUMBER': 'AB12CDE'},
+    "bc04 digit run before a dot": {'REG NUMBER': 'AB12CDE', 'VIN': '123456789'},
+    "bc04 repeated reg": {'REG NUMBER': 'AB12CDE'},
+    "bc04 repeated special instructions": {'REG NUMBER': 'AB12CDE', 'VIN': '1234567890'},
+    "bc04 many address lines": {'REG NUMBER': 'AB12CDE', 'VIN': '1234567890'},
+    "bc04 long phone line": {'REG NUMBER': 'AB12CDE', 'COLLECTION PHONE': '1234567800'},
+}
+
+JOB = "FROM\nDepot\nB1 1AA\nTO\nCustomer\nLS11 5TT\n" + VEHICLE_HEADER + "FORD FOCUS Blue AB12CDE X\n"
+
+
+@pytest.mark.parametrize('name', sorted(CORPUS))
+def test_worst_case_parse_time(name):
+    parser_class, make_job = CORPUS[name]
+    job_text = build(make_job, job_parser_core.MAX_JOB_CHARS)
+    # Straight to _parse_job_text so the limits don't apply
+    parser = parser_class("01/01/2025", "02/01/2025")
+    start = time.perf_counter()
+    job = parser._parse_job_text(job_text)
+    elapsed = time.perf_counter() - start
+    assert elapsed < MAX_SECONDS
+    expected = EXPECTED.get(name, {})
+    assert {field: job[field] for field in expected} == expected
+
+
+def test_oversize_job_is_quarantined():
+    huge = "FROM\n" + "x\n" * (job_parser_core.MAX_JOB_CHARS // 2 + 1) + "TO\nY\n"
+    parser = JobParser("01/01/2025")
+    jobs = parser.parse_jobs(JOB + "\n" + huge + "\n" + JOB)
+    assert len(jobs) == 2
+    assert [problem.index for problem in parser.quarantined] == [1]
+    assert "the limit is" in parser.quarantined[0].reason
+
+
+def test_oversize_bc04_job_is_quarantined():
+    parser = BC04Parser("01/01/2025", max_job_chars=1_000)
+    parser.parse_jobs("AB12CDE " * 200)
+    assert len(parser.quarantined) == 1
+    assert "the limit is 1000" in parser.quarantined[0].reason
+
+
+def test_job_over_time_budget_is_kept():
+    parser = JobParser("01/01/2025", time_budget=0)
+    jobs = parser.parse_jobs(JOB)
+    assert len(jobs) == 1
+    assert parser.quarantined == []
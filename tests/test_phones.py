@@ -0,0 +1,42 @@
+"""Phone normalisation, one value at a time and a column at a time."""
+import pandas as pd
+import pytest
+
+from phones import normalize_phone, normalize_phones
+
+CASES = [
+    ('0121 788 6940', '1217886940'),
+    ('+44 (0)121 788 6940', '1217886940'),
+    ('0044 121 788 6940', '1217886940'),
+    ('44 121 788 6940', '1217886940'),
+    ('Tel: 07700 900123', '7700900123'),
+    ('1217886940', '1217886940'),
+    # Spreadsheet cells read as floats
+    (1217886940.0, '1217886940'),
+    ('1217886940.0', '1217886940'),
+    # Cut or padded to ten digits
+    ('0121 788', '1217880000'),
+    ('012345678901234', '1234567890'),
+    ('n/a', ''),
+    ('', ''),
+    (None, ''),
+    (float('nan'), ''),
+]
+
+
+@pytest.mark.parametrize('phone, expected', CASES)
+def test_normalize_phone(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+@pytest.mark.parametrize('phone, expected', CASES)
+def test_normalizing_twice_changes_nothing(phone, expected):
+    assert normalize_phone(normalize_phone(phone)) == expected
+
+
+def test_column_matches_scalar():
+    phones = [phone for phone, _ in CASES]
+    column = pd.Series(phones, index=range(50, 50 + len(phones)), dtype=object)
+    result = normalize_phones(column)
+    assert list(result.index) == list(column.index)
+    assert result.tolist() == [expected for _, expected in CASES]
@@ -0,0 +1,45 @@
+"""UK postcode recognition: whole lines, postcodes in text and columns."""
+import pandas as pd
+import pytest
+
+from postcodes import find_postcode, normalize_postcodes, parse_postcode_line, split_postcode
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('LS11 5TT', 'LS11 5TT'),
+    ('  ls115tt ', 'LS11 5TT'),
+    ('Postcode: B1 1AA', 'B1 1AA'),
+    ('P/Code ox255ha', 'OX25 5HA'),
+    ('EC1A 1BB', 'EC1A 1BB'),
+    # The label is case-sensitive, as the AC01 parser always had it
+    ('postcode: B1 1AA', None),
+    ('LS11 5TT Leeds', None),
+    ('Leeds', None),
+])
+def test_parse_postcode_line(line, expected):
+    assert parse_postcode_line(line) == expected
+
+
+def test_find_postcode():
+    assert find_postcode('12 High St, Leeds ls11 5tt, UK') == 'LS11 5TT'
+    assert find_postcode('Unit 4, W1A 0AX and SW1A 1AA') == 'W1A 0AX'
+    assert find_postcode('84-90B69 2EX') is None
+    assert find_postcode('no postcode here') is None
+
+
+def test_split_postcode():
+    assert split_postcode('1 High Street, Leeds, LS1 4BB') == ('LS1 4BB', '1 High Street, Leeds, ')
+    assert split_postcode('no postcode here') == ('', 'no postcode here')
+    assert split_postcode('84-90B69 2EX') == ('', '84-90B69 2EX')
+    # Greenhous addresses sometimes run the postcode into the text before it
+    assert split_postcode('84-90B69 2EX', bounded=False) == ('B69 2EX', '84-90')
+
+
+def test_normalize_postcodes():
+    column = pd.Series([' b692ex', 'LS1 4BB', 'nan', None, 'Leeds LS1 4BB', ''],
+                       index=range(3, 9), dtype=object)
+    result = normalize_postcodes(column)
+    assert list(result.index) == list(column.index)
+    assert result.drop(6).tolist() == ['B69 2EX', 'LS1 4BB', 'nan', 'Leeds LS1 4BB', '']
+    # Still missing, though maybe as NaN
+    assert pd.isna(result[6])
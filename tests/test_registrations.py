@@ -0,0 +1,44 @@
+"""UK registration formats, for one plate and a column of them."""
+import pandas as pd
+import pytest
+
+from registrations import is_valid_uk_registration, registration_format, validate_registrations
+
+CASES = [
+    ('AB12CDE', 'current'),
+    ('ab12 cde', 'current'),
+    (' AB12 CDE ', 'current'),
+    ('A123BCD', 'prefix'),
+    ('ABC123A', 'suffix'),
+    ('BYZ3210', 'northern_ireland'),
+    ('1ABC', 'dateless'),
+    ('ABC1', 'dateless'),
+    ('12345', None),
+    ('AB12CDEF', None),
+    ('AB-12', None),
+    ('', None),
+    (None, None),
+    (1234, None),
+]
+
+
+@pytest.mark.parametrize('reg, family', CASES)
+def test_registration_format(reg, family):
+    assert registration_format(reg) == family
+    assert is_valid_uk_registration(reg) == (family is not None)
+
+
+def test_list_matches_scalar():
+    regs = [reg for reg, _ in CASES]
+    mask, families = validate_registrations(regs)
+    assert families == [family for _, family in CASES]
+    assert mask == [family is not None for _, family in CASES]
+
+
+def test_column_matches_scalar():
+    regs = [reg for reg, _ in CASES if not isinstance(reg, int)]
+    column = pd.Series(regs, index=range(7, 7 + len(regs)), dtype=object)
+    mask, families = validate_registrations(column)
+    assert list(mask.index) == list(column.index)
+    assert mask.tolist() == [registration_format(reg) is not None for reg in regs]
+    assert families.tolist() == [registration_format(reg) for reg in regs]
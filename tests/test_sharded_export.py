@@ -0,0 +1,102 @@
+"""Sharded job CSVs and their manifest."""
+import csv
+import json
+import os
+
+import pytest
+
+from job_record import CSV_FIELDNAMES, JOB_DEFAULTS
+from sharded_export import check_shards, manifest_path, write_shards
+
+
+def make_rows(count):
+    rows = []
+    for i in range(count):
+        job = dict(JOB_DEFAULTS)
+        job.update({'REG NUMBER': f'AB{i % 100:02d}CDE', 'YOUR REF NO': f'REF{i:05d}',
+                    'COLLECTION DATE': f'{i % 28 + 1:02d}/0{i % 3 + 1}/2027',
+                    'CUSTOMER REF': ('GR11', 'GR15', 'GR/15')[i % 3]})
+        rows.append(tuple(job[field] for field in CSV_FIELDNAMES))
+    return rows
+
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def shard_rows(directory, manifest):
+    rows = []
+    for entry in manifest['shards']:
+        header, *body = read_rows(os.path.join(directory, entry['file']))
+        assert header == CSV_FIELDNAMES
+        assert len(body) == entry['rows']
+        rows.extend(body)
+    return rows
+
+
+def test_shards_hold_every_row_within_the_limits(tmp_path):
+    rows = make_rows(250)
+    csv_path = str(tmp_path / 'jobs.csv')
+    manifest = write_shards(csv_path, rows, max_rows=40, max_bytes=4000, workers=2)
+    with open(manifest_path(csv_path), encoding='utf-8') as f:
+        assert json.load(f) == manifest
+    assert manifest['rows'] == 250
+    assert [entry['file'] for entry in manifest['shards']][:2] == ['jobs_001.csv', 'jobs_002.csv']
+    for entry in manifest['shards']:
+        assert entry['rows'] <= 40
+        assert entry['bytes'] == os.path.getsize(tmp_path / entry['file']) <= 4000
+    assert shard_rows(tmp_path, manifest) == [list(row) for row in rows]
+    assert check_shards(manifest_path(csv_path)) == []
+
+
+def test_key_ranges(tmp_path):
+    rows = make_rows(30)
+    manifest = write_shards(str(tmp_path / 'jobs.csv'), rows, max_rows=10)
+    first = manifest['shards'][0]['key_ranges']
+    # Dates compare as dates: as text '10/01/2027' would be the highest
+    assert first['COLLECTION DATE'] == ['2027-01-01', '2027-03-09']
+    assert first['YOUR REF NO'] == ['REF00000', 'REF00009']
+
+
+def test_split_by_customer_ref(tmp_path):
+    rows = make_rows(90)
+    manifest = write_shards(str(tmp_path / 'jobs.csv'), rows, max_rows=20, split_field='CUSTOMER REF')
+    files = [entry['file'] for entry in manifest['shards']]
+    assert files == ['jobs_GR11_001.csv', 'jobs_GR11_002.csv', 'jobs_GR15_001.csv', 'jobs_GR15_002.csv',
+                     'jobs_GR_15_001.csv', 'jobs_GR_15_002.csv']
+    position = CSV_FIELDNAMES.index('CUSTOMER REF')
+    for entry in manifest['shards']:
+        body = read_rows(tmp_path / entry['file'])[1:]
+        assert {row[position] for row in body} == {entry['CUSTOMER REF']}
+    assert sorted(shard_rows(tmp_path, manifest)) == sorted(list(row) for row in rows)
+
+
+def test_check_shards_finds_changed_and_missing_files(tmp_path):
+    csv_path = str(tmp_path / 'jobs.csv')
+    manifest = write_shards(csv_path, make_rows(50), max_rows=10)
+    with open(tmp_path / 'jobs_002.csv', 'a', encoding='utf-8') as f:
+        f.write('extra\n')
+    os.remove(tmp_path / 'jobs_004.csv')
+    bad = check_shards(manifest_path(csv_path))
+    assert [entry['file'] for entry in bad] == ['jobs_002.csv', 'jobs_004.csv']
+    assert bad[0] == manifest['shards'][1]
+
+
+def test_oversize_row_gets_its_own_shard(tmp_path):
+    rows = make_rows(3)
+    big = list(rows[1])
+    big[CSV_FIELDNAMES.index('SPECIAL INSTRUCTIONS')] = 'x' * 2000
+    rows[1] = tuple(big)
+    manifest = write_shards(str(tmp_path / 'jobs.csv'), rows, max_bytes=1000)
+    assert [entry['rows'] for entry in manifest['shards']] == [1, 1, 1]
+
+
+def test_failure_removes_the_shards(tmp_path):
+    def rows():
+        yield from make_rows(25)
+        raise RuntimeError('parse failed')
+
+    with pytest.raises(RuntimeError):
+        write_shards(str(tmp_path / 'jobs.csv'), rows(), max_rows=10)
+    assert os.listdir(tmp_path) == []
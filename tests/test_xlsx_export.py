@@ -0,0 +1,130 @@
+"""The XLSX export, read back with openpyxl."""
+from datetime import datetime
+
+import pytest
+from openpyxl import load_workbook
+
+from job_record import CSV_FIELDNAMES, JOB_FIELDS
+from xlsx_export import XLSX_BLANK_SHEET_TITLE, XLSX_SHEET_TITLE, JobWorkbookWriter, sheet_title, write_xlsx
+
+
+def job_row(fields=CSV_FIELDNAMES, **values):
+    job = {field: '' for field in fields}
+    job.update({'REG NUMBER': 'AB12CDE', 'COLLECTION DATE': '01/02/2027', 'DELIVERY DATE': '03/02/2027',
+                'PRICE': '120.00', 'CUSTOMER REF': 'GR11'})
+    job.update({field.replace('_', ' '): value for field, value in values.items()})
+    return tuple(job[field] for field in fields)
+
+
+def read_back(path):
+    """{sheet title: [row values]} and the workbook, for its formatting."""
+    workbook = load_workbook(path)
+    return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)]
+            for sheet in workbook.worksheets}, workbook
+
+
+def cell(rows, n, field):
+    return rows[n][CSV_FIELDNAMES.index(field)]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'jobs.xlsx'
+    rows = [job_row(), job_row(REG_NUMBER='CD34EFG', PRICE='1,234.5', COLLECTION_DATE='31/12/2027')]
+    assert write_xlsx(path, rows) == 2
+    sheets, workbook = read_back(path)
+    assert list(sheets) == [XLSX_SHEET_TITLE]
+    jobs = sheets[XLSX_SHEET_TITLE]
+    assert jobs[0] == list(CSV_FIELDNAMES)
+    assert cell(jobs, 1, 'REG NUMBER') == 'AB12CDE'
+    assert cell(jobs, 2, 'REG NUMBER') == 'CD34EFG'
+    assert cell(jobs, 1, 'COLLECTION DATE') == datetime(2027, 2, 1)
+    assert cell(jobs, 2, 'COLLECTION DATE') == datetime(2027, 12, 31)
+    assert cell(jobs, 1, 'DELIVERY DATE') == datetime(2027, 2, 3)
+    assert cell(jobs, 1, 'PRICE') == 120
+    assert cell(jobs, 2, 'PRICE') == 1234.5
+    assert cell(jobs, 1, 'VIN') is None
+
+    sheet = workbook[XLSX_SHEET_TITLE]
+    assert sheet.freeze_panes == 'A2'
+    assert sheet['A1'].font.bold
+    date_column = CSV_FIELDNAMES.index('COLLECTION DATE')
+    price_column = CSV_FIELDNAMES.index('PRICE')
+    assert sheet.cell(2, date_column + 1).number_format == 'dd/mm/yyyy'
+    assert sheet.cell(2, price_column + 1).number_format == '#,##0.00'
+
+
+def test_unparsed_dates_and_prices_stay_text(tmp_path):
+    path = tmp_path / 'jobs.xlsx'
+    write_xlsx(path, [job_row(COLLECTION_DATE='ASAP', DELIVERY_DATE='31/02/2027', PRICE='TBC')])
+    jobs = read_back(path)[0][XLSX_SHEET_TITLE]
+    assert cell(jobs, 1, 'COLLECTION DATE') == 'ASAP'
+    assert cell(jobs, 1, 'DELIVERY DATE') == '31/02/2027'
+    assert cell(jobs, 1, 'PRICE') == 'TBC'
+
+
+def test_control_characters_are_dropped(tmp_path):
+    path = tmp_path / 'jobs.xlsx'
+    write_xlsx(path, [job_row(SPECIAL_INSTRUCTIONS='Gate\x00 code\x0b 1234\tring <first> & wait',
+                              CUSTOMER_REF='GR\x0111')], sheet_field='CUSTOMER REF')
+    sheets = read_back(path)[0]
+    assert list(sheets) == ['GR11']
+    assert cell(sheets['GR11'], 1, 'SPECIAL INSTRUCTIONS') == 'Gate code 1234\tring <first> & wait'
+
+
+def test_sheet_per_ref(tmp_path):
+    path = tmp_path / 'jobs.xlsx'
+    refs = ['GR15', 'gr15', 'GR11', '', 'A/B', 'A:B', 'GR15']
+    rows = [job_row(REG_NUMBER=f'REG{i}', CUSTOMER_REF=ref) for i, ref in enumerate(refs)]
+    assert write_xlsx(path, rows, sheet_field='CUSTOMER REF') == len(rows)
+    sheets = read_back(path)[0]
+    # In title order; titles differing only in case, or only in characters
+    # a title can't have, are numbered
+    assert list(sheets) == ['A_B', 'A_B (2)', 'GR11', 'GR15', 'gr15 (2)', XLSX_BLANK_SHEET_TITLE]
+    assert [cell(sheets['GR15'], n, 'REG NUMBER') for n in (1, 2)] == ['REG0', 'REG6']
+    assert cell(sheets['gr15 (2)'], 1, 'REG NUMBER') == 'REG1'
+    assert cell(sheets[XLSX_BLANK_SHEET_TITLE], 1, 'REG NUMBER') == 'REG3'
+
+
+def test_sheet_title():
+    assert sheet_title('GR11') == 'GR11'
+    assert sheet_title("'[GR11]'") == '_GR11_'
+    assert sheet_title('  ') == XLSX_BLANK_SHEET_TITLE
+    long = 'X' * 40
+    assert sheet_title(long) == 'X' * 31
+    assert sheet_title(long, ['X' * 31]) == 'X' * 27 + ' (2)'
+    assert sheet_title('gr11', ['GR11', 'GR11 (2)']) == 'gr11 (3)'
+
+
+def test_job_fields_rows(tmp_path):
+    path = tmp_path / 'jobs.xlsx'
+    write_xlsx(path, [job_row(JOB_FIELDS)], fields=JOB_FIELDS)
+    jobs = read_back(path)[0][XLSX_SHEET_TITLE]
+    assert jobs[0] == list(CSV_FIELDNAMES)
+    assert cell(jobs, 1, 'REG NUMBER') == 'AB12CDE'
+
+
+def test_empty_export_has_a_header(tmp_path):
+    path = tmp_path / 'jobs.xlsx'
+    assert write_xlsx(path, [], sheet_field='CUSTOMER REF') == 0
+    sheets = read_back(path)[0]
+    assert list(sheets.values()) == [[list(CSV_FIELDNAMES)]]
+
+
+def test_failed_export_leaves_path_alone(tmp_path):
+    path = tmp_path / 'jobs.xlsx'
+    path.write_bytes(b'old')
+
+    def rows():
+        yield job_row()
+        raise RuntimeError('parse failed')
+
+    with pytest.raises(RuntimeError):
+        with JobWorkbookWriter(path) as writer:
+            writer.write_rows(rows())
+    assert path.read_bytes() == b'old'
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_missing_field():
+    with pytest.raises(ValueError, match='PRICE'):
+        JobWorkbookWriter('jobs.xlsx', [field for field in CSV_FIELDNAMES if field != 'PRICE'])